@@ -0,0 +1,18 @@
+import hashlib
+
+
+def text_sha256(text: str) -> str:
+    """Returns the hex SHA-256 digest of a UTF-8 encoded string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Returns the hex SHA-256 digest of a file's contents.
+    Reads in fixed-size blocks so large files are never fully loaded into memory.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,22 @@
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_environment() -> None:
+    """
+    Loads variables from a .env file into os.environ, once per process.
+
+    Called by entry points before anything reads configuration, and by the
+    Weaviate client before it resolves credentials, instead of as a side effect
+    of importing a module. Variables already set in the environment win.
+    """
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
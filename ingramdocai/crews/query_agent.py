@@ -1,6 +1,6 @@
-from crewai.agent import Agent
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
-from ingramdocai.tools.get_chunk_tool import FetchDocumentChunksTool
 
 
 # --------------------------------------------------
@@ -22,44 +22,91 @@ class QueryResponseState(BaseModel):
 # Agent Definition
 # --------------------------------------------------
 
-query_response_agent = Agent(
-    role="IngramDocAI Final Answer Agent",
-    goal="Deliver a complete, grounded, and user-ready response based on retrieved document chunks.",
-    backstory=(
-        "You are the final authority in answering user questions based on documents uploaded to IngramDocAI. "
-        "You do not invent anything. You never guess. Your answers are fully grounded in content retrieved from the vector store. "
-        "You use semantic search (via FetchDocumentChunksTool) to retrieve the most relevant segments, then synthesize a single, clear message. "
-        "You include document titles, file names, or links if present. If nothing relevant is found, you clearly state that."
-    ),
-    tools=[
-        FetchDocumentChunksTool()
-    ],
-    allow_delegation=False,
-    verbose=False
-)
+@lru_cache(maxsize=1)
+def get_query_response_agent():
+    """
+    Builds the answer agent on first use. Importing this module stays cheap, so
+    callers that only need the prompt builders or QueryResponseState (e.g. the
+    fast query path) never construct the agent or its Weaviate tool.
+    """
+    from crewai.agent import Agent
+    from ingramdocai.tools.get_chunk_tool import FetchDocumentChunksTool
+
+    return Agent(
+        role="IngramDocAI Final Answer Agent",
+        goal="Deliver a complete, grounded, and user-ready response based on retrieved document chunks.",
+        backstory=(
+            "You are the final authority in answering user questions based on documents uploaded to IngramDocAI. "
+            "You do not invent anything. You never guess. Your answers are fully grounded in content retrieved from the vector store. "
+            "You use semantic search (via FetchDocumentChunksTool) to retrieve the most relevant segments, then synthesize a single, clear message. "
+            "You include document titles, file names, or links if present. If nothing relevant is found, you clearly state that."
+        ),
+        tools=[
+            FetchDocumentChunksTool()
+        ],
+        allow_delegation=False,
+        verbose=False
+    )
 
 
 # --------------------------------------------------
 # Prompt / Instruction Builder
 # --------------------------------------------------
 
+def format_retrieved_chunks(chunks: List[Dict[str, Any]]) -> str:
+    """Renders retrieved chunk properties as numbered, source-labelled context blocks."""
+    if not chunks:
+        return "(no chunks were retrieved)"
+    blocks = []
+    for i, chunk in enumerate(chunks, start=1):
+        label = f"[{i}] file_name: {chunk.get('file_name', 'unknown')} | session_id: {chunk.get('session_id', 'unknown')}"
+        if chunk.get("page_number") is not None:
+            label += f" | page: {chunk['page_number']}"
+        if chunk.get("section_heading"):
+            label += f" | section: {chunk['section_heading']}"
+        blocks.append(f"{label}\n{str(chunk.get('text', '')).strip()}")
+    return "\n\n".join(blocks)
+
+
 def query_response_instruction(
     tenant_id: str,
-    user_query: str
+    user_query: str,
+    chunks: Optional[List[Dict[str, Any]]] = None,
+    filters: Optional[Dict[str, Any]] = None
 ) -> str:
+    """
+    Builds the answer prompt. Without chunks the agent is told to retrieve them with
+    the `fetch_document_chunks` tool (passing any filters along); with chunks
+    (already retrieved by the caller) they are embedded directly so a single
+    completion can answer.
+    """
+    if chunks is None:
+        scope = "".join(f"\n    - {key}: {value}" for key, value in (filters or {}).items() if value is not None)
+        retrieval = f"""Your job is to use the `fetch_document_chunks` tool to perform semantic search
+    against all documents uploaded under:
+    - tenant_id: {tenant_id}{scope}
+
+    Instructions:
+    1. Search using the full query."""
+    else:
+        retrieval = f"""The following chunks were retrieved by semantic search against all documents
+    uploaded under:
+    - tenant_id: {tenant_id}
+
+    Retrieved chunks:
+    {format_retrieved_chunks(chunks)}
+
+    Instructions:
+    1. Use only the retrieved chunks above."""
+
     return f"""
     A user submitted the following natural language question:
 
     "{user_query}"
 
-    Your job is to use the `fetch_document_chunks` tool to perform semantic search
-    against all documents uploaded under:
-    - tenant_id: {tenant_id}
-
-    Instructions:
-    1. Search using the full query.
+    {retrieval}
     2. Analyze all retrieved chunks. Extract relevant facts, numbers, clauses, definitions, etc.
-    3. If any file names, links, or document references are included — preserve and cite them.
+    3. If any file names, page numbers, links, or document references are included — preserve and cite them.
     4. If no chunks are relevant, clearly say:
        "We couldn’t find anything relevant in your uploaded documents."
 
@@ -1,35 +1,51 @@
 # agents/status_query_agent.py
 
-from crewai.agent import Agent
+from functools import lru_cache
 from pydantic import BaseModel, Field
-from typing import List
-from ingramdocai.tools.status import FetchUserJobStatusTool
-from ingramdocai.tools.system_clock import GetCurrentUTCTimeTool
+from typing import Any, Dict, List, Optional
 
 
 class StatusQueryState(BaseModel):
     job_status_summary: str = Field(
         ..., description="Summary of the current document processing job status."
     )
+    session_id: Optional[str] = Field(default=None, description="Session the status refers to.")
+    status: Optional[str] = Field(default=None, description="Session status: pending, in_progress, completed, failed.")
+    chunk_count: Optional[int] = Field(default=None, description="Number of chunks upserted so far.")
+    error_message: Optional[str] = Field(default=None, description="Failure message (if any).")
+    updated_at: Optional[str] = Field(default=None, description="Last update time (UTC, 'YYYY-MM-DD HH:MM:SS').")
+    seconds_since_update: Optional[float] = Field(default=None, description="Seconds elapsed since the last update.")
+    progress: Optional[Dict[str, Any]] = Field(default=None, description="Per-file ingestion progress, if recorded.")
 
 
-status_query_agent = Agent(
-    role="IngramDocAI Status Agent",
-    goal="Tell the user the current document status using official tools only.",
-    backstory=(
-        "You are the official status checker for IngramDocAI. "
-        "Your job is to return the current document processing status. "
-        "You must always use the `fetch_user_job_status` tool to get status information for the session, "
-        "and only use `get_current_time` to calculate how recently each record was updated. "
-        "Do not guess or make up results."
-    ),
-    tools=[
-        FetchUserJobStatusTool(),
-        GetCurrentUTCTimeTool()
-    ],
-    allow_delegation=False,
-    verbose=False
-)
+@lru_cache(maxsize=1)
+def get_status_query_agent():
+    """
+    Builds the status agent on first use. The default status path reads the
+    database directly and only needs StatusQueryState, so it never pays for
+    constructing the agent.
+    """
+    from crewai.agent import Agent
+    from ingramdocai.tools.status import FetchUserJobStatusTool
+    from ingramdocai.tools.system_clock import GetCurrentUTCTimeTool
+
+    return Agent(
+        role="IngramDocAI Status Agent",
+        goal="Tell the user the current document status using official tools only.",
+        backstory=(
+            "You are the official status checker for IngramDocAI. "
+            "Your job is to return the current document processing status. "
+            "You must always use the `fetch_user_job_status` tool to get status information for the session, "
+            "and only use `get_current_time` to calculate how recently each record was updated. "
+            "Do not guess or make up results."
+        ),
+        tools=[
+            FetchUserJobStatusTool(),
+            GetCurrentUTCTimeTool()
+        ],
+        allow_delegation=False,
+        verbose=False
+    )
 
 # --------------------------------------------------
 # Instruction Template
@@ -49,6 +65,8 @@ Steps:
      - Show its status (e.g., completed, in_progress, failed)
      - Include chunk count if available
      - Include error message if available
+     - If `progress` is present, include files parsed out of files total, chunks upserted,
+       failed objects and throughput (chunks per second) for files still in progress
      - Mention how long ago it was updated
 
 Return your answer as one clear paragraph under the key `job_status_summary`.
@@ -1,27 +1,28 @@
 import uuid
-import os
+import time
 from pathlib import Path
 from datetime import datetime
-from ingramdocai.persistence.db import Base, engine
-from ingramdocai.persistence.models import DocumentSession
+from typing import Any
 from crewai.flow import Flow, start, listen, router, and_, or_
+from ingramdocai.core.env import load_environment
 from ingramdocai.core.state import IngramDocAIFlowState
 from ingramdocai.core.logger import setup_logger
 
-from ingramdocai.services.document_processing_service import DocumentProcessingService
-from ingramdocai.services.weaviate_class_manager import sync_schema, ensure_tenant_registered
-from ingramdocai.services.document_upsert_embedding import bulk_upsert_document_chunks
-from ingramdocai.core.crewai_output_normalizer import normalize_crewai_output 
-from ingramdocai.tools.save_session_record import SaveSessionRecordTool
-
-from ingramdocai.crews.status_request_agent import status_query_agent, status_query_instruction, StatusQueryState
-from ingramdocai.crews.query_agent import query_response_agent,query_response_instruction, QueryResponseState
-from ingramdocai.crews.document_analysis.document_analysis import DocumentAnalysisCrew
+# Services, loaders, agents and clients are imported inside the task handlers,
+# so each task_type only loads what it needs (a status check never imports
+# Weaviate, LangChain loaders or the analysis crew).
 
 
 logger = setup_logger("ingramdocai_flow")
 
 
+def _ensure_schema() -> None:
+    from ingramdocai.persistence.db import Base, engine
+    import ingramdocai.persistence.models  # noqa: F401 - registers the tables on Base
+
+    Base.metadata.create_all(bind=engine)
+
+
 class IngramDocAIMainFlow(Flow[IngramDocAIFlowState]):
 
     @start()
@@ -79,8 +80,12 @@ class IngramDocAIMainFlow(Flow[IngramDocAIFlowState]):
 
     @listen("InjectDocumentRouter")
     def inject_document(self):
+        from ingramdocai.services.ingestion_queue import IngestionJobQueue
+        from ingramdocai.services.ingestion_service import run_ingestion_session
+        from ingramdocai.services.session_records import upsert_session_records
+
         logger.info("Checking and initializing database schema if needed...")
-        Base.metadata.create_all(bind=engine)
+        _ensure_schema()
 
         try:
             sample_docs_dir = Path("tests/sample_docs").resolve()
@@ -99,81 +104,65 @@ class IngramDocAIMainFlow(Flow[IngramDocAIFlowState]):
             logger.info(f"Injecting {len(file_paths)} document(s)")
             logger.debug(f"Session → ID: {session_id}, Tenant: {tenant_id}, User: {user_id}")
 
-            SaveSessionRecordTool()._run(
+            # Background mode queues the session for the worker pool and returns immediately
+            if self.state.task_payload.get("background", False):
+                IngestionJobQueue().enqueue(
+                    session_id=session_id,
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                    file_paths=file_paths,
+                    options=self.state.task_payload
+                )
+                self.state.debug_metadata["ingest_job"] = "queued"
+
+                print("\n====== Document Injection Queued ======")
+                print(f"Session ID: {session_id}")
+                print("=======================================\n")
+                return session_id
+
+            now = datetime.utcnow()
+            upsert_session_records([{
+                "session_id": session_id,
+                "tenant_id": tenant_id,
+                "user_id": user_id,
+                "file_path": ";".join(file_paths),
+                "status": "in_progress",
+                "created_at": now,
+                "updated_at": now
+            }])
+
+            report = run_ingestion_session(
                 session_id=session_id,
                 tenant_id=tenant_id,
                 user_id=user_id,
-                file_path=";".join(file_paths),
-                status="in_progress",
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                file_paths=file_paths,
+                options=self.state.task_payload
             )
-
-            processor = DocumentProcessingService()
-            all_chunks = []
-
-            for file_path in file_paths:
-                logger.info(f"Processing file: {file_path}")
-                result = processor.process(file_path)
-                for chunk in result["chunks"]:
-                    chunk.metadata.update({
-                        "file_name": Path(file_path).name,
-                        "file_type": Path(file_path).suffix.lstrip("."),
-                        "tenant_id": tenant_id,
-                        "session_id": session_id
-                    })
-                    all_chunks.append(chunk)
-
-            if not all_chunks:
-                logger.warning("⚠️ No chunks generated from input documents.")
-                return
-
-            payloads = [{
-                "tenant_id": chunk.metadata["tenant_id"],
-                "session_id": chunk.metadata["session_id"],
-                "file_name": chunk.metadata["file_name"],
-                "file_type": chunk.metadata["file_type"],
-                "text": chunk.page_content,
-                "chunk_id": f"{i+1}",
-                "char_count": len(chunk.page_content),
-                "source": "document_upload",
-                "created_at": datetime.utcnow().isoformat() + "Z"
-            } for i, chunk in enumerate(all_chunks)]
-
-            logger.info(f"Prepared {len(payloads)} chunks for upsert")
-
-            sync_schema(tenant_id)
-            ensure_tenant_registered(tenant_id)
-
-            bulk_upsert_document_chunks(payloads)
-            logger.info(f"Upserted {len(payloads)} document chunks into Weaviate")
-
-            SaveSessionRecordTool()._run(
-                session_id=session_id,
-                tenant_id=tenant_id,
-                user_id=user_id,
-                status="completed",
-                chunk_count=len(payloads),
-                updated_at=datetime.utcnow()
-            )
-
-            self.state.chunk_count = len(payloads)
+            failed_files = report.failed_files
+            self.state.debug_metadata["failed_files"] = failed_files
+            self.state.debug_metadata["ingest_report"] = report.model_dump()
+            self.state.chunk_count = report.chunks_upserted
 
             print("\n====== Document Injection Completed ======")
             print(f"Session ID: {session_id}")
             print(f"Total Chunks: {self.state.chunk_count}")
+            print(f"Unchanged Chunks: {report.chunks_unchanged}, Deleted Chunks: {report.chunks_deleted}")
+            if report.embedding_cache:
+                print(f"Embedding Cache: {report.embedding_cache}")
+            if report.skipped_files:
+                print(f"Skipped Files (unchanged): {', '.join(report.skipped_files)}")
+            if failed_files:
+                print(f"Failed Files: {', '.join(failed_files)}")
             print("==========================================\n")
 
         except Exception as e:
             logger.error(f"Injection failed: {str(e)}")
-            SaveSessionRecordTool()._run(
-                session_id=self.state.session_id,
-                tenant_id=self.state.user_info.get("tenant_id"),
-                user_id=self.state.user_info.get("user_id"),
-                status="failed",
-                error_message=str(e),
-                updated_at=datetime.utcnow()
-            )
+            upsert_session_records([{
+                "session_id": self.state.session_id,
+                "status": "failed",
+                "error_message": str(e),
+                "updated_at": datetime.utcnow()
+            }])
             raise
 
 
@@ -181,19 +170,52 @@ class IngramDocAIMainFlow(Flow[IngramDocAIFlowState]):
     def status_check(self):
         """
         Handles the StatusCheckRouter request.
-        Executes the status_query_agent using session ID only,
-        then stores the result in self.state.status_summary.
+        Reads the session status directly from document_sessions and computes its
+        freshness in code. With task_payload status_llm=True, the status_query_agent
+        phrases the summary instead. The result is stored in self.state.status_summary.
+
+        Bulk forms (task_payload):
+        - session_ids=[...]: statuses for many sessions in one query
+        - list_sessions=True: the tenant's sessions (user_only, statuses, limit and
+          cursor narrow and page the listing)
         """
+        from ingramdocai.services.status_service import get_session_status, get_session_statuses, list_sessions
+
         logger.info("[StatusCheckRouter] Launching document status check")
 
         try:
             session_id = self.state.session_id
             logger.debug(f"[StatusCheckRouter] Input → session_id={session_id}")
-            prompt = status_query_instruction(session_id=session_id)
-            response = status_query_agent.kickoff(
-                prompt,
-                response_format=StatusQueryState
-            )
+
+            payload = self.state.task_payload
+            if payload.get("session_ids"):
+                statuses = get_session_statuses(
+                    payload["session_ids"],
+                    include_progress=bool(payload.get("include_progress", False))
+                )
+                response = {"sessions": [s.model_dump() for s in statuses]}
+            elif payload.get("list_sessions", False):
+                statuses, next_cursor = list_sessions(
+                    tenant_id=self.state.tenant_id,
+                    user_id=self.state.user_id if payload.get("user_only", False) else None,
+                    statuses=payload.get("statuses"),
+                    limit=int(payload.get("limit", 50)),
+                    cursor=payload.get("cursor"),
+                    include_progress=bool(payload.get("include_progress", False))
+                )
+                response = {"sessions": [s.model_dump() for s in statuses], "next_cursor": next_cursor}
+            elif payload.get("status_llm", False):
+                from ingramdocai.crews.status_request_agent import (
+                    get_status_query_agent, status_query_instruction, StatusQueryState
+                )
+
+                prompt = status_query_instruction(session_id=session_id)
+                response = get_status_query_agent().kickoff(
+                    prompt,
+                    response_format=StatusQueryState
+                )
+            else:
+                response = get_session_status(session_id)
 
             self.state.status_summary = response
             logger.info("[StatusCheckRouter] Status response stored in self.state.status_summary")
@@ -211,6 +233,8 @@ class IngramDocAIMainFlow(Flow[IngramDocAIFlowState]):
 
     @listen("QueryRouter")
     def query(self):
+        from ingramdocai.services.query_answer_cache import get_query_answer_cache
+
         logger.info("[QueryRouter] Starting document query handling")
 
         try:
@@ -219,21 +243,64 @@ class IngramDocAIMainFlow(Flow[IngramDocAIFlowState]):
 
             logger.debug(f"[QueryRouter] Inputs → query='{user_query}', tenant_id={tenant_id}")
 
-            prompt = query_response_instruction(
-                tenant_id=tenant_id,
-                user_query=user_query
-            )
-
-            response = query_response_agent.kickoff(
-                prompt,
-                response_format=QueryResponseState
-            )
+            # Optional metadata filters: file_name, file_type, session_id, page_from, page_to
+            filters = self.state.task_payload.get("filters") or None
+
+            # Cached answers are keyed by query text and mode, so filtered queries bypass the cache
+            query_mode = self.state.task_payload.get("query_mode") or "agent"
+            use_cache = bool(self.state.task_payload.get("use_cache", True)) and not filters
+            answer_cache = get_query_answer_cache() if use_cache else None
+            query_embedding = None
+            if answer_cache:
+                cached, query_embedding = answer_cache.lookup(tenant_id, user_query, variant=query_mode)
+                if cached is not None:
+                    self.state.query_answer = cached
+                    self.state.debug_metadata["query_cache"] = "hit"
+                    logger.info("[QueryRouter] Served answer from query cache")
+
+                    print("\n====== Document Query Response (cached) ======")
+                    print(self.state.query_answer)
+                    print("==============================================\n")
+                    return
+
+            # "fast" skips the agent loop: one hybrid search plus a single completion
+            if query_mode == "fast":
+                from ingramdocai.services.query_service import get_query_service
+
+                response, metrics = get_query_service().answer(
+                    tenant_id=tenant_id,
+                    user_query=user_query,
+                    filters=filters
+                )
+                self.state.debug_metadata["query_latency"] = metrics
+            else:
+                from ingramdocai.crews.query_agent import (
+                    get_query_response_agent, query_response_instruction, QueryResponseState
+                )
+
+                started = time.perf_counter()
+                prompt = query_response_instruction(
+                    tenant_id=tenant_id,
+                    user_query=user_query,
+                    filters=filters
+                )
+
+                response = get_query_response_agent().kickoff(
+                    prompt,
+                    response_format=QueryResponseState
+                )
+                self.state.debug_metadata["query_latency"] = {
+                    "total_ms": round((time.perf_counter() - started) * 1000, 2)
+                }
 
 
             # print("\n====== Document Query Response ======")
             # print(response)
          
             self.state.query_answer = response
+            if answer_cache:
+                answer_cache.put(tenant_id, user_query, response, embedding=query_embedding, variant=query_mode)
+                self.state.debug_metadata["query_cache"] = "miss"
 
             logger.info("[QueryRouter] Query answer stored in self.state.query_answer")
             logger.debug(f"[QueryRouter] Answer: {self.state.query_answer}")
@@ -250,39 +317,124 @@ class IngramDocAIMainFlow(Flow[IngramDocAIFlowState]):
     @listen("AnalyzeDocumentRouter")
     def analyze_documents(self):
         """
-        Loads all documents from tests/sample_docs using the same processor logic,
-        merges their contents, and analyzes them as one unit.
+        Loads all documents from tests/sample_docs using the same processor logic
+        and analyzes them. By default their contents are merged and analyzed as one
+        unit; with task_payload analysis_mode="map_reduce" each file is analyzed
+        concurrently and the partial results are reduced into one output.
+
+        With analysis_source="weaviate" the already-ingested chunks are read from
+        Weaviate instead (the whole tenant, or only this session with
+        analysis_scope="session"), so no files are parsed on this node.
+
+        Results are cached by a fingerprint of the document contents (with each
+        file's chunking strategy fingerprint when parsing files) and the analysis
+        config, so an unchanged document set is served without parsing or LLM calls.
         """
-        logger.info("Starting unified document analysis from tests/sample_docs")
+        from ingramdocai.core.content_hash import file_sha256, text_sha256
+        from ingramdocai.services.analysis_cache import AnalysisResultStore, document_set_fingerprint
+
+        payload = self.state.task_payload
+        mode = payload.get("analysis_mode", "single")
+        source = payload.get("analysis_source", "files")
+        use_cache = bool(payload.get("use_cache", True))
+        store = AnalysisResultStore() if use_cache else None
 
-        base_dir = Path(__file__).resolve().parent.parent
-        sample_docs_dir = base_dir / "tests" / "sample_docs"
-        processor = DocumentProcessingService()
+        documents = None
+        failed = False
 
-        all_text_blocks = []
-        file_count = 0
+        if source == "weaviate":
+            session_filter = self.state.session_id if payload.get("analysis_scope") == "session" else None
+            logger.info(f"Starting unified document analysis from stored chunks (session={session_filter or 'all'})")
+            from ingramdocai.services.document_chunk_reader import load_stored_documents
 
-        for file_path in sample_docs_dir.glob("*"):
-            if file_path.is_file():
+            documents = load_stored_documents(self.state.tenant_id, session_id=session_filter)
+            content_hashes = {name: text_sha256("\n".join(texts)) for name, texts in documents.items()}
+        else:
+            logger.info("Starting unified document analysis from tests/sample_docs")
+            base_dir = Path(__file__).resolve().parent.parent
+            sample_docs_dir = base_dir / "tests" / "sample_docs"
+            file_paths = sorted(f for f in sample_docs_dir.glob("*") if f.is_file())
+            content_hashes = {}
+            if store:
+                from ingramdocai.services.chunking import resolve_chunking_strategy
+
+                # Same as the ingestion manifest: each file's hash carries its resolved
+                # chunking strategy's fingerprint, so retuning CHUNK_SIZE etc. misses the cache
+                for f in file_paths:
+                    strategy = resolve_chunking_strategy(f.suffix, self.state.tenant_id, payload.get("chunking_strategy"))
+                    content_hashes[f.name] = f"{file_sha256(str(f))}:{strategy.fingerprint()}"
+
+        fingerprint = None
+        if store:
+            _ensure_schema()
+            fingerprint = document_set_fingerprint(
+                content_hashes,
+                variant=f"{source}:{mode}:{payload.get('analysis_max_tokens') or ''}"
+            )
+            cached = store.get(fingerprint)
+            if cached is not None:
+                self.state.document_analysis = cached.model_dump()
+                self.state.debug_metadata["analysis_cache"] = "hit"
+                logger.info("✔ Document analysis served from cache")
+
+                print("\n====== Document Analysis Result (cached) ======")
+                print(self.state.document_analysis)
+                print("===============================================\n")
+                return
+
+        if documents is None:
+            from ingramdocai.services.document_processing_service import DocumentProcessingService
+
+            processor = DocumentProcessingService(self.state.tenant_id, payload.get("chunking_strategy"))
+            documents = {}
+
+            for file_path in file_paths:
                 try:
                     result = processor.process(str(file_path))
                     chunks = result.get("chunks", [])
-                    for chunk in chunks:
-                        all_text_blocks.append(f"\n\n### {file_path.name}\n{chunk.page_content.strip()}")
-                    file_count += 1
+                    documents[file_path.name] = [chunk.page_content.strip() for chunk in chunks]
                 except Exception as e:
+                    failed = True
                     logger.warning(f"⚠ Failed to process {file_path.name}: {e}")
 
-        if not all_text_blocks:
-            logger.error("✘ No content found in tests/sample_docs.")
+        if not any(documents.values()):
+            logger.error(f"✘ No content found to analyze (source={source}).")
             return
 
-        merged_content = "\n".join(all_text_blocks)
-        logger.info(f"✔ Loaded {file_count} file(s). Running analysis...")
+        logger.info(f"✔ Loaded {len(documents)} file(s). Running analysis...")
 
         try:
-            result = DocumentAnalysisCrew().crew().kickoff(inputs={"documents": merged_content})
-            self.state.document_analysis = result
+            if mode == "map_reduce":
+                from ingramdocai.services.document_analysis_service import MapReduceDocumentAnalyzer
+
+                analyzer = MapReduceDocumentAnalyzer(
+                    max_concurrency=payload.get("analysis_max_concurrency"),
+                    max_tokens_per_call=payload.get("analysis_max_tokens"),
+                    store=store
+                )
+                analysis = analyzer.analyze(documents)
+                self.state.debug_metadata["analysis_cached_calls"] = analyzer.cached_calls
+            else:
+                merged_content = "\n".join(
+                    f"\n\n### {file_name}\n{text}"
+                    for file_name, texts in documents.items()
+                    for text in texts
+                )
+                from ingramdocai.crews.document_analysis.document_analysis import DocumentAnalysisCrew
+
+                result = DocumentAnalysisCrew().crew().kickoff(inputs={"documents": merged_content})
+                analysis = self._analysis_output(result)
+
+            # Partial document sets are not cached, so a fixed file is picked up next run
+            if store and not failed and analysis is not None:
+                store.put(fingerprint, "final", analysis)
+                self.state.debug_metadata["analysis_cache"] = "miss"
+
+            # Cache hits and fresh runs store the same shape: DocumentAnalysisOutput as a dict
+            if analysis is not None:
+                self.state.document_analysis = analysis.model_dump()
+            else:
+                self.state.document_analysis = {"raw": str(getattr(result, "raw", result))}
             logger.info("✔ Document analysis complete. Result stored in self.state.document_analysis")
 
             print("\n====== Document Analysis Result ======")
@@ -293,10 +445,22 @@ class IngramDocAIMainFlow(Flow[IngramDocAIFlowState]):
             logger.exception(f"✘ Document analysis failed: {e}")
             raise
 
+    @staticmethod
+    def _analysis_output(result: Any):
+        """Converts a crew result into DocumentAnalysisOutput, or None if it does not match the schema."""
+        from ingramdocai.core.crewai_output_normalizer import normalize_crewai_output
+        from ingramdocai.crews.document_analysis.document_analysis_output import DocumentAnalysisOutput
+
+        try:
+            return DocumentAnalysisOutput(**normalize_crewai_output(result)[0])
+        except (ValueError, IndexError, TypeError) as e:
+            logger.warning(f"⚠ Analysis output does not match DocumentAnalysisOutput, keeping raw text: {e}")
+            return None
 
 
 
 def start():
+    load_environment()
     flow = IngramDocAIMainFlow()
     flow.kickoff(inputs={
         "user_id": "user-123",
@@ -308,6 +472,7 @@ def start():
 
 
 def plot():
+    load_environment()
     flow = IngramDocAIMainFlow(inputs={
         "user_id": "user-123",
         "tenant_id": "tenant-xyz",
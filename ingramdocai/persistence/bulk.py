@@ -0,0 +1,68 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+# Bound-parameter ceilings per statement: SQLite's conservative default and psycopg2's practical limit
+_MAX_BIND_PARAMS = {"sqlite": 999, "postgresql": 30000}
+
+_INSERT_BY_DIALECT = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def upsert_rows(
+    db: Session,
+    model: Any,
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None
+) -> int:
+    """
+    Inserts rows or updates them in place when the conflict columns already exist,
+    using the dialect's native INSERT ... ON CONFLICT DO UPDATE (SQLite, PostgreSQL).
+    Other dialects fall back to Session.merge per row.
+
+    Rows are grouped by their key set, so each statement carries uniform columns;
+    each group is sent as multi-row statements sized to the dialect's parameter limit.
+    Runs inside the caller's transaction and does not commit.
+
+    Parameters:
+    - db: Session whose transaction the statements join.
+    - model: Mapped class of the target table.
+    - rows: Column → value dicts.
+    - conflict_columns: Primary key or unique columns that identify a row.
+    - update_columns: Columns overwritten on conflict. Defaults to every non-conflict column in the row.
+
+    Returns:
+    - Number of rows written.
+    """
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    insert = _INSERT_BY_DIALECT.get(dialect)
+    if insert is None:
+        for row in rows:
+            db.merge(model(**row))
+        return len(rows)
+
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    for columns, group in groups.items():
+        targets = [c for c in (update_columns or columns) if c in columns and c not in conflict_columns]
+        batch_size = max(1, _MAX_BIND_PARAMS[dialect] // len(columns))
+
+        for start in range(0, len(group), batch_size):
+            stmt = insert(model).values(group[start:start + batch_size])
+            if targets:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(conflict_columns),
+                    set_={c: stmt.excluded[c] for c in targets}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+            db.execute(stmt)
+
+    return len(rows)
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
 from sqlalchemy.sql import func
 from ingramdocai.persistence.db import Base
 
 class DocumentSession(Base):
     __tablename__ = "document_sessions"
+    __table_args__ = (
+        # Keyset pagination of session listings; created_at never changes, so pages stay stable
+        Index("ix_document_sessions_tenant_created", "tenant_id", "created_at", "session_id"),
+        Index("ix_document_sessions_user_created", "user_id", "created_at", "session_id"),
+    )
 
     session_id = Column(String, primary_key=True, index=True)
     tenant_id = Column(String, nullable=False, index=True)
@@ -16,3 +21,67 @@ class DocumentSession(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), default=func.now())
 
+
+class IngestionManifestEntry(Base):
+    __tablename__ = "ingestion_manifest"
+
+    tenant_id = Column(String, primary_key=True, index=True)
+    file_name = Column(String, primary_key=True)
+    file_hash = Column(String, nullable=False)
+    chunk_hashes = Column(Text, nullable=False, default="[]")
+    chunk_count = Column(Integer, default=0)
+    session_id = Column(String, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), default=func.now())
+
+
+class AnalysisResultRecord(Base):
+    __tablename__ = "analysis_results"
+
+    cache_key = Column(String, primary_key=True)
+    scope = Column(String, nullable=False, index=True)
+    config_version = Column(String, nullable=False)
+    result_json = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+    __table_args__ = (Index("ix_ingestion_jobs_status_next_run", "status", "next_run_at"),)
+
+    session_id = Column(String, primary_key=True)
+    tenant_id = Column(String, nullable=False, index=True)
+    user_id = Column(String, nullable=False)
+    file_paths = Column(Text, nullable=False)
+    options = Column(Text, nullable=False, default="{}")
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    next_run_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+    claimed_by = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), default=func.now())
+
+
+class IngestionFileProgress(Base):
+    __tablename__ = "ingestion_file_progress"
+
+    session_id = Column(String, primary_key=True, index=True)
+    file_name = Column(String, primary_key=True)
+    tenant_id = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False, default="pending")
+    bytes_total = Column(Integer, default=0)
+    bytes_processed = Column(Integer, default=0)
+    chunks_produced = Column(Integer, default=0)
+    chunks_unchanged = Column(Integer, default=0)
+    chunks_upserted = Column(Integer, default=0)
+    failed_objects = Column(Integer, default=0)
+    error_message = Column(Text, nullable=True)
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), default=func.now())
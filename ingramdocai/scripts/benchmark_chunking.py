@@ -0,0 +1,101 @@
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ingramdocai.core.env import load_environment
+
+# Config classes read the environment when imported, so .env is loaded first
+load_environment()
+
+from ingramdocai.services.chunking import available_chunking_strategies, get_chunking_strategy  # noqa: E402
+from ingramdocai.services.document_processing_service import DocumentProcessingService  # noqa: E402
+
+DEFAULT_DOCS_DIR = Path(__file__).resolve().parents[2] / "tests" / "sample_docs"
+
+
+def _percentile(values: List[int], pct: float) -> int:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def load_pages(file_paths: List[Path]) -> Dict[str, list]:
+    """Loads every file once so strategies are timed on chunking alone, not parsing."""
+    processor = DocumentProcessingService()
+    pages = {}
+    for file_path in file_paths:
+        try:
+            loader = processor._resolve_loader(str(file_path), file_path.suffix.lower())
+            pages[file_path.name] = list(loader.lazy_load())
+        except Exception as e:
+            print(f"Skipping {file_path.name}: {e}")
+    return pages
+
+
+def benchmark_strategy(name: str, pages: Dict[str, list], repeat: int) -> Dict[str, Any]:
+    sizes: List[int] = []
+    total_chars = sum(len(p.page_content) for doc in pages.values() for p in doc)
+    elapsed = 0.0
+
+    for run in range(repeat):
+        strategy = get_chunking_strategy(name)
+        started = time.perf_counter()
+        run_sizes = [
+            len(chunk.page_content)
+            for doc in pages.values()
+            for chunk in strategy.split(iter(doc))
+        ]
+        elapsed += time.perf_counter() - started
+        if run == 0:
+            sizes = run_sizes
+
+    seconds = elapsed / repeat
+    return {
+        "strategy": name,
+        "chunks": len(sizes),
+        "min_chars": min(sizes) if sizes else 0,
+        "p50_chars": _percentile(sizes, 50) if sizes else 0,
+        "p95_chars": _percentile(sizes, 95) if sizes else 0,
+        "max_chars": max(sizes) if sizes else 0,
+        "mean_chars": round(statistics.mean(sizes), 1) if sizes else 0,
+        "seconds": round(seconds, 4),
+        "chunks_per_second": round(len(sizes) / seconds, 1) if seconds else None,
+        "mb_per_second": round(total_chars / 1e6 / seconds, 2) if seconds else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunking strategies on sample documents.")
+    parser.add_argument("--docs", default=str(DEFAULT_DOCS_DIR), help="Directory of documents to chunk")
+    parser.add_argument("--strategies", nargs="*", default=None, help="Strategies to compare (default: all registered)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per strategy")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    file_paths = sorted(f for f in Path(args.docs).glob("*") if f.is_file())
+    pages = load_pages(file_paths)
+    if not pages:
+        print(f"No loadable documents in {args.docs}")
+        return
+
+    results = [
+        benchmark_strategy(name, pages, max(1, args.repeat))
+        for name in (args.strategies or available_chunking_strategies())
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{len(pages)} document(s) from {args.docs}\n")
+    columns = list(results[0])
+    print(" | ".join(f"{c:>17}" for c in columns))
+    print("-" * (20 * len(columns)))
+    for row in results:
+        print(" | ".join(f"{str(row[c]):>17}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+from ingramdocai.core.env import load_environment
+
+# Each target is what a cold process imports before doing its work: the two
+# console entry points (pyproject [tool.poetry.scripts]) and, per task_type,
+# the entry module plus the modules that handler imports lazily.
+TARGETS: Dict[str, List[str]] = {
+    "ingramdocai_start": ["ingramdocai.main:start"],
+    "ingramdocai_plot": ["ingramdocai.main:plot"],
+    "task:status": ["ingramdocai.main", "ingramdocai.services.status_service"],
+    "task:query": [
+        "ingramdocai.main",
+        "ingramdocai.services.query_answer_cache",
+        "ingramdocai.services.query_service",
+    ],
+    "task:inject": [
+        "ingramdocai.main",
+        "ingramdocai.services.ingestion_queue",
+        "ingramdocai.services.ingestion_service",
+        "ingramdocai.services.session_records",
+    ],
+    "task:analyze": [
+        "ingramdocai.main",
+        "ingramdocai.services.document_processing_service",
+        "ingramdocai.services.document_analysis_service",
+        "ingramdocai.crews.document_analysis.document_analysis",
+    ],
+}
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _import_statements(modules: List[str]) -> str:
+    statements = []
+    for module in modules:
+        if ":" in module:
+            module, attribute = module.split(":", 1)
+            statements.append(f"from {module} import {attribute}")
+        else:
+            statements.append(f"import {module}")
+    return "; ".join(statements)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Returns (module, self_us, cumulative_us) for top-level imports in -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) <= 1:
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return entries
+
+
+def measure(modules: List[str]) -> Dict[str, Any]:
+    """Imports the target in a fresh interpreter with -X importtime and returns its timings."""
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"{_import_statements(modules)}; "
+        "print(round((time.perf_counter() - started) * 1000, 1))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "unknown error"
+        raise RuntimeError(error)
+
+    top_level = parse_importtime(completed.stderr)
+    return {
+        "wall_ms": float(completed.stdout.strip().splitlines()[-1]),
+        "cumulative_ms": round(sum(cumulative for _, _, cumulative in top_level) / 1000, 1),
+        "slowest": [
+            {"module": module, "cumulative_ms": round(cumulative / 1000, 1)}
+            for module, _, cumulative in sorted(top_level, key=lambda e: e[2], reverse=True)[:5]
+        ],
+    }
+
+
+def benchmark(name: str, modules: List[str], repeat: int) -> Dict[str, Any]:
+    runs = [measure(modules) for _ in range(repeat)]
+    return {
+        "target": name,
+        "wall_ms_median": round(statistics.median(r["wall_ms"] for r in runs), 1),
+        "wall_ms_min": min(r["wall_ms"] for r in runs),
+        "cumulative_ms_median": round(statistics.median(r["cumulative_ms"] for r in runs), 1),
+        "slowest": runs[0]["slowest"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the entry points and task handlers.")
+    parser.add_argument("--targets", nargs="*", default=None, choices=sorted(TARGETS), help="Targets to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--save", default=None, help="Write results to this JSON file (e.g. a baseline)")
+    parser.add_argument("--compare", default=None, help="Baseline JSON file to show deltas against")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    # Measured interpreters inherit the loaded variables, like processes started by the entry points
+    load_environment()
+
+    results = []
+    for name in args.targets or list(TARGETS):
+        try:
+            results.append(benchmark(name, TARGETS[name], max(1, args.repeat)))
+        except RuntimeError as e:
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {row["target"]: row for row in json.load(f)}
+
+    print(f"{'target':>18} | {'median ms':>10} | {'min ms':>10} | {'vs baseline':>12} | slowest top-level imports")
+    print("-" * 110)
+    for row in results:
+        previous = baseline.get(row["target"])
+        delta = f"{row['wall_ms_median'] - previous['wall_ms_median']:+.1f}" if previous else "-"
+        slowest = ", ".join(f"{s['module']} {s['cumulative_ms']}" for s in row["slowest"][:3])
+        print(f"{row['target']:>18} | {row['wall_ms_median']:>10} | {row['wall_ms_min']:>10} | {delta:>12} | {slowest}")
+
+
+if __name__ == "__main__":
+    main()
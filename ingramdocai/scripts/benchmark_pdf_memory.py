@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+import fitz
+
+from ingramdocai.core.env import load_environment
+
+PAGE_TEXT = (
+    "Section {page}. The contractor shall deliver the materials listed in schedule B "
+    "within thirty days of the purchase order, subject to the inspection terms below. "
+)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def build_pdf(path: Path, pages: int) -> None:
+    """Writes a synthetic text PDF with the given number of dense pages."""
+    with fitz.open() as doc:
+        for page_number in range(pages):
+            page = doc.new_page()
+            page.insert_textbox(page.rect + (36, 36, -36, -36), PAGE_TEXT.format(page=page_number + 1) * 25, fontsize=8)
+        doc.save(str(path), garbage=3, deflate=True)
+
+
+def run_child(mode: str, file_path: str) -> Dict[str, Any]:
+    """
+    Loads and chunks one PDF inside this process and reports its peak RSS.
+    "stream" uses DocumentProcessingService.iter_chunks (mmap, page at a time);
+    "eager" mirrors the old path: PyMuPDFLoader.load() then a full chunk list.
+    """
+    from ingramdocai.services.chunking import RecursiveCharacterStrategy
+    from ingramdocai.services.document_processing_service import DocumentProcessingService
+
+    baseline = _peak_rss_mb()
+    chunks = 0
+    if mode == "stream":
+        for _ in DocumentProcessingService().iter_chunks(file_path):
+            chunks += 1
+    else:
+        from langchain_community.document_loaders import PyMuPDFLoader
+        pages = PyMuPDFLoader(file_path).load()
+        chunks = len(list(RecursiveCharacterStrategy().split(pages)))
+
+    peak = _peak_rss_mb()
+    return {"mode": mode, "chunks": chunks, "baseline_rss_mb": baseline, "peak_rss_mb": peak, "delta_rss_mb": round(peak - baseline, 1)}
+
+
+def measure(mode: str, file_path: Path) -> Dict[str, Any]:
+    """Runs each measurement in a fresh interpreter so peaks never carry over between runs."""
+    output = subprocess.run(
+        [sys.executable, "-m", "ingramdocai.scripts.benchmark_pdf_memory", "--child", mode, "--file", str(file_path)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare peak RSS of streaming vs eager PDF loading across page counts.")
+    parser.add_argument("--pages", type=int, nargs="*", default=[100, 500, 2000], help="Synthetic page counts to test")
+    parser.add_argument("--file", default=None, help="Benchmark an existing PDF instead of synthetic ones")
+    parser.add_argument("--modes", nargs="*", default=["stream", "eager"], choices=["stream", "eager"])
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", choices=["stream", "eager"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    # Before run_child imports the config-bearing services
+    load_environment()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.file)))
+        return
+
+    # OCR is irrelevant to memory shape here and would add a second pool to the measurement
+    os.environ.setdefault("PDF_MIN_TEXT_CHARS", "0")
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.file:
+            files = [Path(args.file)]
+        else:
+            files = []
+            for pages in args.pages:
+                path = Path(tmp) / f"synthetic_{pages}.pdf"
+                build_pdf(path, pages)
+                files.append(path)
+
+        for file_path in files:
+            with fitz.open(str(file_path)) as doc:
+                page_count = doc.page_count
+            for mode in args.modes:
+                row = {"pages": page_count, "file_mb": round(file_path.stat().st_size / 1e6, 1)}
+                row.update(measure(mode, file_path))
+                results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    columns = ["pages", "file_mb", "mode", "chunks", "baseline_rss_mb", "peak_rss_mb", "delta_rss_mb"]
+    print(" | ".join(f"{c:>15}" for c in columns))
+    print("-" * (18 * len(columns)))
+    for row in results:
+        print(" | ".join(f"{str(row[c]):>15}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
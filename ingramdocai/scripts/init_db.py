@@ -1,5 +1,10 @@
-from persistence.db import engine
-from persistence.models import Base
+from ingramdocai.core.env import load_environment
+
+# Config classes read the environment when imported, so .env is loaded first
+load_environment()
+
+from ingramdocai.persistence.db import engine  # noqa: E402
+from ingramdocai.persistence.models import Base  # noqa: E402
 
 def init_db():
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,27 @@
+import argparse
+
+from ingramdocai.core.env import load_environment
+
+# Config classes read the environment when imported, so .env is loaded first
+load_environment()
+
+from ingramdocai.services.ingestion_worker import IngestionWorkerPool, WorkerConfig  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run ingestion queue workers.")
+    parser.add_argument("--workers", type=int, default=WorkerConfig.NUM_WORKERS, help="Number of worker processes")
+    args = parser.parse_args()
+
+    pool = IngestionWorkerPool(num_workers=args.workers)
+    pool.start()
+    print(f"Ingestion workers running: {args.workers}. Press Ctrl+C to stop.")
+    try:
+        pool.join()
+    except KeyboardInterrupt:
+        print("Stopping ingestion workers...")
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ingramdocai.core.content_hash import text_sha256
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.crews.document_analysis.document_analysis_output import DocumentAnalysisOutput
+from ingramdocai.persistence.db import session_scope
+from ingramdocai.persistence.models import AnalysisResultRecord
+
+logger = setup_logger("analysis_cache")
+
+_CONFIG_DIR = Path(__file__).resolve().parent.parent / "crews" / "document_analysis" / "config"
+
+_config_version = None
+
+
+def analysis_config_version() -> str:
+    """
+    Fingerprint of everything besides the documents that shapes an analysis result:
+    agents.yaml, tasks.yaml, the output schema and the LLM model name.
+    """
+    global _config_version
+    if _config_version is None:
+        digest = hashlib.sha256()
+        for name in ("agents.yaml", "tasks.yaml"):
+            digest.update((_CONFIG_DIR / name).read_bytes())
+        digest.update(json.dumps(DocumentAnalysisOutput.model_json_schema(), sort_keys=True).encode("utf-8"))
+        digest.update(os.getenv("OPENAI_MODEL_NAME", "").encode("utf-8"))
+        _config_version = digest.hexdigest()
+    return _config_version
+
+
+def document_set_fingerprint(file_hashes: Dict[str, str], variant: str = "") -> str:
+    """
+    Fingerprint of a document set: the sorted file name/hash pairs, the analysis
+    config version and a variant string (e.g. analysis mode and token budget).
+    """
+    entries = "\n".join(f"{name}:{file_hash}" for name, file_hash in sorted(file_hashes.items()))
+    return text_sha256(f"{analysis_config_version()}\n{variant}\n{entries}")
+
+
+def section_cache_key(text: str) -> str:
+    """Cache key for a single crew call over the given input text."""
+    return text_sha256(f"{analysis_config_version()}\n{text}")
+
+
+class AnalysisResultStore:
+    """
+    Persists DocumentAnalysisOutput results in the analysis_results table.
+
+    Two scopes are stored: "final" results keyed by document set fingerprint, and
+    "partial" results keyed by the exact text of a single crew call, so when one
+    file changes only its own sections are re-analyzed.
+    """
+
+    def get(self, cache_key: str) -> Optional[DocumentAnalysisOutput]:
+        with session_scope() as db:
+            record = db.query(AnalysisResultRecord).filter_by(cache_key=cache_key).first()
+            if record is None:
+                return None
+            return DocumentAnalysisOutput.model_validate_json(record.result_json)
+
+    def put(self, cache_key: str, scope: str, result: DocumentAnalysisOutput) -> None:
+        try:
+            with session_scope() as db:
+                db.merge(AnalysisResultRecord(
+                    cache_key=cache_key,
+                    scope=scope,
+                    config_version=analysis_config_version(),
+                    result_json=result.model_dump_json()
+                ))
+        except SQLAlchemyError as e:
+            # A failed cache write must never fail the analysis itself
+            logger.warning(f"Failed to store {scope} analysis result: {str(e)}")
@@ -0,0 +1,332 @@
+import abc
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+
+from ingramdocai.core.logger import setup_logger
+
+logger = setup_logger("chunking")
+
+DEFAULT_STRATEGY = "recursive"
+
+_NUMBERED_HEADING = re.compile(r"^(\d+(\.\d+)*\.?|[IVXLC]+\.|(section|article|chapter|part)\s+\w+)\s+\S", re.IGNORECASE)
+
+_SEPARATORS = ["\n\n", "\n", ".", " ", ""]
+
+
+def _parse_mapping(value: str) -> Dict[str, str]:
+    """Parses "key=value,key=value" environment settings."""
+    mapping = {}
+    for item in value.split(","):
+        if "=" in item:
+            key, strategy = item.split("=", 1)
+            mapping[key.strip().lower()] = strategy.strip().lower()
+    return mapping
+
+
+class ChunkingConfig:
+    """
+    Configuration for chunking strategies.
+    Reads environment variables for dynamic configuration.
+    """
+    DEFAULT_STRATEGY = os.getenv("CHUNKING_STRATEGY", DEFAULT_STRATEGY)
+    BY_EXTENSION = _parse_mapping(os.getenv("CHUNKING_STRATEGY_BY_EXTENSION", ".csv=rows,.xlsx=rows,.xls=rows"))
+    BY_TENANT = _parse_mapping(os.getenv("CHUNKING_STRATEGY_BY_TENANT", ""))
+
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1000"))
+    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "150"))
+    CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS", "256"))
+    CHUNK_TOKEN_OVERLAP = int(os.getenv("CHUNK_TOKEN_OVERLAP", "32"))
+    TOKEN_ENCODING = os.getenv("CHUNK_TOKEN_ENCODING", "cl100k_base")
+    ROWS_PER_CHUNK = int(os.getenv("CHUNK_ROWS_PER_CHUNK", "50"))
+
+
+# --------------------------------------------------
+# Section heading detection
+# --------------------------------------------------
+
+def find_section_headings(text: str) -> List[Tuple[int, str]]:
+    """
+    Returns (char_offset, heading) for lines that look like section headings:
+    markdown headings, numbered headings ("2.1 Scope", "Article IV ..."), or
+    short all-caps / title-case lines without terminal punctuation.
+    """
+    headings = []
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        candidate = line.strip()
+        if 2 < len(candidate) <= 80 and not candidate.endswith((".", ",", ";", ":")):
+            words = candidate.lstrip("#").split()
+            if (
+                candidate.startswith("#")
+                or _NUMBERED_HEADING.match(candidate)
+                or (candidate.isupper() and len(words) <= 12)
+                or (len(words) <= 8 and all(w[:1].isupper() or not w[:1].isalpha() for w in words))
+            ):
+                headings.append((offset + line.index(candidate[0]), candidate.lstrip("# ").strip()))
+        offset += len(line)
+    return headings
+
+
+def heading_at(headings: List[Tuple[int, str]], position: int) -> Optional[str]:
+    """Returns the last heading that starts at or before the given offset."""
+    current = None
+    for offset, heading in headings:
+        if offset > position:
+            break
+        current = heading
+    return current
+
+
+# --------------------------------------------------
+# Strategies
+# --------------------------------------------------
+
+class ChunkingStrategy(abc.ABC):
+    """
+    Turns a document's pages into chunks.
+
+    `split` receives the loader's pages lazily and yields chunks in document order.
+    Each chunk must carry "char_start" (offset in the concatenated page text) and
+    may carry "section_heading"; page metadata from the loader is preserved.
+
+    `params` returns the settings that change the chunks produced; together with
+    the name they form the strategy's `fingerprint`.
+    """
+    name = "base"
+
+    @abc.abstractmethod
+    def split(self, pages: Iterable[Document]) -> Iterator[Document]:
+        ...
+
+    def params(self) -> Dict[str, Any]:
+        return {}
+
+    def fingerprint(self) -> str:
+        """Stable identity of the strategy and its effective parameters, e.g. "recursive(chunk_overlap=150,chunk_size=1000)"."""
+        params = ",".join(f"{key}={value}" for key, value in sorted(self.params().items()))
+        return f"{self.name}({params})"
+
+
+class _PageSplitterStrategy(ChunkingStrategy):
+    """Splits each page with a LangChain text splitter, tracking offsets and headings across pages."""
+
+    @abc.abstractmethod
+    def _build_splitter(self) -> RecursiveCharacterTextSplitter:
+        ...
+
+    def split(self, pages: Iterable[Document]) -> Iterator[Document]:
+        splitter = self._build_splitter()
+        page_offset = 0
+        heading = None
+        for page in pages:
+            headings = find_section_headings(page.page_content)
+            for chunk in splitter.split_documents([page]):
+                start = max(0, chunk.metadata.pop("start_index", 0))
+                heading = heading_at(headings, start) or heading
+                chunk.metadata["char_start"] = page_offset + start
+                if heading:
+                    chunk.metadata["section_heading"] = heading
+                yield chunk
+            if headings:
+                heading = headings[-1][1]
+            page_offset += len(page.page_content)
+
+
+class RecursiveCharacterStrategy(_PageSplitterStrategy):
+    """Fixed character budget with overlap (the original behaviour)."""
+    name = "recursive"
+
+    def __init__(self, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None):
+        self.chunk_size = chunk_size or ChunkingConfig.CHUNK_SIZE
+        self.chunk_overlap = ChunkingConfig.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+
+    def params(self) -> Dict[str, Any]:
+        return {"chunk_size": self.chunk_size, "chunk_overlap": self.chunk_overlap}
+
+    def _build_splitter(self) -> RecursiveCharacterTextSplitter:
+        return RecursiveCharacterTextSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            separators=_SEPARATORS,
+            add_start_index=True
+        )
+
+
+class TokenStrategy(_PageSplitterStrategy):
+    """
+    Sizes chunks in model tokens (tiktoken) rather than characters, so dense text
+    never overflows a retrieval or embedding budget.
+    """
+    name = "tokens"
+
+    def __init__(self, chunk_tokens: Optional[int] = None, chunk_overlap: Optional[int] = None):
+        self.chunk_tokens = chunk_tokens or ChunkingConfig.CHUNK_TOKENS
+        self.chunk_overlap = ChunkingConfig.CHUNK_TOKEN_OVERLAP if chunk_overlap is None else chunk_overlap
+
+    def params(self) -> Dict[str, Any]:
+        return {
+            "chunk_tokens": self.chunk_tokens,
+            "chunk_overlap": self.chunk_overlap,
+            "encoding": ChunkingConfig.TOKEN_ENCODING,
+        }
+
+    def _build_splitter(self) -> RecursiveCharacterTextSplitter:
+        try:
+            return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+                encoding_name=ChunkingConfig.TOKEN_ENCODING,
+                chunk_size=self.chunk_tokens,
+                chunk_overlap=self.chunk_overlap,
+                separators=_SEPARATORS,
+                add_start_index=True
+            )
+        except ImportError:
+            logger.warning("tiktoken is not installed; approximating tokens as 4 characters")
+            return RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_tokens * 4,
+                chunk_overlap=self.chunk_overlap * 4,
+                separators=_SEPARATORS,
+                add_start_index=True
+            )
+
+
+class HeadingAwareStrategy(ChunkingStrategy):
+    """
+    Starts a new chunk at every detected section heading, so a chunk never mixes
+    two sections. Sections longer than the character budget are split further.
+    """
+    name = "headings"
+
+    def __init__(self, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None):
+        self.inner = RecursiveCharacterStrategy(chunk_size, chunk_overlap)
+
+    def params(self) -> Dict[str, Any]:
+        return self.inner.params()
+
+    def split(self, pages: Iterable[Document]) -> Iterator[Document]:
+        splitter = self.inner._build_splitter()
+        page_offset = 0
+        heading = None
+        for page in pages:
+            text = page.page_content
+            headings = find_section_headings(text)
+            boundaries = [0] + [offset for offset, _ in headings if offset > 0] + [len(text)]
+
+            for start, end in zip(boundaries, boundaries[1:]):
+                section = text[start:end]
+                if not section.strip():
+                    continue
+                heading = heading_at(headings, start) or heading
+                for chunk in splitter.split_documents([Document(page_content=section, metadata=dict(page.metadata))]):
+                    chunk.metadata["char_start"] = page_offset + start + max(0, chunk.metadata.pop("start_index", 0))
+                    if heading:
+                        chunk.metadata["section_heading"] = heading
+                    yield chunk
+            page_offset += len(text)
+
+
+class RowGroupStrategy(ChunkingStrategy):
+    """
+    Packs tabular rows into chunks of up to rows_per_chunk rows (and at most
+    chunk_size characters) instead of one tiny chunk per row.
+
+    Loaders that emit one page per row (metadata "row", e.g. LangChain's
+    CSVLoader) use the page as the row unit; otherwise each line of a page is a
+    row, as produced by StreamingTabularLoader row batches and per-sheet loaders.
+    """
+    name = "rows"
+
+    def __init__(self, rows_per_chunk: Optional[int] = None, chunk_size: Optional[int] = None):
+        self.rows_per_chunk = rows_per_chunk or ChunkingConfig.ROWS_PER_CHUNK
+        self.chunk_size = chunk_size or ChunkingConfig.CHUNK_SIZE * 2
+
+    def params(self) -> Dict[str, Any]:
+        return {"rows_per_chunk": self.rows_per_chunk, "chunk_size": self.chunk_size}
+
+    def split(self, pages: Iterable[Document]) -> Iterator[Document]:
+        rows: List[str] = []
+        size = 0
+        chunk_start = 0
+        offset = 0
+        metadata: Dict = {}
+
+        def emit() -> Document:
+            chunk_metadata = {**metadata, "char_start": chunk_start, "row_count": len(rows)}
+            return Document(page_content="\n".join(rows), metadata=chunk_metadata)
+
+        for page in pages:
+            if "row" in page.metadata:
+                units = [page.page_content]
+            else:
+                units = page.page_content.splitlines(keepends=True)
+            for unit in units:
+                row = unit.rstrip("\r\n")
+                if row.strip():
+                    if rows and (len(rows) >= self.rows_per_chunk or size + len(row) > self.chunk_size):
+                        yield emit()
+                        rows, size = [], 0
+                    if not rows:
+                        chunk_start = offset
+                        metadata = {k: v for k, v in page.metadata.items() if k != "row"}
+                    rows.append(row)
+                    size += len(row) + 1
+                offset += len(unit)
+
+        if rows:
+            yield emit()
+
+
+# --------------------------------------------------
+# Registry
+# --------------------------------------------------
+
+_STRATEGIES: Dict[str, Callable[[], ChunkingStrategy]] = {
+    RecursiveCharacterStrategy.name: RecursiveCharacterStrategy,
+    TokenStrategy.name: TokenStrategy,
+    HeadingAwareStrategy.name: HeadingAwareStrategy,
+    RowGroupStrategy.name: RowGroupStrategy,
+}
+
+
+def register_chunking_strategy(name: str, factory: Callable[[], ChunkingStrategy]) -> None:
+    """Registers (or replaces) a chunking strategy under the given name."""
+    _STRATEGIES[name.lower()] = factory
+
+
+def available_chunking_strategies() -> List[str]:
+    return sorted(_STRATEGIES)
+
+
+def get_chunking_strategy(name: str) -> ChunkingStrategy:
+    """
+    Raises:
+        ValueError: If no strategy is registered under the name.
+    """
+    factory = _STRATEGIES.get(name.lower())
+    if factory is None:
+        raise ValueError(f"Unknown chunking strategy '{name}'. Available: {', '.join(available_chunking_strategies())}")
+    return factory()
+
+
+def resolve_chunking_strategy(
+    extension: str,
+    tenant_id: Optional[str] = None,
+    override: Optional[Union[str, ChunkingStrategy]] = None
+) -> ChunkingStrategy:
+    """
+    Picks the strategy for a file. Precedence: explicit override, then the
+    tenant mapping (CHUNKING_STRATEGY_BY_TENANT), then the extension mapping
+    (CHUNKING_STRATEGY_BY_EXTENSION), then CHUNKING_STRATEGY.
+    """
+    if isinstance(override, ChunkingStrategy):
+        return override
+    name = (
+        override
+        or ChunkingConfig.BY_TENANT.get((tenant_id or "").strip().lower())
+        or ChunkingConfig.BY_EXTENSION.get(extension.lower())
+        or ChunkingConfig.DEFAULT_STRATEGY
+    )
+    return get_chunking_strategy(name)
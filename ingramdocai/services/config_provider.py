@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ingramdocai.core.env import load_environment
+from ingramdocai.core.logger import setup_logger
+
+logger = setup_logger("config_provider")
+
+_provider = None
+_provider_lock = threading.Lock()
+
+# SSM GetParameters accepts at most 10 names per call
+_SSM_BATCH_LIMIT = 10
+
+
+class ConfigProviderConfig:
+    """
+    Configuration for secret/config resolution.
+    Reads environment variables for dynamic configuration.
+
+    SSM_ENDPOINT_URL points the SSM client at a local stub (e.g. moto or
+    LocalStack). The disk cache is enabled only when both CONFIG_DISK_CACHE_PATH
+    and CONFIG_DISK_CACHE_KEY (a Fernet key) are set.
+    """
+    SSM_PREFIX = os.getenv("SSM_PARAMETER_PREFIX", "/myapp/")
+    SSM_ENDPOINT_URL = os.getenv("SSM_ENDPOINT_URL") or None
+    CACHE_TTL_SECONDS = float(os.getenv("CONFIG_CACHE_TTL_SECONDS", "900"))
+    DISK_CACHE_PATH = os.getenv("CONFIG_DISK_CACHE_PATH", "")
+    DISK_CACHE_KEY = os.getenv("CONFIG_DISK_CACHE_KEY", "")
+
+
+class SSMParameterSource:
+    """
+    Reads parameters from AWS SSM Parameter Store with batched GetParameters
+    calls (one round trip for up to 10 names). Accepts an injected client, so
+    tests can pass a stub with a get_parameters method.
+    """
+
+    def __init__(self, client: Any = None, prefix: Optional[str] = None, endpoint_url: Optional[str] = None):
+        self._client = client
+        self.prefix = ConfigProviderConfig.SSM_PREFIX if prefix is None else prefix
+        self.endpoint_url = endpoint_url or ConfigProviderConfig.SSM_ENDPOINT_URL
+        self.calls = 0
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import boto3
+            self._client = boto3.client("ssm", endpoint_url=self.endpoint_url)
+        return self._client
+
+    def fetch(self, names: List[str]) -> Dict[str, str]:
+        """
+        Returns name → value for every parameter that exists. Names SSM reports as
+        invalid are logged and left out.
+
+        Raises:
+            Exception: If the SSM call itself fails.
+        """
+        values: Dict[str, str] = {}
+        for start in range(0, len(names), _SSM_BATCH_LIMIT):
+            batch = names[start:start + _SSM_BATCH_LIMIT]
+            self.calls += 1
+            response = self.client.get_parameters(Names=[self.prefix + name for name in batch], WithDecryption=True)
+            for parameter in response.get("Parameters", []):
+                values[parameter["Name"][len(self.prefix):]] = parameter["Value"]
+            if response.get("InvalidParameters"):
+                logger.warning(f"SSM parameters not found: {', '.join(response['InvalidParameters'])}")
+        return values
+
+
+class EncryptedDiskCache:
+    """
+    Fernet-encrypted JSON file holding resolved values and their expiry, so a new
+    process (e.g. an ingestion worker) can start without any SSM round trip.
+    Unreadable, tampered or expired files are ignored.
+    """
+
+    def __init__(self, path: str, key: str):
+        from cryptography.fernet import Fernet
+
+        self.path = Path(path)
+        self._fernet = Fernet(key.encode() if isinstance(key, str) else key)
+
+    def load(self) -> Tuple[Dict[str, Optional[str]], float]:
+        """Returns the cached values and their remaining lifetime in seconds."""
+        from cryptography.fernet import InvalidToken
+
+        try:
+            payload = json.loads(self._fernet.decrypt(self.path.read_bytes()))
+        except FileNotFoundError:
+            return {}, 0.0
+        except (InvalidToken, ValueError) as e:
+            logger.warning(f"Ignoring unreadable config cache {self.path}: {type(e).__name__}")
+            return {}, 0.0
+        remaining = payload.get("expires_at", 0) - time.time()
+        if remaining <= 0:
+            return {}, 0.0
+        return payload.get("values", {}), remaining
+
+    def save(self, values: Dict[str, Optional[str]], ttl: float) -> None:
+        token = self._fernet.encrypt(json.dumps({"expires_at": time.time() + ttl, "values": values}).encode())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        # Written owner-only and swapped in atomically, so readers never see a partial file
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(token)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class ConfigProvider:
+    """
+    Resolves configuration values and secrets, cheapest source first:
+
+    1. environment variables (after loading .env),
+    2. the in-memory cache, valid for ttl seconds,
+    3. the optional encrypted disk cache,
+    4. one batched SSM GetParameters call for everything still missing.
+
+    Values fetched from SSM are written back to both caches, so a cold process
+    makes at most one SSM round trip and a warm one makes none. Names SSM does not
+    have are cached as None for the same ttl, so they are not re-requested on every
+    call either.
+    """
+
+    def __init__(
+        self,
+        source: Optional[SSMParameterSource] = None,
+        ttl: Optional[float] = None,
+        disk_cache: Optional[EncryptedDiskCache] = None
+    ):
+        self.source = source or SSMParameterSource()
+        self.ttl = ConfigProviderConfig.CACHE_TTL_SECONDS if ttl is None else ttl
+        self.disk_cache = disk_cache if disk_cache is not None else self._default_disk_cache()
+
+        self._lock = threading.Lock()
+        # None marks a name SSM reported as missing (negative cache entry)
+        self._values: Dict[str, Optional[str]] = {}
+        self._expires_at = 0.0
+        self._disk_loaded = False
+
+    def get(self, name: str) -> Optional[str]:
+        return self.get_many([name]).get(name)
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Returns name → value (None when no source has it). A name missing from SSM
+        is remembered as None until the cache expires or invalidate() is called.
+
+        Raises:
+            Exception: If values are missing everywhere else and the SSM call fails.
+        """
+        load_environment()
+        names = list(dict.fromkeys(names))
+        resolved: Dict[str, Optional[str]] = {name: os.getenv(name) or None for name in names}
+        missing = [name for name, value in resolved.items() if value is None]
+        if not missing:
+            return resolved
+
+        with self._lock:
+            if time.monotonic() >= self._expires_at:
+                self._values = {}
+                self._disk_loaded = False
+            if not self._disk_loaded and self.disk_cache is not None:
+                self._disk_loaded = True
+                cached, remaining = self.disk_cache.load()
+                if cached:
+                    self._remember(cached, remaining)
+
+            to_fetch = [name for name in missing if name not in self._values]
+            if to_fetch:
+                logger.info(f"Fetching {len(to_fetch)} parameter(s) from SSM in one batch...")
+                fetched = self.source.fetch(to_fetch)
+                self._remember({name: fetched.get(name) for name in to_fetch}, self.ttl)
+                if self.disk_cache is not None:
+                    self._save_disk_cache()
+
+            for name in missing:
+                resolved[name] = self._values.get(name)
+        return resolved
+
+    def invalidate(self) -> None:
+        """Forgets cached values in memory and on disk, e.g. after a credential rotation."""
+        with self._lock:
+            self._values = {}
+            self._expires_at = 0.0
+            if self.disk_cache is not None:
+                self.disk_cache.clear()
+
+    def _remember(self, values: Dict[str, Optional[str]], ttl: float) -> None:
+        # All cached values expire together, at the earliest expiry among them
+        expires_at = time.monotonic() + ttl
+        self._expires_at = min(self._expires_at, expires_at) if self._values else expires_at
+        self._values.update(values)
+
+    def _save_disk_cache(self) -> None:
+        try:
+            self.disk_cache.save(self._values, self._expires_at - time.monotonic())
+        except OSError as e:
+            logger.warning(f"Could not write config cache: {e}")
+
+    @staticmethod
+    def _default_disk_cache() -> Optional[EncryptedDiskCache]:
+        if not (ConfigProviderConfig.DISK_CACHE_PATH and ConfigProviderConfig.DISK_CACHE_KEY):
+            return None
+        return EncryptedDiskCache(ConfigProviderConfig.DISK_CACHE_PATH, ConfigProviderConfig.DISK_CACHE_KEY)
+
+
+def get_config_provider() -> ConfigProvider:
+    """Returns the process-wide config provider, creating it on first use."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = ConfigProvider()
+    return _provider
+
+
+def set_config_provider(provider: Optional[ConfigProvider]) -> None:
+    """Replaces the process-wide provider (e.g. with one backed by a stub SSM client); None resets it."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -1,5 +1,5 @@
-from ingramdocai.persistence.db import SessionLocal
+from ingramdocai.persistence.db import session_scope
 
 def get_db_session():
-    """Returns a new SQLAlchemy session."""
-    return SessionLocal()
+    """Returns a transactional session scope (use as a context manager)."""
+    return session_scope()
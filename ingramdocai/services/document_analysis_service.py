@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ingramdocai.core.crewai_output_normalizer import normalize_crewai_output
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.crews.document_analysis.document_analysis import DocumentAnalysisCrew
+from ingramdocai.crews.document_analysis.document_analysis_output import DocumentAnalysisOutput
+from ingramdocai.services.analysis_cache import AnalysisResultStore, section_cache_key
+
+logger = setup_logger("document_analysis_service")
+
+
+class AnalysisConfig:
+    """
+    Configuration for map-reduce document analysis.
+    Reads environment variables for dynamic configuration.
+    """
+    MAX_CONCURRENCY = int(os.getenv("ANALYSIS_MAX_CONCURRENCY", "4"))
+    MAX_TOKENS_PER_CALL = int(os.getenv("ANALYSIS_MAX_TOKENS_PER_CALL", "12000"))
+    CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for budgeting prompts."""
+    return len(text) // AnalysisConfig.CHARS_PER_TOKEN + 1
+
+
+def run_analysis_crew(documents: str) -> DocumentAnalysisOutput:
+    """Runs DocumentAnalysisCrew once over the given text and returns its structured output."""
+    result = DocumentAnalysisCrew().crew().kickoff(inputs={"documents": documents})
+    return DocumentAnalysisOutput(**normalize_crewai_output(result)[0])
+
+
+def _merge_unique(values: List[str]) -> List[str]:
+    """De-duplicates case-insensitively while keeping first-seen order."""
+    seen = set()
+    merged = []
+    for value in values:
+        key = value.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            merged.append(value.strip())
+    return merged
+
+
+def _render_partial(label: str, partial: DocumentAnalysisOutput) -> str:
+    return (
+        f"\n\n### Partial analysis: {label}\n"
+        f"classification: {partial.classification}\n"
+        f"key_entities: {'; '.join(partial.key_entities)}\n"
+        f"critical_clauses: {'; '.join(partial.critical_clauses)}\n"
+        f"cross_doc_relationships: {partial.cross_doc_relationships or 'none'}\n"
+        f"summary: {partial.summary}"
+    )
+
+
+class MapReduceDocumentAnalyzer:
+    """
+    Hierarchical map-reduce analysis over a document set.
+
+    - Map: each file (split into sections when it exceeds the per-call token budget)
+      is analyzed independently, with up to max_concurrency crew runs in parallel.
+    - Reduce: key_entities and critical_clauses are merged deterministically, and the
+      partial analyses are fed back to the crew to produce the final classification,
+      cross_doc_relationships and summary. If the partials themselves exceed the
+      budget they are reduced in groups, level by level, until they fit.
+
+    With a result store, every crew call is cached by its exact input text, so an
+    unchanged file's sections (and unchanged reduce groups) are never re-analyzed.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_tokens_per_call: Optional[int] = None,
+        store: Optional[AnalysisResultStore] = None
+    ):
+        self.max_concurrency = max_concurrency or AnalysisConfig.MAX_CONCURRENCY
+        self.max_tokens_per_call = max_tokens_per_call or AnalysisConfig.MAX_TOKENS_PER_CALL
+        self.store = store
+        self.cached_calls = 0
+
+    def analyze(self, documents: Dict[str, List[str]]) -> DocumentAnalysisOutput:
+        """
+        Analyzes a document set.
+
+        Parameters:
+        - documents: file name → ordered chunk texts for that file.
+        """
+        sections = self.build_sections(documents)
+        if not sections:
+            raise ValueError("No content to analyze.")
+
+        logger.info(f"Map step: {len(sections)} section(s) from {len(documents)} file(s)")
+        partials = self.map_sections(sections)
+        return self.reduce(partials)
+
+    def build_sections(self, documents: Dict[str, List[str]]) -> List[Tuple[str, str]]:
+        """Packs each file's chunks into (label, text) sections that fit the token budget."""
+        sections = []
+        for file_name, chunks in documents.items():
+            parts: List[str] = []
+            current: List[str] = []
+            current_tokens = 0
+            for chunk in chunks:
+                block = f"\n\n### {file_name}\n{chunk.strip()}"
+                tokens = estimate_tokens(block)
+                if current and current_tokens + tokens > self.max_tokens_per_call:
+                    parts.append("".join(current))
+                    current, current_tokens = [], 0
+                current.append(block)
+                current_tokens += tokens
+            if current:
+                parts.append("".join(current))
+
+            for i, text in enumerate(parts, start=1):
+                label = file_name if len(parts) == 1 else f"{file_name} (part {i}/{len(parts)})"
+                sections.append((label, text))
+        return sections
+
+    def map_sections(self, sections: List[Tuple[str, str]]) -> List[Tuple[str, DocumentAnalysisOutput]]:
+        """Runs one crew analysis per section concurrently. Results keep section order."""
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency)) as executor:
+            outputs = list(executor.map(self._run, [text for _, text in sections]))
+        return [(label, output) for (label, _), output in zip(sections, outputs)]
+
+    def reduce(self, partials: List[Tuple[str, DocumentAnalysisOutput]]) -> DocumentAnalysisOutput:
+        """Merges partial analyses into one DocumentAnalysisOutput."""
+        if len(partials) == 1:
+            return partials[0][1]
+
+        key_entities = _merge_unique([e for _, p in partials for e in p.key_entities])
+        critical_clauses = _merge_unique([c for _, p in partials for c in p.critical_clauses])
+
+        level = 1
+        while True:
+            groups = self._group_partials(partials)
+            if len(groups) == 1:
+                break
+            logger.info(f"Reduce level {level}: {len(partials)} partial(s) → {len(groups)} group(s)")
+            inputs = ["".join(_render_partial(label, partial) for label, partial in group) for group in groups]
+            with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency)) as executor:
+                reduced = list(executor.map(self._run, inputs))
+            partials = [(f"group {i} (level {level})", output) for i, output in enumerate(reduced, start=1)]
+            level += 1
+
+        logger.info(f"Final reduce over {len(partials)} partial(s)")
+        final = self._run("".join(_render_partial(label, partial) for label, partial in partials))
+
+        return DocumentAnalysisOutput(
+            classification=final.classification,
+            key_entities=key_entities,
+            critical_clauses=critical_clauses,
+            cross_doc_relationships=final.cross_doc_relationships,
+            summary=final.summary
+        )
+
+    def _group_partials(
+        self,
+        partials: List[Tuple[str, DocumentAnalysisOutput]]
+    ) -> List[List[Tuple[str, DocumentAnalysisOutput]]]:
+        """Packs rendered partials into groups that each fit the token budget (at least two per group)."""
+        groups: List[List[Tuple[str, DocumentAnalysisOutput]]] = []
+        current: List[Tuple[str, DocumentAnalysisOutput]] = []
+        current_tokens = 0
+        for label, partial in partials:
+            tokens = estimate_tokens(_render_partial(label, partial))
+            if len(current) >= 2 and current_tokens + tokens > self.max_tokens_per_call:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append((label, partial))
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    def _run(self, text: str) -> DocumentAnalysisOutput:
+        """Runs the crew over one input, serving it from the result store when possible."""
+        if self.store is None:
+            return run_analysis_crew(text)
+
+        cache_key = section_cache_key(text)
+        cached = self.store.get(cache_key)
+        if cached is not None:
+            self.cached_calls += 1
+            return cached
+
+        output = run_analysis_crew(text)
+        self.store.put(cache_key, "partial", output)
+        return output
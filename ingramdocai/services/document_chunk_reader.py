@@ -0,0 +1,74 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.services.ingestion_manifest import IngestionManifestStore
+from ingramdocai.services.weaviate_client import get_weaviate_client
+from ingramdocai.services.weaviate_document_schema import WeaviateDocumentSchema
+
+logger = setup_logger("document_chunk_reader")
+
+_RETURN_PROPERTIES = [
+    "file_name", "file_type", "session_id", "chunk_id", "chunk_index",
+    "page_number", "section_heading", "text",
+]
+
+
+def iter_stored_chunks(
+    tenant_id: str,
+    session_id: Optional[str] = None,
+    page_size: int = 500
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterates every stored chunk for a tenant using Weaviate's cursor API.
+
+    Weaviate cursors cannot be combined with filters, so a session_id restriction is
+    applied client-side while paging through the tenant. A session owns the files
+    the manifest attributes to it, including files it skipped as unchanged (whose
+    chunks still carry the session that wrote them), plus any chunk tagged with it.
+
+    Parameters:
+    - tenant_id: Tenant whose chunks are read.
+    - session_id: Optional ingestion session to restrict the read to.
+    - page_size: Number of objects fetched per cursor page.
+    """
+    tenant_id = tenant_id.strip().lower()
+    client = get_weaviate_client()
+    collection = client.collections.get(WeaviateDocumentSchema.CLASS_NAME).with_tenant(tenant_id)
+
+    session_files = set(IngestionManifestStore().files_for_session(tenant_id, session_id)) if session_id else set()
+
+    scanned = 0
+    for obj in collection.iterator(return_properties=_RETURN_PROPERTIES, cache_size=page_size):
+        scanned += 1
+        if (
+            session_id
+            and obj.properties.get("session_id") != session_id
+            and obj.properties.get("file_name") not in session_files
+        ):
+            continue
+        yield obj.properties
+
+    logger.info(f"[tenant={tenant_id}] Scanned {scanned} stored chunk(s)")
+
+
+def load_stored_documents(tenant_id: str, session_id: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Groups stored chunks by file name and orders them by their position in the file.
+
+    Returns:
+        file name → ordered chunk texts
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for chunk in iter_stored_chunks(tenant_id, session_id=session_id):
+        grouped.setdefault(chunk.get("file_name") or "unknown", []).append(chunk)
+
+    documents = {}
+    for file_name in sorted(grouped):
+        chunks = sorted(grouped[file_name], key=lambda c: (c.get("chunk_index") or 0, c.get("chunk_id") or ""))
+        documents[file_name] = [str(c.get("text") or "").strip() for c in chunks]
+
+    logger.info(
+        f"[tenant={tenant_id}] Loaded {sum(len(v) for v in documents.values())} chunk(s) "
+        f"from {len(documents)} stored file(s)"
+    )
+    return documents
@@ -1,23 +1,81 @@
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Union
 from ingramdocai.core.logger import setup_logger
+from ingramdocai.services.chunking import ChunkingStrategy, resolve_chunking_strategy
+from ingramdocai.services.pdf_loader import HybridPDFLoader
+from ingramdocai.services.tabular_loader import StreamingTabularLoader
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 from langchain_community.document_loaders import (
-    PyMuPDFLoader,
     PDFMinerLoader,
     UnstructuredFileLoader,
     Docx2txtLoader,
-    CSVLoader,
     UnstructuredExcelLoader
 )
 
 logger = setup_logger("document_processor")
 
 
+class ProcessingConfig:
+    """
+    Configuration for document processing.
+    Reads environment variables for dynamic configuration.
+    """
+    MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", str(os.cpu_count() or 1)))
+
+
+def _process_file(
+    file_path: str,
+    tenant_id: Optional[str] = None,
+    chunking_strategy: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Process-pool entry point. Processes a single file and captures any failure
+    as an "error" entry so one bad file never aborts the batch.
+    """
+    try:
+        result = DocumentProcessingService(tenant_id, chunking_strategy).process(file_path)
+        result["file_path"] = file_path
+        result["error"] = None
+        return result
+    except Exception as e:
+        logger.error(f"Failed to process {file_path}: {str(e)}")
+        return {"file_path": file_path, "chunks": [], "metadata": {}, "error": str(e)}
+
+
+def annotate_chunk(chunk: Document) -> None:
+    """
+    Completes a chunk's location metadata in place:
+    - page_number: 1-based page for paginated loaders (PDF), otherwise absent
+    - char_end: end offset of the chunk, from the strategy's char_start
+    """
+    page = chunk.metadata.get("page")
+    if isinstance(page, int):
+        # PyMuPDF and PDFMiner report zero-based pages
+        chunk.metadata["page_number"] = page + 1
+    char_start = chunk.metadata.setdefault("char_start", 0)
+    chunk.metadata["char_end"] = char_start + len(chunk.page_content)
+
+
 class DocumentProcessingService:
+    """
+    Loads documents with a format-specific LangChain loader and chunks them with
+    a pluggable chunking strategy, chosen per call, per tenant or per extension
+    (see services/chunking.py).
+    """
+
+    def __init__(
+        self,
+        tenant_id: Optional[str] = None,
+        chunking_strategy: Optional[Union[str, ChunkingStrategy]] = None
+    ):
+        self.tenant_id = tenant_id
+        self.chunking_strategy = chunking_strategy
+
     def process(self, file_path: str) -> Dict[str, Any]:
         """
         Detects file type, loads the document using the appropriate LangChain loader,
@@ -29,6 +87,35 @@ class DocumentProcessingService:
                 "metadata": Dict
             }
         """
+        extension = Path(file_path).suffix.lower()
+        stats: Dict[str, Any] = {}
+        chunks = list(self.iter_chunks(file_path, stats))
+
+        logger.info(f"Processed {len(chunks)} chunks from {file_path}")
+
+        return {
+            "chunks": chunks,
+            "metadata": {
+                "file_path": file_path,
+                "source_type": extension.lstrip("."),
+                "chunk_count": len(chunks),
+                **stats
+            }
+        }
+
+    def iter_chunks(self, file_path: str, stats: Optional[Dict[str, Any]] = None) -> Iterator[Document]:
+        """
+        Lazily loads a document page by page and yields its chunks in order.
+        Pages are streamed through the chunking strategy, so memory stays bounded
+        by a single page (or one row group) regardless of document size.
+
+        If stats is given and the loader records per-page extraction timings (PDFs),
+        stats["page_timings"] is set to them; it fills in as pages are loaded.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the loader produces no pages.
+        """
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
@@ -36,29 +123,89 @@ class DocumentProcessingService:
         loader = self._resolve_loader(file_path, extension)
 
         logger.debug(f"Using loader: {loader.__class__.__name__}")
-        raw_docs = loader.load()
+        if stats is not None and isinstance(getattr(loader, "page_timings", None), dict):
+            stats["page_timings"] = loader.page_timings
+
+        strategy = resolve_chunking_strategy(extension, self.tenant_id, self.chunking_strategy)
+        logger.debug(f"Using chunking strategy: {strategy.name}")
+
+        page_count = 0
 
-        if not raw_docs:
+        def pages() -> Iterator[Document]:
+            nonlocal page_count
+            for page in loader.lazy_load():
+                page_count += 1
+                yield page
+
+        for chunk in strategy.split(pages()):
+            annotate_chunk(chunk)
+            yield chunk
+
+        if not page_count:
             raise ValueError("Loaded document is empty.")
 
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=150,
-            separators=["\n\n", "\n", ".", " ", ""]
-        )
+    def process_many(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Parses and chunks multiple files, concurrently when max_workers > 1.
 
-        chunks = splitter.split_documents(raw_docs)
+        Results are returned in the same order as file_paths, and chunk order within
+        each file is preserved. Files that fail are returned with an "error" message
+        and no chunks instead of raising.
 
-        logger.info(f"Processed {len(chunks)} chunks from {file_path}")
+        Returns:
+            [
+                {
+                    "file_path": str,
+                    "chunks": List[Document],
+                    "metadata": Dict,
+                    "error": Optional[str]
+                },
+                ...
+            ]
+        """
+        return list(self.iter_process_many(file_paths, max_workers=max_workers))
 
-        return {
-            "chunks": chunks,
-            "metadata": {
-                "file_path": file_path,
-                "source_type": extension.lstrip("."),
-                "chunk_count": len(chunks),
-            }
-        }
+    def iter_process_many(self, file_paths: List[str], max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Generator form of process_many. Keeps at most two files per worker in flight,
+        so finished results are handed downstream instead of accumulating in memory.
+        """
+        workers = max(1, min(max_workers or ProcessingConfig.MAX_WORKERS, len(file_paths) or 1))
+
+        if workers == 1:
+            for file_path in file_paths:
+                yield _process_file(file_path, self.tenant_id, self._strategy_name())
+            return
+
+        logger.info(f"Processing {len(file_paths)} file(s) with {workers} worker process(es)")
+        strategy_name = self._strategy_name()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            remaining = iter(file_paths)
+            pending = deque(
+                (file_path, executor.submit(_process_file, file_path, self.tenant_id, strategy_name))
+                for file_path in islice(remaining, workers * 2)
+            )
+
+            while pending:
+                file_path, future = pending.popleft()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. segfault in a native parser)
+                    logger.error(f"Worker crashed while processing {file_path}: {str(e)}")
+                    result = {"file_path": file_path, "chunks": [], "metadata": {}, "error": str(e)}
+
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append((next_path, executor.submit(_process_file, next_path, self.tenant_id, strategy_name)))
+
+                yield result
+
+    def _strategy_name(self) -> Optional[str]:
+        """Strategy override as a picklable name for worker processes."""
+        if isinstance(self.chunking_strategy, ChunkingStrategy):
+            return self.chunking_strategy.name
+        return self.chunking_strategy
 
     def _resolve_loader(self, file_path: str, extension: str):
         """
@@ -68,7 +215,8 @@ class DocumentProcessingService:
         try:
             if extension == ".pdf":
                 try:
-                    return PyMuPDFLoader(file_path)
+                    # Text pages via PyMuPDF; only image-only pages are OCRed, in a separate pool
+                    return HybridPDFLoader(file_path)
                 except Exception:
                     logger.warning("PyMuPDF failed, falling back to Unstructured loader with OCR")
                     return UnstructuredFileLoader(file_path, strategy="hi_res")
@@ -76,11 +224,12 @@ class DocumentProcessingService:
             elif extension == ".docx":
                 return Docx2txtLoader(file_path)
 
-            elif extension in [".xlsx", ".xls"]:
-                return UnstructuredExcelLoader(file_path)
+            elif extension in [".csv", ".xlsx"]:
+                # Row batches via pandas / openpyxl read-only; never the whole sheet in memory
+                return StreamingTabularLoader(file_path)
 
-            elif extension == ".csv":
-                return CSVLoader(file_path)
+            elif extension == ".xls":
+                return UnstructuredExcelLoader(file_path)
 
             elif extension == ".txt":
                 return UnstructuredFileLoader(file_path)
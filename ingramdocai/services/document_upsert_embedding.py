@@ -1,22 +1,33 @@
-from typing import List, Dict, Any
+import os
+from typing import Iterable, List, Dict, Any
+from weaviate.classes.query import Filter
 from weaviate.exceptions import WeaviateBaseError
 from ingramdocai.services.weaviate_client import get_weaviate_client
 from ingramdocai.services.weaviate_document_schema import WeaviateDocumentSchema
-from ingramdocai.services.weaviate_class_manager import sync_schema, ensure_tenant_registered
+from ingramdocai.services.weaviate_class_manager import sync_schema, ensure_tenant_registered, invalidate_schema_cache
 from ingramdocai.core.logger import setup_logger
 
 logger = setup_logger("document-chunk-upsert")
 
 
+class UpsertConfig:
+    """
+    Configuration for Weaviate chunk upserts.
+    Reads environment variables for dynamic configuration.
+    """
+    BATCH_SIZE = int(os.getenv("WEAVIATE_BATCH_SIZE", "100"))
+    DELETE_BATCH_SIZE = int(os.getenv("WEAVIATE_DELETE_BATCH_SIZE", "500"))
+
+
 def bulk_upsert_document_chunks(items: List[Dict[str, Any]]) -> None:
     """
     Bulk insert document chunks into Weaviate for a single tenant.
 
     - Each item must include a valid 'tenant_id'.
     - All items must belong to the same tenant.
-    - The function ensures the schema is synced and tenant is registered.
-    - Items are inserted in fixed-size batches (100 per batch).
-    - Embeddings should already be stored in the item via vector store ingestion logic.
+    - The function ensures the schema is synced and tenant is registered (cached per process).
+    - Items are inserted in fixed-size batches (WEAVIATE_BATCH_SIZE, default 100).
+    - Items carrying a precomputed "vector" skip server-side vectorization.
 
     Parameters:
     - items: List of chunk dictionaries, one per document segment.
@@ -38,6 +49,36 @@ def bulk_upsert_document_chunks(items: List[Dict[str, Any]]) -> None:
         if item_tenant != tenant_id:
             raise ValueError(f"All chunks must belong to the same tenant. Mismatch at index {i}.")
 
+    stream_upsert_document_chunks(tenant_id, items)
+
+
+def stream_upsert_document_chunks(tenant_id: str, items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Streams document chunks into Weaviate for a single tenant.
+
+    Items are consumed lazily and handed to the Weaviate batcher as they arrive,
+    so network writes overlap with upstream parsing and the full corpus is never
+    held in memory.
+
+    Parameters:
+    - tenant_id: Tenant that owns every chunk in the stream.
+    - items: Iterable of chunk dictionaries, one per document segment.
+
+    Items may carry a "uuid" key, used as the Weaviate object ID, and a "vector" key
+    with a client-computed embedding. Neither is stored as a property; without a
+    vector Weaviate vectorizes the chunk server-side.
+
+    Returns:
+    - {"upserted": int, "failed": int, "failed_uuids": List[str], "failed_by_file": Dict[str, int]}
+
+    Raises:
+    - ValueError: If an item belongs to a different tenant.
+    - Exception: If Weaviate write fails.
+    """
+    tenant_id = tenant_id.strip().lower()
+    if not tenant_id:
+        raise ValueError("Missing 'tenant_id' for document chunk upsert.")
+
     try:
         client = get_weaviate_client()
         class_name = WeaviateDocumentSchema.CLASS_NAME
@@ -54,18 +95,141 @@ def bulk_upsert_document_chunks(items: List[Dict[str, Any]]) -> None:
         tenant_collection = collection.with_tenant(tenant_id)
 
         # Batch insert
-        with tenant_collection.batch.fixed_size(batch_size=100) as batch:
+        total = 0
+        with tenant_collection.batch.fixed_size(batch_size=UpsertConfig.BATCH_SIZE) as batch:
             for item in items:
-                item["tenant_id"] = tenant_id  
-                batch.add_object(item)
+                if item.get("tenant_id", "").strip().lower() != tenant_id:
+                    raise ValueError(f"All chunks must belong to the same tenant. Mismatch at index {total}.")
+                item["tenant_id"] = tenant_id
+                # A deterministic UUID makes re-ingesting the same chunk an overwrite, not a duplicate
+                object_uuid = item.pop("uuid", None)
+                vector = item.pop("vector", None)
+                batch.add_object(properties=item, uuid=object_uuid, vector=vector)
+                total += 1
 
         failed = tenant_collection.batch.failed_objects or []
-        success = len(items) - len(failed)
+        success = total - len(failed)
 
-        logger.info(f"[tenant={tenant_id}] Upsert complete: {success}/{len(items)} document chunks.")
+        logger.info(f"[tenant={tenant_id}] Upsert complete: {success}/{total} document chunks.")
         if failed:
             logger.warning(f"[tenant={tenant_id}] Failed objects: {failed}")
 
+        failed_by_file: Dict[str, int] = {}
+        for f in failed:
+            file_name = (getattr(f.object_, "properties", None) or {}).get("file_name", "unknown")
+            failed_by_file[file_name] = failed_by_file.get(file_name, 0) + 1
+
+        return {
+            "upserted": success,
+            "failed": len(failed),
+            "failed_uuids": [str(f.object_.uuid) for f in failed if getattr(f.object_, "uuid", None)],
+            "failed_by_file": failed_by_file
+        }
+
     except Exception as e:
+        # The cached schema/tenant state may be what is stale; re-check on the next run
+        invalidate_schema_cache(tenant_id=tenant_id)
         logger.exception(f"[tenant={tenant_id}] Bulk upsert of document chunks failed.")
         raise
+
+
+def delete_document_chunks(tenant_id: str, uuids: List[str]) -> int:
+    """
+    Delete document chunks by object UUID for a single tenant.
+
+    Parameters:
+    - tenant_id: Tenant that owns the chunks.
+    - uuids: Weaviate object IDs to remove.
+
+    Returns:
+    - Number of objects deleted.
+    """
+    if not uuids:
+        return 0
+
+    tenant_id = tenant_id.strip().lower()
+    try:
+        client = get_weaviate_client()
+        tenant_collection = client.collections.get(WeaviateDocumentSchema.CLASS_NAME).with_tenant(tenant_id)
+
+        deleted = 0
+        for start in range(0, len(uuids), UpsertConfig.DELETE_BATCH_SIZE):
+            batch_ids = uuids[start:start + UpsertConfig.DELETE_BATCH_SIZE]
+            result = tenant_collection.data.delete_many(where=Filter.by_id().contains_any(batch_ids))
+            deleted += result.successful
+
+        logger.info(f"[tenant={tenant_id}] Deleted {deleted}/{len(uuids)} stale document chunks.")
+        return deleted
+
+    except Exception:
+        logger.exception(f"[tenant={tenant_id}] Delete of stale document chunks failed.")
+        raise
+
+
+def refresh_document_chunks(tenant_id: str, updates: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Rewrites properties of chunks that are already stored (e.g. the session_id and
+    chunk_index of chunks reused by a re-ingest), keyed by object UUID.
+
+    Objects are read back with their vectors and re-written through the batcher
+    with the same vector, so a property change never costs a new embedding call
+    (a plain PATCH would re-vectorize, since metadata text properties are part of
+    the vectorized object).
+
+    Parameters:
+    - tenant_id: Tenant that owns the chunks.
+    - updates: object UUID → properties to overwrite; a None value removes the property.
+
+    Returns:
+    - {"refreshed": int, "missing": int, "failed": int, "missing_uuids": List[str], "failed_uuids": List[str]}
+      where missing objects were not found in the tenant and failed ones were rejected on re-write.
+
+    Raises:
+    - Exception: If a Weaviate read or write fails.
+    """
+    counts: Dict[str, Any] = {"refreshed": 0, "missing": 0, "failed": 0, "missing_uuids": [], "failed_uuids": []}
+    if not updates:
+        return counts
+
+    tenant_id = tenant_id.strip().lower()
+    uuids = list(updates)
+    try:
+        client = get_weaviate_client()
+        tenant_collection = client.collections.get(WeaviateDocumentSchema.CLASS_NAME).with_tenant(tenant_id)
+
+        for start in range(0, len(uuids), UpsertConfig.BATCH_SIZE):
+            batch_ids = uuids[start:start + UpsertConfig.BATCH_SIZE]
+            stored = tenant_collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(batch_ids),
+                include_vector=True,
+                limit=len(batch_ids)
+            ).objects
+            found = {str(obj.uuid) for obj in stored}
+            counts["missing_uuids"].extend(u for u in batch_ids if u not in found)
+
+            with tenant_collection.batch.fixed_size(batch_size=UpsertConfig.BATCH_SIZE) as batch:
+                for obj in stored:
+                    vector = obj.vector.get("default") if isinstance(obj.vector, dict) else obj.vector
+                    # The object is replaced as a whole, so a None update drops the property
+                    merged = {**obj.properties, **updates[str(obj.uuid)]}
+                    properties = {key: value for key, value in merged.items() if value is not None}
+                    batch.add_object(properties=properties, uuid=obj.uuid, vector=vector)
+            failed = [
+                str(f.object_.uuid) for f in tenant_collection.batch.failed_objects or []
+                if getattr(f.object_, "uuid", None)
+            ]
+            counts["failed_uuids"].extend(failed)
+            counts["refreshed"] += len(stored) - len(failed)
+
+        counts["missing"] = len(counts["missing_uuids"])
+        counts["failed"] = len(counts["failed_uuids"])
+
+        logger.info(
+            f"[tenant={tenant_id}] Refreshed {counts['refreshed']}/{len(uuids)} stored document chunks "
+            f"({counts['missing']} missing, {counts['failed']} failed)."
+        )
+        return counts
+
+    except Exception:
+        logger.exception(f"[tenant={tenant_id}] Refresh of stored document chunks failed.")
+        raise
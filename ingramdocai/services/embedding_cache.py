@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ingramdocai.core.logger import setup_logger
+
+logger = setup_logger("embedding_cache")
+
+
+class EmbeddingCacheConfig:
+    """
+    Configuration for the on-disk embedding cache.
+    Reads environment variables for dynamic configuration.
+    """
+    PATH = os.getenv("EMBEDDING_CACHE_PATH", "embedding_cache.db")
+    MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by (model, sha256(text)).
+
+    Vectors are stored as float32 blobs in a local SQLite file. Every hit refreshes
+    the entry's access time, and once the cache grows past max_entries the least
+    recently used entries are evicted. Hit, miss and eviction counters are kept
+    for the lifetime of the instance.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.path = path or EmbeddingCacheConfig.PATH
+        self.max_entries = max_entries or EmbeddingCacheConfig.MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)")
+        self._conn.commit()
+
+    def get_many(self, model: str, text_hashes: List[str]) -> Dict[str, List[float]]:
+        """Returns text_hash → vector for every hash found in the cache."""
+        if not text_hashes:
+            return {}
+
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(text_hashes))
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = array("f", blob).tolist()
+
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE model = ? AND text_hash = ?",
+                [(now, model, h) for h in found]
+            )
+            self._conn.commit()
+
+            self.hits += sum(1 for h in text_hashes if h in found)
+            self.misses += sum(1 for h in text_hashes if h not in found)
+
+        return found
+
+    def put_many(self, model: str, items: Iterable[Tuple[str, List[float]]]) -> None:
+        """Stores (text_hash, vector) pairs and evicts least recently used entries if over capacity."""
+        now = time.time()
+        rows = [(model, text_hash, array("f", vector).tobytes(), now) for text_hash, vector in items]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_access) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Returns hit/miss/eviction counters and the hit rate for this instance."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    @staticmethod
+    def stats_delta(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, float]:
+        """Counters accumulated between two stats() snapshots, e.g. for a single ingest run."""
+        delta = {key: after[key] - before.get(key, 0) for key in ("hits", "misses", "evictions")}
+        lookups = delta["hits"] + delta["misses"]
+        delta["hit_rate"] = round(delta["hits"] / lookups, 4) if lookups else 0.0
+        return delta
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (overflow,)
+        )
+        self.evictions += overflow
+        logger.debug(f"Evicted {overflow} least recently used embedding(s)")
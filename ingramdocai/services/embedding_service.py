@@ -0,0 +1,106 @@
+import os
+import threading
+from typing import List, Optional
+
+from tenacity import retry, wait_exponential, stop_after_attempt
+
+from ingramdocai.core.content_hash import text_sha256
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.services.embedding_cache import EmbeddingCache
+
+logger = setup_logger("embedding_service")
+
+_service = None
+_service_lock = threading.Lock()
+
+
+class EmbeddingConfig:
+    """
+    Configuration for client-side embeddings.
+    Reads environment variables for dynamic configuration.
+    """
+    MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    # Optional output size for text-embedding-3 models; unset uses the model's native size
+    DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None
+    BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
+    # "server" lets Weaviate's text2vec-openai module vectorize; "client" computes vectors locally.
+    # Both must use the same MODEL and DIMENSIONS: queries are vectorized by Weaviate,
+    # so the collection's vectorizer is pinned to these and checked before client-side ingests.
+    MODE = os.getenv("EMBEDDING_MODE", "server").lower()
+
+
+class EmbeddingService:
+    """
+    Computes OpenAI embeddings on the client, serving repeated texts from an
+    EmbeddingCache so identical chunks are only ever vectorized once per model.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        cache: Optional[EmbeddingCache] = None,
+        dimensions: Optional[int] = None
+    ):
+        self.model = model or EmbeddingConfig.MODEL
+        self.dimensions = dimensions or EmbeddingConfig.DIMENSIONS
+        self.cache = cache or EmbeddingCache()
+        self._client = None
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Returns one vector per input text, in input order."""
+        if not texts:
+            return []
+
+        hashes = [text_sha256(t) for t in texts]
+        vectors = self.cache.get_many(self.cache_model, hashes)
+
+        missing = {}
+        for text_hash, text in zip(hashes, texts):
+            if text_hash not in vectors:
+                missing[text_hash] = text
+
+        if missing:
+            missing_hashes = list(missing)
+            for start in range(0, len(missing_hashes), EmbeddingConfig.BATCH_SIZE):
+                batch = missing_hashes[start:start + EmbeddingConfig.BATCH_SIZE]
+                embedded = self._embed_remote([missing[h] for h in batch])
+                fresh = list(zip(batch, embedded))
+                self.cache.put_many(self.cache_model, fresh)
+                vectors.update(fresh)
+
+        logger.debug(f"Embedded {len(texts)} text(s): {len(texts) - len(missing)} cached, {len(missing)} computed")
+        return [vectors[h] for h in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_texts([text])[0]
+
+    @property
+    def cache_model(self) -> str:
+        """Cache namespace: vectors of different sizes from the same model never mix."""
+        return f"{self.model}:{self.dimensions}" if self.dimensions else self.model
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+    @retry(
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    def _embed_remote(self, texts: List[str]) -> List[List[float]]:
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI()
+        options = {"dimensions": self.dimensions} if self.dimensions else {}
+        response = self._client.embeddings.create(model=self.model, input=texts, **options)
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Returns a process-wide EmbeddingService backed by the shared on-disk cache."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EmbeddingService()
+    return _service
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.persistence.db import session_scope
+from ingramdocai.persistence.models import IngestionManifestEntry
+
+logger = setup_logger("ingestion_manifest")
+
+
+class ManifestRecord(NamedTuple):
+    file_hash: str
+    chunk_hashes: List[str]
+
+
+class IngestionManifestStore:
+    """
+    Per-tenant content-hash manifest mapping each ingested file to the hashes of
+    the chunks currently stored for it in Weaviate.
+    """
+
+    def load(self, tenant_id: str) -> Dict[str, ManifestRecord]:
+        """Returns file_name → ManifestRecord for every file ingested by the tenant."""
+        with session_scope() as db:
+            entries = db.query(IngestionManifestEntry).filter_by(tenant_id=tenant_id).all()
+            return {
+                e.file_name: ManifestRecord(file_hash=e.file_hash, chunk_hashes=json.loads(e.chunk_hashes or "[]"))
+                for e in entries
+            }
+
+    def files_for_session(self, tenant_id: str, session_id: str) -> List[str]:
+        """Returns the files whose latest ingest (including an unchanged-file skip) belongs to the session."""
+        with session_scope() as db:
+            rows = (
+                db.query(IngestionManifestEntry.file_name)
+                .filter_by(tenant_id=tenant_id, session_id=session_id)
+                .all()
+            )
+            return [file_name for (file_name,) in rows]
+
+    def save(
+        self,
+        tenant_id: str,
+        records: Dict[str, ManifestRecord],
+        session_id: Optional[str] = None
+    ) -> None:
+        """Inserts or replaces manifest entries for the given files in one transaction."""
+        if not records:
+            return
+
+        try:
+            with session_scope() as db:
+                for file_name, record in records.items():
+                    db.merge(IngestionManifestEntry(
+                        tenant_id=tenant_id,
+                        file_name=file_name,
+                        file_hash=record.file_hash,
+                        chunk_hashes=json.dumps(record.chunk_hashes),
+                        chunk_count=len(record.chunk_hashes),
+                        session_id=session_id,
+                        updated_at=datetime.utcnow()
+                    ))
+            logger.info(f"[tenant={tenant_id}] Manifest updated for {len(records)} file(s)")
+
+        except SQLAlchemyError as e:
+            logger.error(f"[tenant={tenant_id}] Failed to update ingestion manifest: {str(e)}")
+            raise
@@ -0,0 +1,464 @@
+import os
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from weaviate.util import generate_uuid5
+
+from ingramdocai.core.content_hash import file_sha256, text_sha256
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.services.chunking import get_chunking_strategy, resolve_chunking_strategy
+from ingramdocai.services.document_processing_service import DocumentProcessingService
+from ingramdocai.services.document_upsert_embedding import (
+    UpsertConfig,
+    delete_document_chunks,
+    refresh_document_chunks,
+    stream_upsert_document_chunks
+)
+from ingramdocai.services.embedding_cache import EmbeddingCache
+from ingramdocai.services.embedding_service import EmbeddingConfig, get_embedding_service
+from ingramdocai.services.ingestion_manifest import IngestionManifestStore, ManifestRecord
+from ingramdocai.services.ingestion_progress import IngestionProgressTracker
+from ingramdocai.services.weaviate_class_manager import ensure_vectorizer_matches
+
+logger = setup_logger("ingestion_pipeline")
+
+_DONE = object()
+_FILE_DONE = object()
+_FILE_FAILED = object()
+
+_LOCATION_KEYS = ("page_number", "char_start", "char_end", "section_heading")
+
+
+class PipelineConfig:
+    """
+    Configuration for the streaming ingestion pipeline.
+    Reads environment variables for dynamic configuration.
+    """
+    QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "256"))
+
+
+class IngestionReport(BaseModel):
+    files_processed: int = Field(default=0, description="Number of files fully parsed and chunked.")
+    failed_files: Dict[str, str] = Field(default_factory=dict, description="File name → error for files that failed.")
+    skipped_files: List[str] = Field(default_factory=list, description="Files skipped because their content hash is unchanged.")
+    chunks_upserted: int = Field(default=0, description="Number of chunks accepted by Weaviate.")
+    chunks_unchanged: int = Field(default=0, description="Chunks of changed files that were already stored and not re-upserted.")
+    chunks_refreshed: int = Field(default=0, description="Stored chunks of changed files re-tagged with this session and their current position and location.")
+    chunks_refresh_missing: int = Field(default=0, description="Reused chunks listed in the manifest but not found in Weaviate; their files are re-ingested next run.")
+    chunks_refresh_failed: int = Field(default=0, description="Reused chunks Weaviate rejected on re-write; their files are re-ingested next run.")
+    chunks_deleted: int = Field(default=0, description="Stale chunks removed from Weaviate for changed files.")
+    failed_objects: int = Field(default=0, description="Number of chunks rejected by the Weaviate batcher.")
+    embedding_cache: Dict[str, float] = Field(default_factory=dict, description="Embedding cache counters for this run when vectors are computed client-side.")
+    page_timings: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="File name → page extraction stats recorded by the loader for every page, including blank and OCR-failed ones: text/ocr page counts and milliseconds, ocr_failed_pages, plus [page_number, method, ms] per page."
+    )
+
+
+class _BoundedStage:
+    """
+    Runs an upstream iterable in a background thread and hands its items downstream
+    through a bounded queue. A full queue blocks the producer, which keeps memory flat
+    when the consumer (e.g. network writes) is slower than parsing.
+    """
+
+    def __init__(self, name: str, source: Iterable[Any], maxsize: int):
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._pump, args=(source,), name=name, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _pump(self, source: Iterable[Any]) -> None:
+        try:
+            for item in source:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._put(_DONE)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                item = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if item is _DONE:
+                break
+            yield item
+        if self._error:
+            raise self._error
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+
+class IngestionCancelled(RuntimeError):
+    """Raised when a run is stopped through its cancel_event before it could finish."""
+
+
+class DocumentIngestionPipeline:
+    """
+    Streams documents from disk into Weaviate for a single tenant and session:
+
+        loader pages → splitter → payload builder → tenant_collection.batch
+
+    Each arrow is a bounded queue, so parsing, payload construction and network
+    writes overlap while peak memory stays independent of corpus size.
+
+    With client_embeddings enabled an extra stage computes vectors locally through
+    the cached EmbeddingService before the batch write.
+
+    Ingestion is incremental: a per-tenant manifest maps file hashes to chunk hashes,
+    and object UUIDs are derived from chunk content. Unchanged files are skipped
+    before parsing, and changed files only upsert new chunks and delete stale ones.
+    Chunks of changed files that are reused rather than re-upserted are re-tagged in
+    place with the current session_id, chunk_index and location metadata (page,
+    character span, section), so per-file ordering and citations reflect the latest
+    ingest. Skipped files cost no Weaviate reads or writes at all: their manifest
+    entry alone is moved to the current session, and session-scoped reads resolve
+    file ownership through the manifest (see document_chunk_reader).
+
+    Per-file progress (chunks produced and upserted, bytes, throughput) is recorded
+    through an IngestionProgressTracker, which batches its database writes.
+
+    Setting cancel_event stops parsing at the next chunk; run() then raises
+    IngestionCancelled without deleting stale chunks or saving the manifest.
+    """
+
+    def __init__(
+        self,
+        tenant_id: str,
+        session_id: str,
+        max_workers: Optional[int] = 1,
+        queue_size: Optional[int] = None,
+        force: bool = False,
+        client_embeddings: Optional[bool] = None,
+        chunking_strategy: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None
+    ):
+        self.tenant_id = tenant_id.strip().lower()
+        self.session_id = session_id
+        self.max_workers = max_workers
+        self.queue_size = queue_size or PipelineConfig.QUEUE_SIZE
+        self.force = force
+        self.client_embeddings = (
+            EmbeddingConfig.MODE == "client" if client_embeddings is None else client_embeddings
+        )
+        if chunking_strategy:
+            # Fail fast on an unknown name instead of once per file
+            get_chunking_strategy(chunking_strategy)
+        self.chunking_strategy = chunking_strategy
+        self.cancel_event = cancel_event
+        self.processor = DocumentProcessingService(self.tenant_id, chunking_strategy)
+        self.manifest_store = IngestionManifestStore()
+        self.report = IngestionReport()
+        self.progress = IngestionProgressTracker(self.tenant_id, session_id)
+
+        self._manifest: Dict[str, ManifestRecord] = {}
+        self._file_hashes: Dict[str, str] = {}
+        self._manifest_updates: Dict[str, ManifestRecord] = {}
+        self._stale_uuids: List[str] = []
+        self._refresh: Dict[str, Dict[str, Any]] = {}
+        # UUIDs whose refresh found no stored object or was rejected
+        self._lost_uuids: set = set()
+        self._refresh_lock = threading.Lock()
+
+    def run(self, file_paths: List[str]) -> IngestionReport:
+        """
+        Ingests the given files and returns a report of what was written or skipped.
+        Per-file failures are recorded in the report; Weaviate failures raise.
+
+        Raises:
+            IngestionCancelled: If cancel_event was set during the run.
+        """
+        self._manifest = self.manifest_store.load(self.tenant_id)
+        if self.client_embeddings:
+            embedder = get_embedding_service()
+            ensure_vectorizer_matches(embedder.model, embedder.dimensions)
+            # The service is process-wide; report only what this run added
+            embedding_stats = embedder.stats()
+
+        stages = [_BoundedStage("ingest-parse", self._iter_chunks(file_paths), self.queue_size)]
+        stages.append(_BoundedStage("ingest-payload", self._iter_payloads(stages[-1]), self.queue_size))
+        if self.client_embeddings:
+            stages.append(_BoundedStage("ingest-embed", self._iter_embedded(stages[-1]), self.queue_size))
+
+        try:
+            result = stream_upsert_document_chunks(self.tenant_id, self.progress.track_upserts(stages[-1]))
+            self.report.chunks_upserted = result["upserted"]
+            self.report.failed_objects = result["failed"]
+        finally:
+            # Stop upstream first so the downstream stage is never left waiting on it
+            for stage in stages:
+                stage.close()
+            self.progress.flush()
+
+        if self._cancelled():
+            # Whatever was upserted is content-addressed and gets reused by the next run
+            raise IngestionCancelled(f"Ingestion of session {self.session_id} was cancelled")
+
+        self.progress.complete(result["failed_by_file"])
+
+        if self.client_embeddings:
+            self.report.embedding_cache = EmbeddingCache.stats_delta(embedding_stats, embedder.stats())
+
+        self._flush_refresh()
+        self.report.chunks_deleted = delete_document_chunks(self.tenant_id, self._stale_uuids)
+        self._save_manifest(set(result["failed_uuids"]) | self._lost_uuids)
+
+        if self.report.skipped_files:
+            logger.info(f"[tenant={self.tenant_id}] Skipped {len(self.report.skipped_files)} unchanged file(s)")
+
+        return self.report
+
+    def _iter_chunks(self, file_paths: List[str]) -> Iterator[Tuple[str, Any]]:
+        """
+        Parse stage: yields (file_path, chunk) pairs in file order, followed by
+        (file_path, _FILE_DONE) once a file has been fully chunked.
+        """
+        file_paths = [fp for fp in file_paths if self._needs_ingest(fp)]
+
+        if self.max_workers and self.max_workers > 1:
+            # Process-pool mode streams whole files back from the workers
+            for file_path in file_paths:
+                self.progress.file_started(Path(file_path).name)
+            for result in self.processor.iter_process_many(file_paths, max_workers=self.max_workers):
+                if self._cancelled():
+                    return
+                if result["error"]:
+                    self._record_failure(result["file_path"], result["error"])
+                    continue
+                self._record_page_timings(result["file_path"], result["metadata"])
+                self.progress.chunks_produced(Path(result["file_path"]).name, len(result["chunks"]))
+                for chunk in result["chunks"]:
+                    yield result["file_path"], chunk
+                yield result["file_path"], _FILE_DONE
+                self.report.files_processed += 1
+            return
+
+        for file_path in file_paths:
+            logger.info(f"Processing file: {file_path}")
+            file_name = Path(file_path).name
+            self.progress.file_started(file_name)
+            stats: Dict[str, Any] = {}
+            try:
+                for chunk in self.processor.iter_chunks(file_path, stats):
+                    if self._cancelled():
+                        return
+                    self.progress.chunks_produced(file_name)
+                    yield file_path, chunk
+            except Exception as e:
+                self._record_page_timings(file_path, stats)
+                self._record_failure(file_path, str(e))
+                # Chunks already handed downstream must not outlive the failed parse
+                yield file_path, _FILE_FAILED
+                continue
+            self._record_page_timings(file_path, stats)
+            yield file_path, _FILE_DONE
+            self.report.files_processed += 1
+
+    def _iter_payloads(self, chunks: Iterable[Tuple[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Payload stage: converts chunks into Weaviate property dicts. Chunks whose
+        content is already stored for the file are not re-upserted; they are queued
+        for an in-place refresh of their session_id, chunk_index and location instead.
+        """
+        # file name → (ordered chunk hashes, the same hashes as a set, previously stored hashes)
+        seen: Dict[str, Tuple[List[str], set, set]] = {}
+
+        for file_path, chunk in chunks:
+            file_name = Path(file_path).name
+            previous = self._manifest.get(file_name)
+            if file_name not in seen:
+                seen[file_name] = ([], set(), set(previous.chunk_hashes) if previous else set())
+            chunk_hashes, hash_set, previous_hashes = seen[file_name]
+
+            if chunk is _FILE_DONE:
+                self._finish_file(file_path, chunk_hashes, previous)
+                del seen[file_name]
+                continue
+
+            if chunk is _FILE_FAILED:
+                self._stale_uuids.extend(
+                    self._chunk_uuid(file_name, h) for h in chunk_hashes if h not in previous_hashes
+                )
+                del seen[file_name]
+                continue
+
+            chunk_hash = text_sha256(chunk.page_content)
+            chunk_index = len(chunk_hashes)
+            if chunk_hash in hash_set:
+                continue
+            chunk_hashes.append(chunk_hash)
+            hash_set.add(chunk_hash)
+
+            if not self.force and chunk_hash in previous_hashes:
+                self.report.chunks_unchanged += 1
+                self.progress.chunks_unchanged(file_name)
+                refresh = {"session_id": self.session_id, "chunk_index": chunk_index}
+                # The same text can move to another page or section between versions;
+                # None clears a location the loader can no longer determine
+                refresh.update({key: chunk.metadata.get(key) for key in _LOCATION_KEYS})
+                self._queue_refresh(self._chunk_uuid(file_name, chunk_hash), refresh)
+                continue
+
+            payload = {
+                "uuid": self._chunk_uuid(file_name, chunk_hash),
+                "tenant_id": self.tenant_id,
+                "session_id": self.session_id,
+                "file_name": file_name,
+                "file_type": Path(file_path).suffix.lstrip("."),
+                "text": chunk.page_content,
+                "chunk_id": chunk_hash,
+                "chunk_index": chunk_index,
+                "char_count": len(chunk.page_content),
+                "source": "document_upload",
+                "created_at": datetime.utcnow().isoformat() + "Z"
+            }
+            # Location metadata is only set when the loader/splitter could determine it
+            for key in _LOCATION_KEYS:
+                if chunk.metadata.get(key) is not None:
+                    payload[key] = chunk.metadata[key]
+            yield payload
+
+    def _iter_embedded(self, payloads: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Embedding stage: attaches client-computed vectors to payloads in batches,
+        serving repeated chunk texts from the on-disk embedding cache.
+        """
+        embedder = get_embedding_service()
+        batch: List[Dict[str, Any]] = []
+
+        def flush() -> Iterator[Dict[str, Any]]:
+            vectors = embedder.embed_texts([p["text"] for p in batch])
+            for payload, vector in zip(batch, vectors):
+                payload["vector"] = vector
+                yield payload
+            batch.clear()
+
+        for payload in payloads:
+            batch.append(payload)
+            if len(batch) >= EmbeddingConfig.BATCH_SIZE:
+                yield from flush()
+        if batch:
+            yield from flush()
+
+    def _needs_ingest(self, file_path: str) -> bool:
+        """Hashes the file and returns False if the manifest already holds this exact content."""
+        file_name = Path(file_path).name
+        try:
+            file_hash = self._manifest_file_hash(file_path)
+            self.progress.file_queued(file_name, os.path.getsize(file_path))
+        except OSError as e:
+            self._record_failure(file_path, str(e))
+            return False
+
+        self._file_hashes[file_name] = file_hash
+        previous = self._manifest.get(file_name)
+        if previous and not self.force and previous.file_hash == file_hash:
+            logger.info(f"Skipping unchanged file: {file_name}")
+            self.report.skipped_files.append(file_name)
+            self.progress.file_skipped(file_name)
+            # Stored chunks are left untouched; only the manifest entry records the new owning session
+            self._manifest_updates[file_name] = previous
+            return False
+        return True
+
+    def _finish_file(self, file_path: str, chunk_hashes: List[str], previous: Optional[ManifestRecord]) -> None:
+        """Queues stale chunk deletions and the manifest update for a fully chunked file."""
+        file_name = Path(file_path).name
+        self.progress.file_parsed(file_name)
+        if previous:
+            current = set(chunk_hashes)
+            self._stale_uuids.extend(
+                self._chunk_uuid(file_name, h) for h in previous.chunk_hashes if h not in current
+            )
+        self._manifest_updates[file_name] = ManifestRecord(
+            file_hash=self._file_hashes[file_name],
+            chunk_hashes=list(chunk_hashes)
+        )
+
+    def _save_manifest(self, failed_uuids: set) -> None:
+        """
+        Persists manifest updates, leaving out chunks Weaviate rejected or that turned
+        out to be missing, so they are upserted again next run.
+        """
+        updates = {}
+        for file_name, record in self._manifest_updates.items():
+            stored = [h for h in record.chunk_hashes if self._chunk_uuid(file_name, h) not in failed_uuids]
+            # A file with rejected chunks keeps no file hash, so it is re-parsed next run
+            file_hash = record.file_hash if len(stored) == len(record.chunk_hashes) else ""
+            updates[file_name] = ManifestRecord(file_hash=file_hash, chunk_hashes=stored)
+        self.manifest_store.save(self.tenant_id, updates, session_id=self.session_id)
+
+    def _manifest_file_hash(self, file_path: str) -> str:
+        """
+        File content hash as stored in the manifest, with the chunking strategy's
+        fingerprint (name and effective parameters such as CHUNK_SIZE) folded in, so
+        switching a file's strategy or retuning it re-chunks the file on the next run.
+        """
+        file_hash = file_sha256(file_path)
+        strategy = resolve_chunking_strategy(Path(file_path).suffix, self.tenant_id, self.chunking_strategy)
+        return f"{file_hash}:{strategy.fingerprint()}"
+
+    def _chunk_uuid(self, file_name: str, chunk_hash: str) -> str:
+        return generate_uuid5(f"{self.tenant_id}/{file_name}/{chunk_hash}")
+
+    def _cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def _queue_refresh(self, object_uuid: str, properties: Dict[str, Any]) -> None:
+        """Buffers an in-place property update, writing a batch once enough are queued."""
+        with self._refresh_lock:
+            self._refresh[object_uuid] = properties
+            full = len(self._refresh) >= UpsertConfig.BATCH_SIZE
+        if full:
+            self._flush_refresh()
+
+    def _flush_refresh(self) -> None:
+        with self._refresh_lock:
+            batch, self._refresh = self._refresh, {}
+        if not batch:
+            return
+
+        result = refresh_document_chunks(self.tenant_id, batch)
+        self.report.chunks_refreshed += result["refreshed"]
+        self.report.chunks_refresh_missing += result["missing"]
+        self.report.chunks_refresh_failed += result["failed"]
+        lost = set(result["missing_uuids"]) | set(result["failed_uuids"])
+        if lost:
+            logger.warning(
+                f"[tenant={self.tenant_id}] {len(lost)} reused chunk(s) are not stored; "
+                "their files will be re-ingested next run"
+            )
+            with self._refresh_lock:
+                self._lost_uuids |= lost
+
+    def _record_page_timings(self, file_path: str, stats: Dict[str, Any]) -> None:
+        """Copies the loader's per-page extraction timings for a file into the report."""
+        if stats.get("page_timings"):
+            self.report.page_timings[Path(file_path).name] = stats["page_timings"]
+
+    def _record_failure(self, file_path: str, error: str) -> None:
+        logger.warning(f"Skipping {Path(file_path).name}: {error}")
+        self.report.failed_files[Path(file_path).name] = error
+        self.progress.file_failed(Path(file_path).name, error)
@@ -0,0 +1,246 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.persistence.bulk import upsert_rows
+from ingramdocai.persistence.db import session_scope
+from ingramdocai.persistence.models import DocumentSession, IngestionFileProgress
+
+logger = setup_logger("ingestion_progress")
+
+_COUNTERS = (
+    "bytes_total", "bytes_processed", "chunks_produced",
+    "chunks_unchanged", "chunks_upserted", "failed_objects",
+)
+
+
+class ProgressConfig:
+    """
+    Configuration for ingestion progress tracking.
+    Reads environment variables for dynamic configuration.
+    """
+    FLUSH_INTERVAL_SECONDS = float(os.getenv("INGEST_PROGRESS_FLUSH_INTERVAL", "2"))
+
+
+class _FileProgress:
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.status = "pending"
+        self.error_message: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        for counter in _COUNTERS:
+            setattr(self, counter, 0)
+
+
+class IngestionProgressTracker:
+    """
+    Per-file progress counters for one ingestion session.
+
+    Pipeline stages update counters in memory; dirty rows are upserted into
+    ingestion_file_progress at most once per flush interval with a single
+    INSERT ... ON CONFLICT, in a transaction that also refreshes the session's
+    updated_at and running chunk_count. Progress tracking therefore costs one small write every few
+    seconds regardless of how many chunks flow through the pipeline.
+
+    File status moves pending → parsing → parsed → completed, or to skipped / failed.
+    """
+
+    def __init__(self, tenant_id: str, session_id: str, flush_interval: Optional[float] = None):
+        self.tenant_id = tenant_id
+        self.session_id = session_id
+        self.flush_interval = ProgressConfig.FLUSH_INTERVAL_SECONDS if flush_interval is None else flush_interval
+
+        self._lock = threading.Lock()
+        self._files: Dict[str, _FileProgress] = {}
+        self._dirty: set = set()
+        self._last_flush = time.monotonic()
+
+    def file_queued(self, file_name: str, size: int) -> None:
+        with self._lock:
+            self._file(file_name).bytes_total = size
+        self._maybe_flush()
+
+    def file_started(self, file_name: str) -> None:
+        with self._lock:
+            progress = self._file(file_name)
+            progress.status = "parsing"
+            progress.started_at = progress.started_at or datetime.utcnow()
+        self._maybe_flush()
+
+    def chunks_produced(self, file_name: str, count: int = 1) -> None:
+        with self._lock:
+            self._file(file_name).chunks_produced += count
+        self._maybe_flush()
+
+    def chunks_unchanged(self, file_name: str, count: int = 1) -> None:
+        with self._lock:
+            self._file(file_name).chunks_unchanged += count
+        self._maybe_flush()
+
+    def chunks_upserted(self, file_name: str, count: int = 1) -> None:
+        with self._lock:
+            self._file(file_name).chunks_upserted += count
+        self._maybe_flush()
+
+    def file_parsed(self, file_name: str) -> None:
+        with self._lock:
+            progress = self._file(file_name)
+            progress.status = "parsed"
+            progress.bytes_processed = progress.bytes_total
+        self._maybe_flush()
+
+    def file_skipped(self, file_name: str) -> None:
+        self._finish_file(file_name, "skipped")
+
+    def file_failed(self, file_name: str, error: str) -> None:
+        self._finish_file(file_name, "failed", error)
+
+    def track_upserts(self, payloads: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Passes payloads through, counting each one handed to the Weaviate batcher."""
+        for payload in payloads:
+            self.chunks_upserted(payload["file_name"])
+            yield payload
+
+    def complete(self, failed_by_file: Optional[Dict[str, int]] = None) -> None:
+        """
+        Marks every parsed file completed, moves objects Weaviate rejected from
+        chunks_upserted to failed_objects, and flushes immediately.
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            for file_name, failed in (failed_by_file or {}).items():
+                progress = self._file(file_name)
+                progress.chunks_upserted = max(0, progress.chunks_upserted - failed)
+                progress.failed_objects += failed
+            for file_name, progress in self._files.items():
+                if progress.status == "parsed":
+                    progress.status = "completed"
+                    progress.finished_at = now
+                    self._dirty.add(file_name)
+        self.flush()
+
+    def flush(self) -> None:
+        """Writes all dirty file rows and the session heartbeat in one transaction."""
+        with self._lock:
+            rows = [self._files[name] for name in self._dirty]
+            self._dirty.clear()
+            self._last_flush = time.monotonic()
+            upserted = sum(p.chunks_upserted for p in self._files.values())
+        if not rows:
+            return
+
+        now = datetime.utcnow()
+        try:
+            with session_scope() as db:
+                upsert_rows(
+                    db, IngestionFileProgress,
+                    [
+                        {
+                            "session_id": self.session_id,
+                            "file_name": progress.file_name,
+                            "tenant_id": self.tenant_id,
+                            "status": progress.status,
+                            "error_message": progress.error_message,
+                            "started_at": progress.started_at,
+                            "finished_at": progress.finished_at,
+                            "updated_at": now,
+                            **{counter: getattr(progress, counter) for counter in _COUNTERS}
+                        }
+                        for progress in rows
+                    ],
+                    conflict_columns=["session_id", "file_name"]
+                )
+                db.execute(
+                    update(DocumentSession)
+                    .where(DocumentSession.session_id == self.session_id)
+                    .values(chunk_count=upserted, updated_at=now)
+                )
+
+        except SQLAlchemyError as e:
+            # Progress is advisory; a failed write is retried with the next flush
+            with self._lock:
+                self._dirty.update(p.file_name for p in rows)
+            logger.warning(f"[session={self.session_id}] Progress flush failed: {str(e)}")
+
+    def _file(self, file_name: str) -> _FileProgress:
+        """Returns the file's counters and marks them dirty. Caller holds the lock."""
+        progress = self._files.get(file_name)
+        if progress is None:
+            progress = self._files[file_name] = _FileProgress(file_name)
+        self._dirty.add(file_name)
+        return progress
+
+    def _finish_file(self, file_name: str, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            progress = self._file(file_name)
+            progress.status = status
+            progress.error_message = error
+            progress.finished_at = datetime.utcnow()
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+
+def _progress_to_dict(row: IngestionFileProgress, now: datetime) -> Dict[str, Any]:
+    end = row.finished_at or now
+    elapsed = (end - row.started_at).total_seconds() if row.started_at else 0.0
+    return {
+        "file_name": row.file_name,
+        "status": row.status,
+        "bytes_total": row.bytes_total,
+        "bytes_processed": row.bytes_processed,
+        "chunks_produced": row.chunks_produced,
+        "chunks_unchanged": row.chunks_unchanged,
+        "chunks_upserted": row.chunks_upserted,
+        "failed_objects": row.failed_objects,
+        "error_message": row.error_message,
+        "elapsed_seconds": round(elapsed, 2),
+        "chunks_per_second": round(row.chunks_upserted / elapsed, 2) if elapsed > 0 else None,
+        "bytes_per_second": round(row.bytes_processed / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+def load_session_progress(session_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Reads per-file progress for the given sessions in one query.
+
+    Returns:
+        session_id → {"files_total", "files_parsed", "files_failed", "chunks_produced",
+        "chunks_upserted", "failed_objects", "bytes_total", "bytes_processed", "files": [...]}
+    """
+    if not session_ids:
+        return {}
+
+    now = datetime.utcnow()
+    with session_scope() as db:
+        rows = (
+            db.query(IngestionFileProgress)
+            .filter(IngestionFileProgress.session_id.in_(session_ids))
+            .order_by(IngestionFileProgress.session_id, IngestionFileProgress.file_name)
+            .all()
+        )
+        db.expunge_all()
+
+    sessions: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        summary = sessions.setdefault(row.session_id, {
+            "files_total": 0, "files_parsed": 0, "files_failed": 0,
+            "chunks_produced": 0, "chunks_upserted": 0, "failed_objects": 0,
+            "bytes_total": 0, "bytes_processed": 0, "files": []
+        })
+        summary["files_total"] += 1
+        summary["files_parsed"] += row.status in {"parsed", "completed", "skipped"}
+        summary["files_failed"] += row.status == "failed"
+        for counter in ("chunks_produced", "chunks_upserted", "failed_objects", "bytes_total", "bytes_processed"):
+            summary[counter] += getattr(row, counter) or 0
+        summary["files"].append(_progress_to_dict(row, now))
+    return sessions
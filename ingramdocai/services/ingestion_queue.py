@@ -0,0 +1,262 @@
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.persistence.db import SessionLocal, session_scope
+from ingramdocai.persistence.models import DocumentSession, IngestionJob
+
+logger = setup_logger("ingestion_queue")
+
+
+class JobQueueConfig:
+    """
+    Configuration for the durable ingestion job queue.
+    Reads environment variables for dynamic configuration.
+    """
+    MAX_ATTEMPTS = int(os.getenv("INGEST_JOB_MAX_ATTEMPTS", "3"))
+    BACKOFF_BASE_SECONDS = float(os.getenv("INGEST_JOB_BACKOFF_BASE", "30"))
+    BACKOFF_MAX_SECONDS = float(os.getenv("INGEST_JOB_BACKOFF_MAX", "900"))
+    # A running job whose heartbeat is older than this is considered abandoned and re-claimable
+    LEASE_SECONDS = float(os.getenv("INGEST_JOB_LEASE_SECONDS", "120"))
+
+
+def _job_to_dict(job: IngestionJob) -> Dict[str, Any]:
+    return {
+        "session_id": job.session_id,
+        "tenant_id": job.tenant_id,
+        "user_id": job.user_id,
+        "file_paths": json.loads(job.file_paths),
+        "options": json.loads(job.options or "{}"),
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+    }
+
+
+class IngestionJobQueue:
+    """
+    Durable ingestion job queue stored next to document_sessions.
+
+    Each job shares its session_id with a DocumentSession row, which mirrors the
+    job's lifecycle: pending while queued, in_progress while a worker holds it,
+    then completed or failed. Claims are atomic conditional updates, so any number
+    of workers (threads or processes) can poll the same database safely.
+    """
+
+    def enqueue(
+        self,
+        session_id: str,
+        tenant_id: str,
+        user_id: str,
+        file_paths: List[str],
+        options: Optional[Dict[str, Any]] = None,
+        max_attempts: Optional[int] = None
+    ) -> str:
+        """Queues an ingestion session and returns its session_id immediately."""
+        now = datetime.utcnow()
+        try:
+            with session_scope() as db:
+                db.merge(DocumentSession(
+                    session_id=session_id,
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                    file_path=";".join(file_paths),
+                    status="pending",
+                    chunk_count=0,
+                    created_at=now,
+                    updated_at=now
+                ))
+                db.merge(IngestionJob(
+                    session_id=session_id,
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                    file_paths=json.dumps(file_paths),
+                    options=json.dumps(options or {}),
+                    status="queued",
+                    attempts=0,
+                    max_attempts=max_attempts or JobQueueConfig.MAX_ATTEMPTS,
+                    next_run_at=now,
+                    created_at=now,
+                    updated_at=now
+                ))
+            logger.info(f"Session {session_id} queued for ingestion ({len(file_paths)} file(s))")
+            return session_id
+
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to enqueue session {session_id}: {str(e)}")
+            raise
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Claims the next runnable job for this worker: a queued job whose backoff has
+        elapsed, or a running job whose heartbeat lease expired. Returns None if
+        nothing is runnable.
+
+        Every claim counts as an attempt, so a job whose worker keeps dying is not
+        re-claimed forever: once its attempts are used up, an expired lease fails
+        the job and its session instead.
+        """
+        now = datetime.utcnow()
+        lease_cutoff = now - timedelta(seconds=JobQueueConfig.LEASE_SECONDS)
+        expired = and_(IngestionJob.status == "running", IngestionJob.heartbeat_at < lease_cutoff)
+        runnable = or_(
+            and_(IngestionJob.status == "queued", IngestionJob.next_run_at <= now),
+            and_(expired, IngestionJob.attempts < IngestionJob.max_attempts)
+        )
+
+        db = SessionLocal()
+        try:
+            self._fail_exhausted(db, worker_id, and_(expired, IngestionJob.attempts >= IngestionJob.max_attempts), now)
+
+            candidates = (
+                db.query(IngestionJob.session_id)
+                .filter(runnable)
+                .order_by(IngestionJob.next_run_at)
+                .limit(5)
+                .all()
+            )
+            for (session_id,) in candidates:
+                # Re-checking the predicate in the UPDATE makes the claim atomic across workers
+                result = db.execute(
+                    update(IngestionJob)
+                    .where(IngestionJob.session_id == session_id, runnable)
+                    .values(status="running", claimed_by=worker_id, attempts=IngestionJob.attempts + 1,
+                            heartbeat_at=now, updated_at=now)
+                )
+                if result.rowcount != 1:
+                    db.rollback()
+                    continue
+
+                db.execute(
+                    update(DocumentSession)
+                    .where(DocumentSession.session_id == session_id)
+                    .values(status="in_progress", updated_at=now)
+                )
+                db.commit()
+
+                job = db.query(IngestionJob).filter_by(session_id=session_id).one()
+                logger.info(f"[{worker_id}] Claimed session {session_id} (attempt {job.attempts}/{job.max_attempts})")
+                return _job_to_dict(job)
+
+            return None
+
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"[{worker_id}] Failed to claim ingestion job: {str(e)}")
+            raise
+
+        finally:
+            db.close()
+
+    def _fail_exhausted(self, db, worker_id: str, exhausted, now: datetime) -> None:
+        """Fails jobs (and their sessions) whose lease expired on their final attempt."""
+        session_ids = [session_id for (session_id,) in db.query(IngestionJob.session_id).filter(exhausted).limit(50).all()]
+        if not session_ids:
+            return
+
+        error = "Worker lease expired on the final attempt"
+        db.execute(
+            update(IngestionJob)
+            .where(IngestionJob.session_id.in_(session_ids), exhausted)
+            .values(status="failed", last_error=error, updated_at=now)
+        )
+        db.execute(
+            update(DocumentSession)
+            .where(DocumentSession.session_id.in_(session_ids))
+            .values(status="failed", error_message=error, updated_at=now)
+        )
+        db.commit()
+        logger.error(f"[{worker_id}] Failed {len(session_ids)} session(s) abandoned on their final attempt")
+
+    def heartbeat(self, session_id: str, worker_id: str) -> bool:
+        """
+        Refreshes the job lease. Returns False if the job is no longer held by this
+        worker (e.g. its lease expired and it was re-claimed). The session's
+        updated_at is left to the caller, which can buffer that write.
+        """
+        now = datetime.utcnow()
+        try:
+            with session_scope() as db:
+                result = db.execute(
+                    update(IngestionJob)
+                    .where(IngestionJob.session_id == session_id, IngestionJob.claimed_by == worker_id,
+                           IngestionJob.status == "running")
+                    .values(heartbeat_at=now, updated_at=now)
+                )
+            return result.rowcount == 1
+
+        except SQLAlchemyError as e:
+            logger.warning(f"[{worker_id}] Heartbeat failed for session {session_id}: {str(e)}")
+            return False
+
+    def complete(self, session_id: str, worker_id: str) -> None:
+        """Marks a claimed job completed. The session row is completed by the ingestion run itself."""
+        self._finish(session_id, worker_id, status="completed")
+
+    def fail(self, session_id: str, worker_id: str, error: str) -> bool:
+        """
+        Records the failure of the current attempt (counted when the job was claimed).
+        Re-queues the job with exponential backoff while attempts remain; otherwise
+        marks the job and its session failed.
+
+        Returns:
+            True if the job will be retried.
+        """
+        try:
+            with session_scope() as db:
+                job = db.query(IngestionJob).filter_by(session_id=session_id, claimed_by=worker_id).first()
+                if job is None:
+                    logger.warning(f"[{worker_id}] Session {session_id} is no longer held by this worker")
+                    return False
+
+                now = datetime.utcnow()
+                job.last_error = error
+                job.updated_at = now
+                session = db.query(DocumentSession).filter_by(session_id=session_id).first()
+
+                retry = job.attempts < job.max_attempts
+                if retry:
+                    delay = min(
+                        JobQueueConfig.BACKOFF_BASE_SECONDS * (2 ** (job.attempts - 1)),
+                        JobQueueConfig.BACKOFF_MAX_SECONDS
+                    )
+                    job.status = "queued"
+                    job.claimed_by = None
+                    job.next_run_at = now + timedelta(seconds=delay)
+                    if session:
+                        session.status = "pending"
+                        session.error_message = f"Attempt {job.attempts} failed, retrying in {int(delay)}s: {error}"
+                        session.updated_at = now
+                    logger.warning(f"[{worker_id}] Session {session_id} failed (attempt {job.attempts}), retry in {int(delay)}s")
+                else:
+                    job.status = "failed"
+                    if session:
+                        session.status = "failed"
+                        session.error_message = error
+                        session.updated_at = now
+                    logger.error(f"[{worker_id}] Session {session_id} failed permanently after {job.attempts} attempt(s)")
+
+            return retry
+
+        except SQLAlchemyError as e:
+            logger.error(f"[{worker_id}] Failed to record failure for session {session_id}: {str(e)}")
+            raise
+
+    def _finish(self, session_id: str, worker_id: str, status: str) -> None:
+        now = datetime.utcnow()
+        try:
+            with session_scope() as db:
+                db.execute(
+                    update(IngestionJob)
+                    .where(IngestionJob.session_id == session_id, IngestionJob.claimed_by == worker_id)
+                    .values(status=status, updated_at=now)
+                )
+            logger.info(f"[{worker_id}] Session {session_id} {status}")
+
+        except SQLAlchemyError as e:
+            logger.error(f"[{worker_id}] Failed to mark session {session_id} {status}: {str(e)}")
+            raise
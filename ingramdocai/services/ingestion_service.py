@@ -0,0 +1,92 @@
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.services.ingestion_pipeline import DocumentIngestionPipeline, IngestionReport
+from ingramdocai.services.query_answer_cache import get_query_answer_cache
+from ingramdocai.services.session_records import SessionRecordWriteBuffer, upsert_session_records
+
+logger = setup_logger("ingestion_service")
+
+
+def format_failed_files(failed_files: Dict[str, str]) -> Optional[str]:
+    """Builds a session error message listing files that failed during ingestion."""
+    if not failed_files:
+        return None
+    return "; ".join(f"{name}: {error}" for name, error in failed_files.items())
+
+
+def run_ingestion_session(
+    session_id: str,
+    tenant_id: str,
+    user_id: str,
+    file_paths: List[str],
+    options: Optional[Dict[str, Any]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    session_writer: Optional[SessionRecordWriteBuffer] = None
+) -> IngestionReport:
+    """
+    Runs the streaming ingestion pipeline for one session and marks the session
+    completed in document_sessions.
+
+    Supported options (same keys as the flow's task_payload):
+    - parallel / max_workers: parse files in a process pool
+    - force_reingest: ignore the content-hash manifest
+    - client_embeddings: compute vectors client-side through the embedding cache
+    - chunking_strategy: override the per-extension / per-tenant chunking strategy
+
+    cancel_event stops the run early (e.g. when a queue worker loses its lease);
+    the session is then left untouched for whoever holds the job now.
+
+    The final session write goes through session_writer when given (and is
+    flushed immediately), so it is ordered after any updates already buffered
+    there; otherwise it is written directly.
+
+    Raises:
+        IngestionCancelled: If cancel_event was set during the run.
+        ValueError: If every file failed to process.
+        Exception: If the pipeline fails. The caller decides whether the session
+        is marked failed or retried.
+    """
+    options = options or {}
+
+    # Parallel mode parses and chunks files in a process pool; results keep input order
+    parallel = bool(options.get("parallel", False))
+    max_workers = options.get("max_workers") if parallel else 1
+
+    pipeline = DocumentIngestionPipeline(
+        tenant_id=tenant_id,
+        session_id=session_id,
+        max_workers=max_workers,
+        force=bool(options.get("force_reingest", False)),
+        client_embeddings=options.get("client_embeddings"),
+        chunking_strategy=options.get("chunking_strategy"),
+        cancel_event=cancel_event
+    )
+    report = pipeline.run(file_paths)
+
+    reused_existing = report.skipped_files or report.chunks_unchanged or report.chunks_deleted
+    if not report.chunks_upserted and not reused_existing:
+        logger.warning("⚠️ No chunks generated from input documents.")
+        if report.failed_files:
+            raise ValueError(f"All {len(report.failed_files)} document(s) failed to process.")
+    else:
+        logger.info(f"Upserted {report.chunks_upserted} document chunks into Weaviate")
+
+    record = {
+        "session_id": session_id,
+        "status": "completed",
+        "chunk_count": report.chunks_upserted,
+        "error_message": format_failed_files(report.failed_files),
+        "updated_at": datetime.utcnow()
+    }
+    if session_writer is not None:
+        session_writer.add(**record)
+        session_writer.flush()
+    else:
+        upsert_session_records([record])
+
+    # Cached answers may be stale now that the tenant has new chunks
+    get_query_answer_cache().invalidate(tenant_id)
+    return report
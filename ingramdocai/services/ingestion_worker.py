@@ -0,0 +1,193 @@
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.persistence.db import Base, engine, reset_engine_after_fork
+from ingramdocai.services.ingestion_pipeline import IngestionCancelled
+from ingramdocai.services.ingestion_queue import IngestionJobQueue
+from ingramdocai.services.ingestion_service import run_ingestion_session
+from ingramdocai.services.session_records import SessionRecordWriteBuffer
+
+logger = setup_logger("ingestion_worker")
+
+
+class WorkerConfig:
+    """
+    Configuration for ingestion queue workers.
+    Reads environment variables for dynamic configuration.
+    """
+    NUM_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+    POLL_INTERVAL_SECONDS = float(os.getenv("INGEST_WORKER_POLL_INTERVAL", "2"))
+    # Must stay well below INGEST_JOB_LEASE_SECONDS so a live worker never loses its job
+    HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("INGEST_WORKER_HEARTBEAT_INTERVAL", "15"))
+
+
+class _Heartbeat:
+    """
+    Background thread that refreshes a claimed job's lease until stopped. If the
+    lease is lost (the job was re-claimed by another worker), lost is set so the
+    running ingestion stops instead of racing the new owner.
+
+    The lease itself is written synchronously; the session's updated_at touch goes
+    through the worker's write-behind buffer.
+    """
+
+    def __init__(
+        self,
+        queue: IngestionJobQueue,
+        session_id: str,
+        worker_id: str,
+        interval: float,
+        session_writer: SessionRecordWriteBuffer
+    ):
+        self._queue = queue
+        self._session_writer = session_writer
+        self._session_id = session_id
+        self._worker_id = worker_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self.lost = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"heartbeat-{session_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _beat(self):
+        while not self._stop.wait(self._interval):
+            if not self._queue.heartbeat(self._session_id, self._worker_id):
+                logger.warning(f"[{self._worker_id}] Lost lease on session {self._session_id}, stopping")
+                self.lost.set()
+                return
+            self._session_writer.add(session_id=self._session_id, updated_at=datetime.utcnow())
+
+
+def process_next_job(
+    queue: IngestionJobQueue,
+    worker_id: str,
+    session_writer: Optional[SessionRecordWriteBuffer] = None
+) -> bool:
+    """
+    Claims and runs one queued ingestion job. Session updates made while it runs
+    go through session_writer (a private buffer is used when none is given).
+
+    Returns:
+        True if a job was claimed (whether it succeeded or not), False if the queue was idle.
+    """
+    job = queue.claim(worker_id)
+    if job is None:
+        return False
+
+    session_id = job["session_id"]
+    owns_writer = session_writer is None
+    if owns_writer:
+        session_writer = SessionRecordWriteBuffer()
+    try:
+        heartbeat = _Heartbeat(queue, session_id, worker_id, WorkerConfig.HEARTBEAT_INTERVAL_SECONDS, session_writer)
+        with heartbeat:
+            report = run_ingestion_session(
+                session_id=session_id,
+                tenant_id=job["tenant_id"],
+                user_id=job["user_id"],
+                file_paths=job["file_paths"],
+                options=job["options"],
+                cancel_event=heartbeat.lost,
+                session_writer=session_writer
+            )
+        queue.complete(session_id, worker_id)
+        logger.info(
+            f"[{worker_id}] Session {session_id} ingested: {report.chunks_upserted} upserted, "
+            f"{len(report.failed_files)} failed file(s)"
+        )
+
+    except IngestionCancelled:
+        # The job now belongs to another worker; it must neither be completed nor failed here
+        logger.warning(f"[{worker_id}] Abandoned session {session_id} after losing its lease")
+
+    except Exception as e:
+        logger.error(f"[{worker_id}] Session {session_id} failed: {str(e)}")
+        # Buffered touches must land before the queue writes the session's failure
+        session_writer.flush()
+        queue.fail(session_id, worker_id, str(e))
+
+    finally:
+        if owns_writer:
+            session_writer.close()
+
+    return True
+
+
+def run_worker(worker_id: str, stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Worker loop: claims jobs until stop_event is set, sleeping for the poll
+    interval whenever the queue is idle.
+    """
+    reset_engine_after_fork()
+    queue = IngestionJobQueue()
+    session_writer = SessionRecordWriteBuffer()
+    logger.info(f"[{worker_id}] Ingestion worker started")
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            try:
+                if process_next_job(queue, worker_id, session_writer):
+                    continue
+            except Exception as e:
+                logger.exception(f"[{worker_id}] Worker loop error: {str(e)}")
+
+            if stop_event is not None:
+                stop_event.wait(WorkerConfig.POLL_INTERVAL_SECONDS)
+            else:
+                time.sleep(WorkerConfig.POLL_INTERVAL_SECONDS)
+    finally:
+        session_writer.close()
+
+    logger.info(f"[{worker_id}] Ingestion worker stopped")
+
+
+class IngestionWorkerPool:
+    """
+    Runs num_workers ingestion workers as separate processes.
+
+    Workers share nothing but the database: each one claims jobs atomically,
+    so throughput scales with the number of workers until Weaviate or the
+    embedding provider becomes the bottleneck.
+    """
+
+    def __init__(self, num_workers: Optional[int] = None):
+        self.num_workers = max(1, num_workers or WorkerConfig.NUM_WORKERS)
+        self._stop_event = multiprocessing.Event()
+        self._processes: List[multiprocessing.Process] = []
+
+    def start(self) -> None:
+        Base.metadata.create_all(bind=engine)
+
+        prefix = f"{socket.gethostname()}-{os.getpid()}"
+        for i in range(self.num_workers):
+            process = multiprocessing.Process(
+                target=run_worker,
+                args=(f"{prefix}-w{i}", self._stop_event),
+                name=f"ingestion-worker-{i}"
+            )
+            process.start()
+            self._processes.append(process)
+        logger.info(f"Started {self.num_workers} ingestion worker(s)")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signals workers to exit after their current job and waits for them."""
+        self._stop_event.set()
+        self.join(timeout)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for process in self._processes:
+            process.join(timeout)
+        self._processes = [p for p in self._processes if p.is_alive()]
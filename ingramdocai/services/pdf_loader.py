@@ -0,0 +1,262 @@
+import atexit
+import mmap
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import fitz
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+from ingramdocai.core.logger import setup_logger
+
+logger = setup_logger("pdf_loader")
+
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+class PDFLoaderConfig:
+    """
+    Configuration for PDF extraction.
+    Reads environment variables for dynamic configuration.
+    """
+    # Pages with fewer extractable characters than this (and at least one image) are OCRed
+    MIN_TEXT_CHARS = int(os.getenv("PDF_MIN_TEXT_CHARS", "25"))
+    OCR_WORKERS = int(os.getenv("PDF_OCR_WORKERS", "2"))
+    OCR_DPI = int(os.getenv("PDF_OCR_DPI", "300"))
+    OCR_LANGUAGE = os.getenv("PDF_OCR_LANGUAGE", "eng")
+    # Extracted pages held back behind a page still being OCRed, to keep output in order
+    MAX_PENDING_PAGES = int(os.getenv("PDF_MAX_PENDING_PAGES", "32"))
+    # Open PDFs from a read-only memory map instead of buffered file reads
+    USE_MMAP = os.getenv("PDF_USE_MMAP", "true").lower() == "true"
+    # Every N pages, trim MuPDF's object store and drop already-read mapped pages
+    RELEASE_EVERY_PAGES = int(os.getenv("PDF_RELEASE_EVERY_PAGES", "50"))
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _ocr_page(file_path: str, page_index: int, dpi: int, language: str) -> Tuple[str, float, Optional[str]]:
+    """
+    OCR worker entry point: renders one page and runs Tesseract through PyMuPDF.
+
+    Returns:
+        (text, elapsed_ms, error)
+    """
+    started = time.perf_counter()
+    try:
+        with fitz.open(file_path) as doc:
+            page = doc[page_index]
+            textpage = page.get_textpage_ocr(dpi=dpi, language=language, full=True)
+            return page.get_text("text", textpage=textpage), _elapsed_ms(started), None
+    except Exception as e:
+        return "", _elapsed_ms(started), str(e)
+
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    """Returns the process-wide OCR pool, kept separate from the parse pool so OCR never starves text extraction."""
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                _ocr_pool = ProcessPoolExecutor(max_workers=max(1, PDFLoaderConfig.OCR_WORKERS))
+                atexit.register(shutdown_ocr_pool)
+    return _ocr_pool
+
+
+def shutdown_ocr_pool() -> None:
+    global _ocr_pool
+    if _ocr_pool is not None:
+        _ocr_pool.shutdown(wait=False, cancel_futures=True)
+        _ocr_pool = None
+
+
+@contextmanager
+def open_pdf(file_path: str, use_mmap: bool = True) -> Iterator[fitz.Document]:
+    """
+    Opens a PDF for page-by-page reading. With use_mmap the file is mapped
+    read-only and handed to MuPDF as a zero-copy buffer, so the OS pages the file
+    in on demand and can reclaim it under pressure; nothing is copied onto the
+    Python heap. Empty files fall back to a regular open, which raises a clear error.
+    """
+    if not use_mmap or os.path.getsize(file_path) == 0:
+        with fitz.open(file_path) as doc:
+            yield doc
+        return
+
+    with open(file_path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    doc = None
+    try:
+        doc = fitz.open(stream=view, filetype="pdf")
+        yield doc
+    finally:
+        if doc is not None:
+            doc.close()
+            doc = None
+        view.release()
+        try:
+            mapped.close()
+        except BufferError:
+            # MuPDF still holds the buffer; the mapping is released when it is collected
+            logger.debug(f"Deferred unmapping of {os.path.basename(file_path)}")
+
+
+def release_page_memory(doc: fitz.Document) -> None:
+    """Empties MuPDF's resource store and tells the OS the mapped file pages read so far can be dropped."""
+    fitz.TOOLS.store_shrink(100)
+    stream = getattr(doc, "stream", None)
+    if isinstance(stream, memoryview) and isinstance(stream.obj, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED"):
+        # Read-only file-backed pages are simply re-read from disk if touched again
+        stream.obj.madvise(mmap.MADV_DONTNEED)
+
+
+class HybridPDFLoader(BaseLoader):
+    """
+    Page-by-page PDF loader that only OCRs pages which need it.
+
+    Each page is first extracted with PyMuPDF. A page whose text layer has fewer
+    than min_text_chars characters but contains images is treated as scanned and
+    sent to the OCR process pool; every other page is yielded immediately.
+    Pages are always yielded in order, with at most ocr_window OCR pages in flight
+    and at most max_pending pages (text or OCR) buffered behind the oldest
+    unfinished OCR page; when either limit is reached the loader waits for it.
+
+    Pages are read from a memory-mapped file (see open_pdf) and never
+    accumulated: each page object goes out of scope once its Document is yielded,
+    and MuPDF's caches are trimmed every release_every pages, so peak memory does
+    not grow with page count.
+
+    Page metadata: source, file_path, page (zero-based), total_pages,
+    extraction ("text" | "ocr") and extract_ms.
+
+    page_timings is filled as pages are yielded, one entry per page, so blank
+    pages and pages whose OCR failed are counted even though they produce no
+    chunks: text/ocr page counts and milliseconds, ocr_failed_pages, and
+    [page_number, method, ms] per page, where method is "text", "ocr" or "ocr_failed".
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        min_text_chars: Optional[int] = None,
+        ocr: bool = True,
+        ocr_window: Optional[int] = None,
+        use_mmap: Optional[bool] = None,
+        release_every: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.file_path = file_path
+        self.min_text_chars = PDFLoaderConfig.MIN_TEXT_CHARS if min_text_chars is None else min_text_chars
+        self.ocr = ocr
+        self.ocr_window = ocr_window or max(1, PDFLoaderConfig.OCR_WORKERS) * 2
+        self.use_mmap = PDFLoaderConfig.USE_MMAP if use_mmap is None else use_mmap
+        self.release_every = release_every or PDFLoaderConfig.RELEASE_EVERY_PAGES
+        self.max_pending = max(1, max_pending or PDFLoaderConfig.MAX_PENDING_PAGES)
+        self.page_timings: Dict[str, Any] = {}
+        self._reset_page_timings()
+
+        # Fail at construction for unreadable files, so callers can fall back to another loader
+        with open_pdf(file_path, self.use_mmap):
+            pass
+
+    def lazy_load(self) -> Iterator[Document]:
+        pending: "deque[Tuple[int, Union[Document, Future]]]" = deque()
+        ocr_in_flight = 0
+        ocr_pages = 0
+        self._reset_page_timings()
+
+        with open_pdf(self.file_path, self.use_mmap) as doc:
+            total_pages = doc.page_count
+            for index in range(total_pages):
+                started = time.perf_counter()
+                page = doc[index]
+                text = page.get_text("text")
+                needs_ocr = self.ocr and self._needs_ocr(page, text)
+                del page
+                if index and index % self.release_every == 0:
+                    release_page_memory(doc)
+
+                if needs_ocr:
+                    ocr_pages += 1
+                    ocr_in_flight += 1
+                    future = get_ocr_pool().submit(
+                        _ocr_page, self.file_path, index, PDFLoaderConfig.OCR_DPI, PDFLoaderConfig.OCR_LANGUAGE
+                    )
+                    pending.append((index, future))
+                else:
+                    pending.append((index, self._document(index, total_pages, text, "text", _elapsed_ms(started))))
+
+                # Drain finished pages in order; block only when too many OCR pages are
+                # in flight or too many pages are buffered behind one
+                while pending and (not isinstance(pending[0][1], Future) or pending[0][1].done()
+                                   or ocr_in_flight >= self.ocr_window or len(pending) >= self.max_pending):
+                    page_doc, ocr_in_flight = self._resolve(pending.popleft(), total_pages, ocr_in_flight)
+                    self._record_timing(page_doc)
+                    yield page_doc
+
+            while pending:
+                page_doc, ocr_in_flight = self._resolve(pending.popleft(), total_pages, ocr_in_flight)
+                self._record_timing(page_doc)
+                yield page_doc
+
+        if ocr_pages:
+            logger.info(f"{os.path.basename(self.file_path)}: OCRed {ocr_pages}/{total_pages} page(s)")
+
+    def _reset_page_timings(self) -> None:
+        # Cleared in place, so a caller holding a reference sees the current run
+        self.page_timings.clear()
+        self.page_timings.update({
+            "text_pages": 0, "ocr_pages": 0, "ocr_failed_pages": 0, "text_ms": 0.0, "ocr_ms": 0.0, "pages": []
+        })
+
+    def _record_timing(self, page_doc: Document) -> None:
+        extraction = page_doc.metadata["extraction"]
+        elapsed = page_doc.metadata["extract_ms"]
+        stats = self.page_timings
+        stats[f"{extraction}_pages"] += 1
+        stats[f"{extraction}_ms"] = round(stats[f"{extraction}_ms"] + elapsed, 2)
+        method = "ocr_failed" if "ocr_error" in page_doc.metadata else extraction
+        if method == "ocr_failed":
+            stats["ocr_failed_pages"] += 1
+        stats["pages"].append([page_doc.metadata["page"] + 1, method, elapsed])
+
+    def _needs_ocr(self, page, text: str) -> bool:
+        return len(text.strip()) < self.min_text_chars and bool(page.get_images(full=False))
+
+    def _resolve(
+        self,
+        item: Tuple[int, Union[Document, Future]],
+        total_pages: int,
+        ocr_in_flight: int
+    ) -> Tuple[Document, int]:
+        index, value = item
+        if not isinstance(value, Future):
+            return value, ocr_in_flight
+
+        text, elapsed, error = value.result()
+        page_doc = self._document(index, total_pages, text, "ocr", elapsed)
+        if error:
+            logger.warning(f"OCR failed on page {index + 1} of {os.path.basename(self.file_path)}: {error}")
+            page_doc.metadata["ocr_error"] = error
+        return page_doc, ocr_in_flight - 1
+
+    def _document(self, index: int, total_pages: int, text: str, extraction: str, elapsed_ms: float) -> Document:
+        return Document(
+            page_content=text,
+            metadata={
+                "source": self.file_path,
+                "file_path": self.file_path,
+                "page": index,
+                "total_pages": total_pages,
+                "extraction": extraction,
+                "extract_ms": elapsed_ms,
+            }
+        )
@@ -0,0 +1,261 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.persistence.db import session_scope
+from ingramdocai.persistence.models import DocumentSession
+from ingramdocai.services.embedding_service import get_embedding_service
+
+logger = setup_logger("query_answer_cache")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class QueryCacheConfig:
+    """
+    Configuration for the per-tenant query answer cache.
+    Reads environment variables for dynamic configuration.
+    """
+    TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL", "900"))
+    MAX_ENTRIES_PER_TENANT = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "256"))
+    SIMILARITY_THRESHOLD = float(os.getenv("QUERY_CACHE_SIMILARITY", "0.95"))
+    SEMANTIC = os.getenv("QUERY_CACHE_SEMANTIC", "true").lower() == "true"
+    # How often a tenant's ingestion watermark is re-read from document_sessions
+    WATERMARK_CHECK_SECONDS = float(os.getenv("QUERY_CACHE_WATERMARK_CHECK_INTERVAL", "5"))
+
+
+class _CacheEntry(NamedTuple):
+    answer: Any
+    embedding: Optional[np.ndarray]
+    created_at: float
+
+
+class CacheLookup(NamedTuple):
+    answer: Any
+    # Normalized query embedding computed during the lookup; pass it to put() on a miss
+    embedding: Optional[np.ndarray]
+
+
+class _TenantCache:
+    def __init__(self, watermark: Optional[datetime], checked_at: float):
+        self.watermark = watermark
+        self.checked_at = checked_at
+        # Keyed by (variant, normalized query)
+        self.entries: "OrderedDict[Tuple[str, str], _CacheEntry]" = OrderedDict()
+
+
+def normalize_query(user_query: str) -> str:
+    """Lowercases, collapses whitespace and strips trailing punctuation."""
+    return re.sub(r"\s+", " ", user_query or "").strip().lower().rstrip("?!. ")
+
+
+def latest_completed_ingest(tenant_id: str) -> Optional[datetime]:
+    """Returns the update time of the tenant's most recently completed ingestion session."""
+    with session_scope() as db:
+        return (
+            db.query(func.max(DocumentSession.updated_at))
+            .filter(DocumentSession.tenant_id == tenant_id, DocumentSession.status == "completed")
+            .scalar()
+        )
+
+
+class QueryAnswerCache:
+    """
+    Tenant-scoped cache of query answers.
+
+    Lookups first try the normalized query text, then (when semantic matching is
+    enabled) the cosine similarity between the query embedding and cached query
+    embeddings. Entries expire after a TTL and each tenant keeps at most
+    max_entries answers in LRU order.
+
+    Entries are partitioned by a variant string describing every option that shapes
+    the answer (e.g. the query mode), so exact and semantic matches only ever return
+    an answer produced the same way.
+
+    A tenant's cache is dropped whenever a newer completed ingestion session appears
+    in document_sessions, so answers never outlive the chunks they were built from.
+    That watermark is re-read at most every watermark_interval seconds per tenant;
+    ingestions in this process invalidate the tenant immediately.
+
+    The query is only embedded when the tenant has entries to compare against, and
+    lookup() returns the embedding so the put() after a miss does not embed again.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        similarity_threshold: Optional[float] = None,
+        embed_fn: Optional[Callable[[str], List[float]]] = None,
+        watermark_fn: Callable[[str], Optional[datetime]] = latest_completed_ingest,
+        watermark_interval: Optional[float] = None
+    ):
+        self.ttl_seconds = ttl_seconds or QueryCacheConfig.TTL_SECONDS
+        self.max_entries = max_entries or QueryCacheConfig.MAX_ENTRIES_PER_TENANT
+        self.similarity_threshold = similarity_threshold or QueryCacheConfig.SIMILARITY_THRESHOLD
+        self.embed_fn = embed_fn
+        self.watermark_fn = watermark_fn
+        self.watermark_interval = (
+            QueryCacheConfig.WATERMARK_CHECK_SECONDS if watermark_interval is None else watermark_interval
+        )
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._tenants: Dict[str, _TenantCache] = {}
+
+    def get(self, tenant_id: str, user_query: str, variant: str = "") -> Optional[Any]:
+        """Returns a cached answer for the query, or None on a miss."""
+        return self.lookup(tenant_id, user_query, variant).answer
+
+    def lookup(self, tenant_id: str, user_query: str, variant: str = "") -> CacheLookup:
+        """
+        Looks up a cached answer (answer is None on a miss) among entries stored
+        under the same variant. The returned embedding is set when the query had to
+        be embedded for semantic matching.
+        """
+        normalized = normalize_query(user_query)
+        key = (variant, normalized)
+        tenant = self._tenant(tenant_id)
+        now = time.time()
+
+        with self._lock:
+            entry = tenant.entries.get(key)
+            if entry and now - entry.created_at < self.ttl_seconds:
+                tenant.entries.move_to_end(key)
+                self.hits += 1
+                return CacheLookup(entry.answer, entry.embedding)
+            # An empty tenant has nothing to match semantically; skip the embedding call
+            comparable = any(
+                entry.embedding is not None for (entry_variant, _), entry in tenant.entries.items()
+                if entry_variant == variant
+            )
+
+        embedding = self._embed(normalized) if comparable else None
+        if embedding is not None:
+            with self._lock:
+                match = self._best_semantic_match(tenant, variant, embedding, now)
+                if match is not None:
+                    tenant.entries.move_to_end(match)
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    logger.debug(f"[{tenant_id}] Semantic cache hit ({variant or 'default'}): '{normalized}' ≈ '{match[1]}'")
+                    return CacheLookup(tenant.entries[match].answer, embedding)
+
+        with self._lock:
+            self.misses += 1
+        return CacheLookup(None, embedding)
+
+    def put(
+        self,
+        tenant_id: str,
+        user_query: str,
+        answer: Any,
+        embedding: Optional[np.ndarray] = None,
+        variant: str = ""
+    ) -> None:
+        """
+        Caches an answer for the query under the given variant, evicting the least
+        recently used entries. embedding is the one returned by lookup(); the query is
+        embedded only without it.
+        """
+        normalized = normalize_query(user_query)
+        key = (variant, normalized)
+        tenant = self._tenant(tenant_id)
+        if embedding is None:
+            embedding = self._embed(normalized)
+
+        with self._lock:
+            tenant.entries[key] = _CacheEntry(answer=answer, embedding=embedding, created_at=time.time())
+            tenant.entries.move_to_end(key)
+            while len(tenant.entries) > self.max_entries:
+                tenant.entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: Optional[str] = None) -> None:
+        """Drops cached answers for one tenant, or for every tenant if none is given."""
+        with self._lock:
+            if tenant_id is None:
+                self._tenants.clear()
+            else:
+                self._tenants.pop(tenant_id, None)
+        logger.info(f"Query answer cache invalidated (tenant={tenant_id or 'all'})")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _tenant(self, tenant_id: str) -> _TenantCache:
+        """
+        Returns the tenant's cache, resetting it if a newer ingestion has completed.
+        The watermark query runs at most once per watermark_interval per tenant.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if tenant is not None and now - tenant.checked_at < self.watermark_interval:
+                return tenant
+
+        watermark = self.watermark_fn(tenant_id)
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if tenant is None or tenant.watermark != watermark:
+                if tenant is not None:
+                    logger.info(f"[{tenant_id}] New ingestion detected, dropping cached answers")
+                tenant = _TenantCache(watermark, now)
+                self._tenants[tenant_id] = tenant
+            else:
+                tenant.checked_at = now
+            return tenant
+
+    def _embed(self, normalized_query: str) -> Optional[np.ndarray]:
+        if self.embed_fn is None:
+            return None
+        try:
+            vector = np.asarray(self.embed_fn(normalized_query), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Query embedding failed, falling back to exact matching: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _best_semantic_match(
+        self, tenant: _TenantCache, variant: str, embedding: np.ndarray, now: float
+    ) -> Optional[Tuple[str, str]]:
+        candidates = [
+            (key, entry.embedding) for key, entry in tenant.entries.items()
+            if key[0] == variant and entry.embedding is not None and now - entry.created_at < self.ttl_seconds
+        ]
+        if not candidates:
+            return None
+
+        scores = np.stack([vector for _, vector in candidates]) @ embedding
+        best = int(np.argmax(scores))
+        return candidates[best][0] if scores[best] >= self.similarity_threshold else None
+
+
+def get_query_answer_cache() -> QueryAnswerCache:
+    """Returns the process-wide query answer cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                embed_fn = None
+                if QueryCacheConfig.SEMANTIC:
+                    embed_fn = get_embedding_service().embed_query
+                _cache = QueryAnswerCache(embed_fn=embed_fn)
+    return _cache
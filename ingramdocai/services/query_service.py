@@ -0,0 +1,211 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI, OpenAI
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.crews.query_agent import QueryResponseState, query_response_instruction
+from ingramdocai.services.weaviate_client import connect_weaviate_async_client
+from ingramdocai.services.weaviate_document_schema import WeaviateDocumentSchema
+from ingramdocai.tools.get_chunk_tool import FetchDocumentChunksTool, build_chunk_filters
+
+logger = setup_logger("query_service")
+
+_service = None
+_service_lock = threading.Lock()
+
+
+class QueryConfig:
+    """
+    Configuration for the direct (non-agent) query services.
+    Reads environment variables for dynamic configuration.
+    """
+    MODEL = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
+    TOP_K = int(os.getenv("QUERY_TOP_K", "5"))
+    MAX_CONCURRENCY = int(os.getenv("QUERY_MAX_CONCURRENCY", "200"))
+
+
+def _parse_completion(completion: Any) -> QueryResponseState:
+    """Extracts QueryResponseState from a structured-output completion, tolerating plain text."""
+    message = completion.choices[0].message
+    if getattr(message, "parsed", None) is not None:
+        return message.parsed
+    return QueryResponseState(final_message=(message.content or "").strip())
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+class QueryService:
+    """
+    Retrieval-only fast path for the QueryRouter.
+
+    Runs hybrid search directly, builds the prompt from query_response_instruction
+    and makes exactly one completion call — no tool-using agent loop. Returns the
+    same QueryResponseState as the agent, plus per-stage latency and token usage.
+    """
+
+    def __init__(self, model: Optional[str] = None, top_k: Optional[int] = None):
+        self.model = model or QueryConfig.MODEL
+        self.top_k = top_k or QueryConfig.TOP_K
+        self._retriever = FetchDocumentChunksTool()
+        self._llm = None
+
+    def answer(
+        self,
+        tenant_id: str,
+        user_query: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[QueryResponseState, Dict[str, Any]]:
+        """
+        Parameters:
+        - filters: Optional FetchDocumentChunksTool constraints
+          (file_name, file_type, session_id, page_from, page_to).
+
+        Returns:
+            (QueryResponseState, {
+                "retrieval_ms": float, "prompt_ms": float, "llm_ms": float, "total_ms": float,
+                "chunks": int, "prompt_tokens": int, "completion_tokens": int
+            })
+        """
+        started = time.perf_counter()
+
+        stage = time.perf_counter()
+        chunks = self._retriever._run(tenant_id=tenant_id, user_query=user_query, limit=self.top_k, **(filters or {}))
+        retrieval_ms = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        prompt = query_response_instruction(tenant_id=tenant_id, user_query=user_query, chunks=chunks)
+        prompt_ms = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        if self._llm is None:
+            self._llm = OpenAI()
+        completion = self._llm.beta.chat.completions.parse(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=QueryResponseState
+        )
+        llm_ms = _elapsed_ms(stage)
+
+        usage = getattr(completion, "usage", None)
+        metrics = {
+            "retrieval_ms": retrieval_ms,
+            "prompt_ms": prompt_ms,
+            "llm_ms": llm_ms,
+            "total_ms": _elapsed_ms(started),
+            "chunks": len(chunks),
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+        }
+        logger.info(f"[{tenant_id}] Fast-path query answered: {metrics}")
+        return _parse_completion(completion), metrics
+
+
+def get_query_service() -> QueryService:
+    """Returns a process-wide QueryService so its OpenAI client keeps connections warm."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = QueryService()
+    return _service
+
+
+class AsyncQueryService:
+    """
+    Asyncio variant of the QueryRouter path for high-concurrency serving.
+
+    Retrieval runs on Weaviate's async client and synthesis on an async OpenAI
+    completion, so a single worker can keep many tenant queries in flight. The
+    number of concurrent queries is bounded by max_concurrency.
+
+    The async Weaviate client is bound to the event loop it was created on; use
+    one service per loop and call `aclose()` on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        model: Optional[str] = None,
+        top_k: Optional[int] = None
+    ):
+        self.max_concurrency = max_concurrency or QueryConfig.MAX_CONCURRENCY
+        self.model = model or QueryConfig.MODEL
+        self.top_k = top_k or QueryConfig.TOP_K
+        self._client = None
+        self._llm = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    async def answer(
+        self,
+        tenant_id: str,
+        user_query: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> QueryResponseState:
+        """Retrieves the top chunks for the query and synthesizes a grounded answer."""
+        semaphore = self._get_semaphore()
+        async with semaphore:
+            chunks = await self.retrieve(tenant_id, user_query, filters=filters)
+            prompt = query_response_instruction(tenant_id=tenant_id, user_query=user_query, chunks=chunks)
+            return await self._complete(prompt)
+
+    async def retrieve(
+        self,
+        tenant_id: str,
+        user_query: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Runs hybrid search for the tenant, narrowed by optional metadata filters, and returns chunk properties."""
+        tenant_id = tenant_id.strip().lower()
+        client = await self._get_client()
+        collection = client.collections.get(WeaviateDocumentSchema.CLASS_NAME).with_tenant(tenant_id)
+
+        logger.info(f"[{tenant_id}] Async query: '{user_query}'")
+        results = await collection.query.hybrid(
+            query=user_query,
+            limit=self.top_k,
+            filters=build_chunk_filters(**(filters or {}))
+        )
+        matches = [obj.properties for obj in results.objects or []]
+        logger.info(f"[{tenant_id}] Found {len(matches)} match(es)")
+        return matches
+
+    async def aclose(self) -> None:
+        """Closes the async Weaviate and OpenAI clients."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        if self._llm is not None:
+            await self._llm.close()
+            self._llm = None
+
+    async def _complete(self, prompt: str) -> QueryResponseState:
+        if self._llm is None:
+            self._llm = AsyncOpenAI()
+        completion = await self._llm.beta.chat.completions.parse(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=QueryResponseState
+        )
+        return _parse_completion(completion)
+
+    async def _get_client(self):
+        if self._client is not None:
+            return self._client
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._client is None:
+                self._client = await connect_weaviate_async_client()
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
@@ -0,0 +1,198 @@
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.persistence.bulk import upsert_rows
+from ingramdocai.persistence.db import session_scope
+from ingramdocai.persistence.models import DocumentSession
+
+logger = setup_logger("session_records")
+
+_SESSION_FIELDS = {
+    "session_id", "tenant_id", "user_id", "file_path", "status",
+    "chunk_count", "error_message", "created_at", "updated_at",
+}
+
+# Values a new row gets when the caller did not pass them; never written over an existing row
+_INSERT_DEFAULTS = {"status": "in_progress", "chunk_count": 0}
+
+
+class SessionWriteConfig:
+    """
+    Configuration for batched session record writes.
+    Reads environment variables for dynamic configuration.
+    """
+    FLUSH_INTERVAL_SECONDS = float(os.getenv("SESSION_WRITE_FLUSH_INTERVAL", "1"))
+    MAX_PENDING = int(os.getenv("SESSION_WRITE_MAX_PENDING", "200"))
+
+
+def _normalize(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Rejects unknown keys, drops unset values and stamps updated_at, like SaveSessionRecordTool."""
+    unknown = set(record) - _SESSION_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown session record field(s): {', '.join(sorted(unknown))}")
+    if not record.get("session_id"):
+        raise ValueError("Every session record needs a session_id.")
+
+    row = {k: v for k, v in record.items() if v is not None}
+    row["updated_at"] = row.get("updated_at") or datetime.utcnow()
+    return row
+
+
+def upsert_session_records(records: List[Dict[str, Any]]) -> int:
+    """
+    Writes many document_sessions inserts and updates in one transaction.
+
+    Records carrying a file_path are inserted, or update the existing row via
+    INSERT ... ON CONFLICT on session_id. Records without one update existing
+    rows only, in a single executemany keyed by session_id; their session_ids are
+    checked first (after this batch's inserts), so an unknown session fails the
+    whole transaction instead of being silently ignored. Only the fields
+    present in a record are written, so partial updates (e.g. status only) never
+    clear other columns. New rows get status in_progress and chunk_count 0 unless
+    given, but those defaults never overwrite an existing row's values.
+
+    Returns:
+        Number of records written.
+
+    Raises:
+        ValueError: If a record is missing session_id or has unknown fields, or a
+            record without file_path targets a session that does not exist.
+        SQLAlchemyError: If the transaction fails; nothing is written.
+    """
+    rows = [_normalize(record) for record in records]
+    if not rows:
+        return 0
+
+    # Inserts are grouped by the columns the caller supplied: only those are written on conflict
+    inserts: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        if "file_path" in row:
+            supplied = tuple(sorted(set(row) - {"session_id", "created_at"}))
+            for column, value in _INSERT_DEFAULTS.items():
+                row.setdefault(column, value)
+            row.setdefault("created_at", row["updated_at"])
+            inserts.setdefault(supplied, []).append(row)
+    updates = [row for row in rows if "file_path" not in row]
+
+    try:
+        with session_scope() as db:
+            for supplied, group in inserts.items():
+                upsert_rows(db, DocumentSession, group, conflict_columns=["session_id"], update_columns=supplied)
+
+            if updates:
+                update_ids = {row["session_id"] for row in updates}
+                existing = {
+                    session_id for (session_id,) in
+                    db.query(DocumentSession.session_id).filter(DocumentSession.session_id.in_(update_ids))
+                }
+                missing = update_ids - existing
+                if missing:
+                    logger.error(f"Session update(s) without file_path for unknown session(s): {', '.join(sorted(missing))}")
+                    raise ValueError("file_path is required to create a new session.")
+
+            groups: Dict[tuple, List[Dict[str, Any]]] = {}
+            for row in updates:
+                groups.setdefault(tuple(sorted(row)), []).append(row)
+            for group in groups.values():
+                # ORM bulk UPDATE by primary key: one executemany per column set
+                db.execute(update(DocumentSession), group)
+
+        logger.info(f"Session records written: {len(rows) - len(updates)} upserted, {len(updates)} updated")
+        return len(rows)
+
+    except SQLAlchemyError as e:
+        logger.error(f"Bulk session record write failed: {str(e)}")
+        raise
+
+
+class SessionRecordWriteBuffer:
+    """
+    Write-behind buffer for document_sessions updates.
+
+    `add()` only records the change in memory; updates to the same session are
+    coalesced field by field. Pending records are written with
+    upsert_session_records when max_pending sessions are waiting, every
+    flush_interval seconds from a background thread, and on `close()`.
+
+    Buffered updates are lost if the process dies before a flush, so callers that
+    need a durable state change (e.g. a final completed/failed status) should
+    call `flush()` after adding it. A batch rejected with ValueError (e.g. an
+    update for an unknown session) is retried record by record, and only the
+    rejected records are dropped.
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None, max_pending: Optional[int] = None):
+        self.flush_interval = flush_interval or SessionWriteConfig.FLUSH_INTERVAL_SECONDS
+        self.max_pending = max_pending or SessionWriteConfig.MAX_PENDING
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="session-write-buffer", daemon=True)
+        self._thread.start()
+
+    def add(self, **record: Any) -> None:
+        """Buffers a session insert or update (same fields as SaveSessionRecordTool)."""
+        row = _normalize(record)
+        with self._lock:
+            self._pending.setdefault(row["session_id"], {}).update(row)
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Writes every pending record now. Failed writes are re-queued for the next flush."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            try:
+                return upsert_session_records(list(batch.values()))
+            except ValueError:
+                return self._flush_individually(batch)
+            except SQLAlchemyError:
+                self._requeue(batch)
+                return 0
+
+    def _flush_individually(self, batch: Dict[str, Dict[str, Any]]) -> int:
+        """Writes a rejected batch one record at a time, dropping only the invalid records."""
+        written = 0
+        failed: Dict[str, Dict[str, Any]] = {}
+        for session_id, row in batch.items():
+            try:
+                written += upsert_session_records([row])
+            except ValueError as e:
+                logger.warning(f"Dropping buffered session record {session_id}: {str(e)}")
+            except SQLAlchemyError:
+                failed[session_id] = row
+        if failed:
+            self._requeue(failed)
+        return written
+
+    def _requeue(self, batch: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            for session_id, row in batch.items():
+                # Newer buffered fields win over the ones that failed to write
+                self._pending[session_id] = {**row, **self._pending.get(session_id, {})}
+
+    def close(self) -> None:
+        """Stops the background flusher and writes what is left."""
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Session write buffer flush failed: {str(e)}")
@@ -0,0 +1,192 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+from ingramdocai.core.logger import setup_logger
+from ingramdocai.crews.status_request_agent import StatusQueryState
+from ingramdocai.persistence.db import session_scope
+from ingramdocai.persistence.models import DocumentSession
+from ingramdocai.services.ingestion_progress import load_session_progress
+
+logger = setup_logger("status_service")
+
+NOT_FOUND_MESSAGE = "We couldn’t find any document processing session matching your request."
+
+MAX_PAGE_SIZE = 500
+
+
+def utc_now() -> datetime:
+    """Current UTC time as a naive datetime, matching how session timestamps are stored."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def describe_age(seconds: float) -> str:
+    """Formats an elapsed time as e.g. "just now", "5 minutes ago", "2 hours ago"."""
+    seconds = max(0, int(seconds))
+    if seconds < 10:
+        return "just now"
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = seconds // size
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+    return f"{seconds} seconds ago"
+
+
+def summarize_session(
+    record: DocumentSession,
+    progress: Optional[Dict[str, Any]] = None,
+    now: Optional[datetime] = None
+) -> StatusQueryState:
+    """Builds a StatusQueryState for one session row without calling an LLM."""
+    now = now or utc_now()
+    updated_at = record.updated_at or record.created_at
+    if updated_at is not None and updated_at.tzinfo is not None:
+        updated_at = updated_at.astimezone(timezone.utc).replace(tzinfo=None)
+    seconds = (now - updated_at).total_seconds() if updated_at else None
+
+    parts = [f"Session {record.session_id} is {record.status.replace('_', ' ')}"]
+    if record.chunk_count:
+        parts.append(f"with {record.chunk_count} chunk(s) processed")
+    summary = " ".join(parts) + "."
+
+    if progress and record.status in {"pending", "in_progress"}:
+        rates = [f["chunks_per_second"] for f in progress["files"] if f["status"] in {"parsing", "parsed"}]
+        summary += (
+            f" {progress['files_parsed']} of {progress['files_total']} file(s) parsed, "
+            f"{progress['chunks_upserted']} chunk(s) upserted"
+        )
+        if any(rates):
+            summary += f" at {sum(r for r in rates if r):.1f} chunks/s"
+        summary += "."
+    if progress and progress["failed_objects"]:
+        summary += f" {progress['failed_objects']} object(s) were rejected by the vector store."
+    if record.error_message:
+        summary += f" Error: {record.error_message}."
+    if seconds is not None:
+        summary += f" Last updated {describe_age(seconds)}."
+
+    return StatusQueryState(
+        job_status_summary=summary,
+        session_id=record.session_id,
+        status=record.status,
+        chunk_count=record.chunk_count,
+        error_message=record.error_message,
+        updated_at=updated_at.strftime("%Y-%m-%d %H:%M:%S") if updated_at else None,
+        seconds_since_update=round(seconds, 1) if seconds is not None else None,
+        progress=progress
+    )
+
+
+def get_session_status(session_id: str) -> StatusQueryState:
+    """
+    Deterministic status lookup: reads document_sessions and per-file progress
+    directly and computes freshness in code. Returns a not-found summary when
+    the session does not exist.
+    """
+    with session_scope() as db:
+        record = db.query(DocumentSession).filter_by(session_id=session_id).first()
+        if record is not None:
+            db.expunge(record)
+
+    if record is None:
+        logger.info(f"No session found for session_id={session_id}")
+        return StatusQueryState(job_status_summary=NOT_FOUND_MESSAGE, session_id=session_id)
+
+    progress = load_session_progress([session_id]).get(session_id)
+    return summarize_session(record, progress)
+
+
+def get_session_statuses(session_ids: List[str], include_progress: bool = False) -> List[StatusQueryState]:
+    """
+    Bulk status lookup: one query for any number of session IDs (plus one for
+    per-file progress when include_progress is set). Results follow the input
+    order; unknown sessions get a not-found summary.
+    """
+    session_ids = list(dict.fromkeys(session_ids))
+    if not session_ids:
+        return []
+
+    with session_scope() as db:
+        records = db.query(DocumentSession).filter(DocumentSession.session_id.in_(session_ids)).all()
+        db.expunge_all()
+
+    by_id = {record.session_id: record for record in records}
+    progress = load_session_progress(list(by_id)) if include_progress else {}
+    now = utc_now()
+
+    return [
+        summarize_session(by_id[sid], progress.get(sid), now) if sid in by_id
+        else StatusQueryState(job_status_summary=NOT_FOUND_MESSAGE, session_id=sid)
+        for sid in session_ids
+    ]
+
+
+def encode_cursor(record: DocumentSession) -> str:
+    """Opaque keyset cursor pointing just past the given row."""
+    return f"{record.created_at.isoformat()}|{record.session_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        created_at, session_id = cursor.split("|", 1)
+        return datetime.fromisoformat(created_at), session_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def list_sessions(
+    tenant_id: str,
+    user_id: Optional[str] = None,
+    statuses: Optional[List[str]] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_progress: bool = False
+) -> Tuple[List[StatusQueryState], Optional[str]]:
+    """
+    Lists a tenant's (optionally one user's) sessions, newest first, using keyset
+    pagination on (created_at, session_id) so every page costs one indexed range
+    scan regardless of how deep it is. The key is immutable, so sessions updated
+    while a client pages through never move between pages (no skips or repeats).
+
+    Parameters:
+    - tenant_id: Tenant whose sessions are listed.
+    - user_id: Restrict to sessions started by this user.
+    - statuses: Restrict to these statuses (e.g. ["in_progress", "failed"]).
+    - limit: Page size, capped at MAX_PAGE_SIZE.
+    - cursor: next_cursor from the previous page.
+
+    Returns:
+        (statuses for this page, next_cursor or None on the last page)
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query_filters = [DocumentSession.tenant_id == tenant_id]
+    if user_id:
+        query_filters.append(DocumentSession.user_id == user_id)
+    if statuses:
+        query_filters.append(DocumentSession.status.in_(statuses))
+    if cursor:
+        created_at, session_id = decode_cursor(cursor)
+        query_filters.append(or_(
+            DocumentSession.created_at < created_at,
+            and_(DocumentSession.created_at == created_at, DocumentSession.session_id < session_id)
+        ))
+
+    with session_scope() as db:
+        records = (
+            db.query(DocumentSession)
+            .filter(*query_filters)
+            .order_by(DocumentSession.created_at.desc(), DocumentSession.session_id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        db.expunge_all()
+
+    has_more = len(records) > limit
+    records = records[:limit]
+    progress = load_session_progress([r.session_id for r in records]) if include_progress else {}
+    now = utc_now()
+
+    page = [summarize_session(r, progress.get(r.session_id), now) for r in records]
+    next_cursor = encode_cursor(records[-1]) if has_more else None
+    return page, next_cursor
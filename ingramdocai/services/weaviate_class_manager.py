@@ -1,5 +1,8 @@
 import json
-from typing import Any, Dict, List
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from weaviate.classes.config import Property
 from ingramdocai.services.weaviate_client import get_weaviate_client
 from ingramdocai.services.weaviate_document_schema import WeaviateDocumentSchema
@@ -8,6 +11,73 @@ from ingramdocai.core.logger import setup_logger
 logger = setup_logger("weaviate-class-manager")
 
 
+class SchemaCacheConfig:
+    """
+    Configuration for the process-level schema and tenant cache.
+    Reads environment variables for dynamic configuration.
+    """
+    TTL_SECONDS = float(os.getenv("WEAVIATE_SCHEMA_CACHE_TTL", "600"))
+
+
+class _SchemaCache:
+    """
+    Remembers which classes have been synced and which tenants are registered,
+    so the hot ingest path skips schema round trips after warm-up.
+    Entries expire after TTL_SECONDS and can be invalidated explicitly.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._classes: Dict[str, float] = {}
+        self._tenants: Dict[Tuple[str, str], float] = {}
+
+    def _fresh(self, stamp: Optional[float]) -> bool:
+        return stamp is not None and time.monotonic() - stamp < self._ttl
+
+    def class_synced(self, class_name: str) -> bool:
+        with self._lock:
+            return self._fresh(self._classes.get(class_name))
+
+    def mark_class_synced(self, class_name: str) -> None:
+        with self._lock:
+            self._classes[class_name] = time.monotonic()
+
+    def tenant_registered(self, class_name: str, tenant_id: str) -> bool:
+        with self._lock:
+            return self._fresh(self._tenants.get((class_name, tenant_id)))
+
+    def mark_tenant_registered(self, class_name: str, tenant_id: str) -> None:
+        with self._lock:
+            self._tenants[(class_name, tenant_id)] = time.monotonic()
+
+    def invalidate(self, class_name: Optional[str] = None, tenant_id: Optional[str] = None) -> None:
+        with self._lock:
+            if class_name is None and tenant_id is None:
+                self._classes.clear()
+                self._tenants.clear()
+                return
+            if tenant_id is None:
+                self._classes.pop(class_name, None)
+            self._tenants = {
+                key: stamp for key, stamp in self._tenants.items()
+                if not ((class_name is None or key[0] == class_name) and (tenant_id is None or key[1] == tenant_id))
+            }
+
+
+_schema_cache = _SchemaCache(SchemaCacheConfig.TTL_SECONDS)
+
+
+def invalidate_schema_cache(class_name: Optional[str] = None, tenant_id: Optional[str] = None) -> None:
+    """
+    Drops cached schema and tenant state so the next sync hits Weaviate again.
+    With no arguments everything is invalidated; a tenant_id alone drops that
+    tenant's registrations across classes.
+    """
+    _schema_cache.invalidate(class_name=class_name, tenant_id=tenant_id)
+    logger.debug(f"Schema cache invalidated (class={class_name}, tenant={tenant_id})")
+
+
 def list_all_tenants() -> List[str]:
     """Return all tenants registered under the DocumentChunk class."""
     client = get_weaviate_client()
@@ -42,6 +112,7 @@ def delete_class(tenant_id: str, class_name: str) -> None:
             logger.warning(f"[tenant={tenant_id}] Class '{class_name}' not found — skipping delete.")
             return
         client.collections.delete(class_name)
+        invalidate_schema_cache(class_name=class_name)
         logger.info(f"[tenant={tenant_id}] Deleted class '{class_name}'.")
     except Exception as e:
         logger.exception(f"[tenant={tenant_id}] Failed to delete class '{class_name}': {e}")
@@ -51,13 +122,16 @@ def sync_schema(tenant_id: str) -> None:
     """
     Sync or create the DocumentChunk class schema.
     Adds any missing properties to an existing class.
+    Returns immediately if the class was synced within the cache TTL.
     """
-    client = get_weaviate_client()
     class_name = WeaviateDocumentSchema.CLASS_NAME
-    try:
-        existing = client.collections.list_all() or []
+    if _schema_cache.class_synced(class_name):
+        logger.debug(f"[tenant={tenant_id}] Schema for '{class_name}' served from cache")
+        return
 
-        if class_name in existing:
+    client = get_weaviate_client()
+    try:
+        if client.collections.exists(class_name):
             logger.info(f"[tenant={tenant_id}] Syncing properties on existing class '{class_name}'")
             col = client.collections.get(class_name)
             existing_props = {p.name for p in col.config.get().properties}
@@ -78,6 +152,8 @@ def sync_schema(tenant_id: str) -> None:
             client.collections.create_from_dict(schema_dict)
             logger.info(f"[tenant={tenant_id}] Created class '{class_name}'")
 
+        _schema_cache.mark_class_synced(class_name)
+
     except Exception as e:
         logger.exception(f"[tenant={tenant_id}] Failed to sync schema: {e}")
 
@@ -86,21 +162,28 @@ def ensure_tenant_registered(tenant_id: str) -> bool:
     """
     Ensure the tenant is registered under the DocumentChunk class.
     Returns True if newly created, False if already registered.
+    Looks up only this tenant rather than listing all of them, and skips the
+    lookup entirely if the tenant was confirmed within the cache TTL.
     """
-    client = get_weaviate_client()
     class_name = WeaviateDocumentSchema.CLASS_NAME
+    if _schema_cache.tenant_registered(class_name, tenant_id):
+        logger.debug(f"[tenant={tenant_id}] Registration served from cache")
+        return False
+
+    client = get_weaviate_client()
     try:
-        if class_name not in client.collections.list_all():
+        if not _schema_cache.class_synced(class_name) and not client.collections.exists(class_name):
             logger.warning(f"[tenant={tenant_id}] Class '{class_name}' does not exist yet")
             return False
 
         col = client.collections.get(class_name)
-        existing = col.tenants.get() or []
-        if tenant_id in existing:
+        if col.tenants.get_by_name(tenant_id) is not None:
             logger.info(f"[tenant={tenant_id}] Already registered")
+            _schema_cache.mark_tenant_registered(class_name, tenant_id)
             return False
 
         col.tenants.create(tenant_id)
+        _schema_cache.mark_tenant_registered(class_name, tenant_id)
         logger.info(f"[tenant={tenant_id}] Tenant registered to class '{class_name}'")
         return True
 
@@ -109,6 +192,56 @@ def ensure_tenant_registered(tenant_id: str) -> bool:
         return False
 
 
+_vectorizer_checked = set()
+
+# Weaviate records the legacy OpenAI model as "ada" plus a modelVersion
+_LEGACY_MODEL_NAMES = {"ada": "text-embedding-ada-002"}
+
+
+def ensure_vectorizer_matches(model: str, dimensions: Optional[int] = None) -> None:
+    """
+    Verifies that the DocumentChunk collection's text2vec-openai vectorizer uses
+    the given embedding model and dimensions. Client-side vectors are only
+    comparable with the query vectors Weaviate computes if both match, so this is
+    checked once per process before a client-side ingest writes anything.
+    A collection that does not exist yet is created with the pinned config by sync_schema.
+
+    Raises:
+        ValueError: If the collection's vectorizer model or dimensions differ.
+    """
+    class_name = WeaviateDocumentSchema.CLASS_NAME
+    if class_name in _vectorizer_checked:
+        return
+
+    client = get_weaviate_client()
+    if not client.collections.exists(class_name):
+        return
+
+    config = client.collections.get(class_name).config.get()
+    vectorizer = getattr(config.vectorizer, "value", config.vectorizer)
+    if vectorizer == "text2vec-openai":
+        settings = dict(getattr(config.vectorizer_config, "model", None) or {})
+        server_model = _LEGACY_MODEL_NAMES.get(settings.get("model"), settings.get("model"))
+        server_dimensions = settings.get("dimensions")
+
+        if server_model is None:
+            logger.warning(
+                f"'{class_name}' does not record its text2vec-openai model; "
+                f"make sure Weaviate's default matches EMBEDDING_MODEL={model}"
+            )
+        elif server_model != model:
+            raise ValueError(
+                f"'{class_name}' is vectorized with '{server_model}' but client embeddings use '{model}'; "
+                "set EMBEDDING_MODEL to the collection's model or use EMBEDDING_MODE=server"
+            )
+        if server_dimensions and dimensions and int(server_dimensions) != dimensions:
+            raise ValueError(
+                f"'{class_name}' is vectorized with {server_dimensions} dimensions but client embeddings use {dimensions}"
+            )
+
+    _vectorizer_checked.add(class_name)
+
+
 def get_schema_definition() -> Dict[str, Any]:
     """Returns the raw DocumentChunk schema dict for inspection or manual use."""
     schema = WeaviateDocumentSchema.get_schema()
@@ -1,23 +1,49 @@
+import asyncio
+import atexit
+import hashlib
+import itertools
 import os
-from dotenv import load_dotenv
-load_dotenv()
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
 
-import boto3
-from weaviate import connect_to_weaviate_cloud, WeaviateClient
+from weaviate import connect_to_weaviate_cloud, use_async_with_weaviate_cloud, WeaviateAsyncClient, WeaviateClient
 from weaviate.classes.init import Auth
-from weaviate.exceptions import WeaviateBaseError
+from weaviate.exceptions import WeaviateBaseError, WeaviateClosedClientError, WeaviateConnectionError
 from tenacity import retry, wait_exponential, stop_after_attempt, RetryError
 from ingramdocai.core.logger import setup_logger
+from ingramdocai.services.config_provider import get_config_provider
 
 logger = setup_logger("weaviate-client")
 
-# Internal client cache
-_client = None
+# Internal client pool
+_pool = None
+_pool_lock = threading.Lock()
+
+# Enterprise clients, keyed by (cluster URL, API key hash). _enterprise_lock only guards
+# the dicts; connecting happens under the key's own lock, so one slow cluster never
+# blocks clients for the others.
+_enterprise_clients: Dict[Tuple[str, str], WeaviateClient] = {}
+_enterprise_key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_enterprise_lock = threading.Lock()
+
+_CREDENTIAL_NAMES = ("WEAVIATE_URL", "WEAVIATE_API_KEY", "OPENAI_API_KEY")
+
+
+class WeaviateClientConfig:
+    """
+    Configuration for the shared Weaviate client pool.
+    Reads environment variables for dynamic configuration.
+    """
+    POOL_SIZE = int(os.getenv("WEAVIATE_POOL_SIZE", "2"))
+    MAX_CONCURRENT_QUERIES = int(os.getenv("WEAVIATE_MAX_CONCURRENT_QUERIES", "16"))
+    HEALTH_CHECK_INTERVAL = float(os.getenv("WEAVIATE_HEALTH_CHECK_INTERVAL", "30"))
 
 
 def fetch_ssm_parameters() -> dict:
     """
-    Fetch required parameters from AWS SSM Parameter Store.
+    Fetch required parameters from AWS SSM Parameter Store in one batched call.
 
     Returns:
         dict: A dictionary containing the required parameter values.
@@ -26,13 +52,11 @@ def fetch_ssm_parameters() -> dict:
         Exception: If any parameter cannot be fetched.
     """
     logger.info("Fetching configuration from AWS SSM Parameter Store...")
-    ssm = boto3.client("ssm")
     try:
-        params = {
-            "WEAVIATE_URL": ssm.get_parameter(Name="/myapp/WEAVIATE_URL", WithDecryption=True)["Parameter"]["Value"],
-            "WEAVIATE_API_KEY": ssm.get_parameter(Name="/myapp/WEAVIATE_API_KEY", WithDecryption=True)["Parameter"]["Value"],
-            "OPENAI_API_KEY": ssm.get_parameter(Name="/myapp/OPENAI_API_KEY", WithDecryption=True)["Parameter"]["Value"]
-        }
+        params = get_config_provider().source.fetch(list(_CREDENTIAL_NAMES))
+        missing = [name for name in _CREDENTIAL_NAMES if not params.get(name)]
+        if missing:
+            raise KeyError(f"Missing SSM parameters: {', '.join(missing)}")
         logger.info("Fetched parameters from SSM.")
         return params
     except Exception as e:
@@ -61,42 +85,31 @@ def _initialize_weaviate_client(weaviate_url: str, weaviate_api_key: str, openai
     return client
 
 
-def get_weaviate_client() -> WeaviateClient:
+def _resolve_credentials() -> Tuple[str, str, str]:
     """
-    Returns a singleton instance of a connected Weaviate client.
-    Uses environment variables by default and falls back to AWS SSM Parameter Store
-    if required environment variables are missing.
+    Resolves the Weaviate URL, Weaviate API key and OpenAI API key.
+    Uses environment variables by default; anything missing comes from the config
+    provider's caches or, at most once per cache lifetime, a single batched SSM call.
     """
-    global _client
-    if _client:
-        return _client
+    try:
+        values = get_config_provider().get_many(_CREDENTIAL_NAMES)
+    except Exception as e:
+        logger.error(f"Failed to load required vars from SSM: {e}")
+        raise EnvironmentError("Missing environment variables and failed to load them from SSM.") from e
 
-    weaviate_url = os.getenv("WEAVIATE_URL")
-    weaviate_api_key = os.getenv("WEAVIATE_API_KEY")
-    openai_api_key = os.getenv("OPENAI_API_KEY")
+    missing_vars = [name for name in _CREDENTIAL_NAMES if not values.get(name)]
+    if missing_vars:
+        raise EnvironmentError(f"Missing environment variables: {', '.join(missing_vars)} (not found in SSM either).")
 
-    required_vars = {
-        "WEAVIATE_URL": weaviate_url,
-        "WEAVIATE_API_KEY": weaviate_api_key,
-        "OPENAI_API_KEY": openai_api_key
-    }
+    return values["WEAVIATE_URL"], values["WEAVIATE_API_KEY"], values["OPENAI_API_KEY"]
 
-    missing_vars = [k for k, v in required_vars.items() if not v]
-    if missing_vars:
-        logger.warning(f"Missing env vars: {', '.join(missing_vars)}. Falling back to SSM...")
-        try:
-            ssm_params = fetch_ssm_parameters()
-            weaviate_url = weaviate_url or ssm_params.get("WEAVIATE_URL")
-            weaviate_api_key = weaviate_api_key or ssm_params.get("WEAVIATE_API_KEY")
-            openai_api_key = openai_api_key or ssm_params.get("OPENAI_API_KEY")
-        except Exception as e:
-            logger.error(f"Failed to load required vars from SSM: {e}")
-            raise EnvironmentError(f"Missing environment variables: {', '.join(missing_vars)} and failed to load from SSM.")
 
+def _connect_default_client() -> WeaviateClient:
+    """Connects a new client to the default Weaviate cluster."""
     try:
-        _client = _initialize_weaviate_client(weaviate_url, weaviate_api_key, openai_api_key)
+        client = _initialize_weaviate_client(*_resolve_credentials())
         logger.info("Connected to Weaviate successfully.")
-        return _client
+        return client
 
     except RetryError as e:
         logger.error(f"Max retry attempts exceeded. Error: {e}")
@@ -111,13 +124,183 @@ def get_weaviate_client() -> WeaviateClient:
         raise
 
 
+class WeaviateClientPool:
+    """
+    A fixed-size pool of long-lived Weaviate clients shared by the query and ingest paths.
+
+    - Clients are created lazily and handed out round-robin, so their gRPC/HTTP
+      connections stay warm across calls.
+    - Each checkout verifies the client is still connected; a readiness probe
+      (is_ready) runs at most once per health-check interval.
+    - Clients that are closed, unhealthy or raise a connection error are replaced
+      on the next checkout.
+    - connection() bounds the number of concurrent queries with a semaphore.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], WeaviateClient],
+        size: int,
+        max_concurrent: int,
+        health_check_interval: float
+    ):
+        self._factory = factory
+        self._size = max(1, size)
+        self._clients: List[Optional[WeaviateClient]] = [None] * self._size
+        self._last_checked = [0.0] * self._size
+        self._slot_locks = [threading.Lock() for _ in range(self._size)]
+        self._counter = itertools.count()
+        self._semaphore = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._health_check_interval = health_check_interval
+        self._closed = False
+
+    def get(self) -> WeaviateClient:
+        """Returns a healthy client from the pool, reconnecting the slot if needed."""
+        if self._closed:
+            raise RuntimeError("Weaviate client pool has been shut down.")
+
+        slot = next(self._counter) % self._size
+        with self._slot_locks[slot]:
+            client = self._clients[slot]
+            if client is not None and not self._is_healthy(slot, client):
+                logger.warning(f"Weaviate client in slot {slot} is unhealthy. Reconnecting...")
+                self._close_client(client)
+                client = None
+
+            if client is None:
+                client = self._factory()
+                self._clients[slot] = client
+                self._last_checked[slot] = time.monotonic()
+
+            return client
+
+    @contextmanager
+    def connection(self) -> Iterator[WeaviateClient]:
+        """
+        Checks out a pooled client for the duration of the block, limiting the number
+        of concurrent users. The client is returned to the pool, never closed.
+        """
+        with self._semaphore:
+            client = self.get()
+            try:
+                yield client
+            except (WeaviateConnectionError, WeaviateClosedClientError):
+                self.invalidate(client)
+                raise
+
+    def invalidate(self, client: WeaviateClient) -> None:
+        """Drops a client that failed so its slot reconnects on the next checkout."""
+        for slot in range(self._size):
+            with self._slot_locks[slot]:
+                if self._clients[slot] is client:
+                    self._clients[slot] = None
+                    self._close_client(client)
+                    logger.warning(f"Weaviate client in slot {slot} invalidated after a connection error.")
+
+    def shutdown(self) -> None:
+        """Closes every pooled client. Subsequent checkouts raise."""
+        self._closed = True
+        for slot in range(self._size):
+            with self._slot_locks[slot]:
+                client, self._clients[slot] = self._clients[slot], None
+                if client is not None:
+                    self._close_client(client)
+        logger.info("Weaviate client pool shut down.")
+
+    def _is_healthy(self, slot: int, client: WeaviateClient) -> bool:
+        try:
+            if not client.is_connected():
+                return False
+            now = time.monotonic()
+            if now - self._last_checked[slot] >= self._health_check_interval:
+                self._last_checked[slot] = now
+                return client.is_ready()
+            return True
+        except Exception as e:
+            logger.warning(f"Weaviate health check failed: {e}")
+            return False
+
+    @staticmethod
+    def _close_client(client: WeaviateClient) -> None:
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close Weaviate client: {e}")
+
+
+def get_weaviate_client_pool() -> WeaviateClientPool:
+    """Returns the process-wide Weaviate client pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = WeaviateClientPool(
+                    factory=_connect_default_client,
+                    size=WeaviateClientConfig.POOL_SIZE,
+                    max_concurrent=WeaviateClientConfig.MAX_CONCURRENT_QUERIES,
+                    health_check_interval=WeaviateClientConfig.HEALTH_CHECK_INTERVAL
+                )
+                atexit.register(shutdown_weaviate_clients)
+    return _pool
+
+
+def get_weaviate_client() -> WeaviateClient:
+    """
+    Returns a connected, pooled Weaviate client.
+    Callers must not close it; the pool owns the client lifecycle.
+    """
+    return get_weaviate_client_pool().get()
+
+
+def weaviate_connection() -> ContextManager[WeaviateClient]:
+    """Checks out a pooled client for one query, bounded by WEAVIATE_MAX_CONCURRENT_QUERIES."""
+    return get_weaviate_client_pool().connection()
+
+
+def shutdown_weaviate_clients() -> None:
+    """Shutdown hook: closes all pooled and enterprise Weaviate clients."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+    with _enterprise_lock:
+        for client in _enterprise_clients.values():
+            WeaviateClientPool._close_client(client)
+        _enterprise_clients.clear()
+
+
+async def connect_weaviate_async_client() -> WeaviateAsyncClient:
+    """
+    Connects a new async Weaviate client to the default cluster.
+    The client is bound to the running event loop; the caller owns it and must
+    close it with `await client.close()`.
+    """
+    # A cold credential lookup may call SSM synchronously; keep it off the event loop
+    weaviate_url, weaviate_api_key, openai_api_key = await asyncio.to_thread(_resolve_credentials)
+    client = use_async_with_weaviate_cloud(
+        cluster_url=weaviate_url,
+        auth_credentials=Auth.api_key(weaviate_api_key),
+        headers={"X-OpenAI-Api-Key": openai_api_key}
+    )
+    try:
+        await client.connect()
+        logger.info("Connected async Weaviate client successfully.")
+        return client
+    except WeaviateBaseError as e:
+        logger.exception(f"Async Weaviate client encountered a Weaviate error: {e}")
+        raise
+
+
 def get_enterprise_weaviate_client(weaviate_url: str, weaviate_api_key: str) -> WeaviateClient:
     """
     Returns a tenant-specific Weaviate client using provided credentials.
     Uses global OpenAI API key.
-    """
-    openai_api_key = os.getenv("OPENAI_API_KEY")
 
+    Clients are cached per cluster and API key and reused while connected, so
+    repeated calls do not reconnect. Callers must not close the returned client;
+    shutdown_weaviate_clients() does.
+    """
     if not weaviate_url or not weaviate_api_key:
         missing = []
         if not weaviate_url:
@@ -127,8 +310,28 @@ def get_enterprise_weaviate_client(weaviate_url: str, weaviate_api_key: str) ->
         logger.error(f"Missing required parameters for enterprise client: {', '.join(missing)}")
         raise EnvironmentError(f"Missing enterprise Weaviate configuration: {', '.join(missing)}")
 
+    key = (weaviate_url, hashlib.sha256(weaviate_api_key.encode()).hexdigest())
     try:
-        client = _initialize_weaviate_client(weaviate_url, weaviate_api_key, openai_api_key)
+        with _enterprise_lock:
+            key_lock = _enterprise_key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with _enterprise_lock:
+                client = _enterprise_clients.get(key)
+            if client is not None and client.is_connected():
+                return client
+            if client is not None:
+                logger.warning("Cached enterprise Weaviate client disconnected. Reconnecting...")
+                WeaviateClientPool._close_client(client)
+
+            openai_api_key = get_config_provider().get("OPENAI_API_KEY")
+            if not openai_api_key:
+                raise EnvironmentError("Missing OPENAI_API_KEY for enterprise Weaviate client (not found in SSM either).")
+            client = _initialize_weaviate_client(weaviate_url, weaviate_api_key, openai_api_key)
+            with _enterprise_lock:
+                if not _enterprise_clients:
+                    atexit.register(shutdown_weaviate_clients)
+                _enterprise_clients[key] = client
         logger.info("Connected to enterprise Weaviate successfully.")
         return client
 
@@ -1,5 +1,6 @@
 import os
 from ingramdocai.core.logger import setup_logger
+from ingramdocai.services.embedding_service import EmbeddingConfig
 
 logger = setup_logger("weaviate_schema")
 
@@ -17,16 +18,34 @@ class WeaviateDocumentSchema:
     PROPERTIES = [
         {"name": "tenant_id", "dataType": ["text"], "description": "Tenant or organization ID"},
         {"name": "session_id", "dataType": ["text"], "description": "Ingestion session ID"},
-        {"name": "chunk_id", "dataType": ["text"], "description": "Unique chunk identifier"},
+        {"name": "chunk_id", "dataType": ["text"], "description": "Unique chunk identifier (SHA-256 of chunk text)"},
+        {"name": "chunk_index", "dataType": ["int"], "description": "Position of the chunk within its source file"},
         {"name": "text", "dataType": ["text"], "description": "Chunk content"},
         {"name": "file_name", "dataType": ["text"], "description": "Original document file name"},
         {"name": "file_type", "dataType": ["text"], "description": "File extension (e.g., pdf, docx)"},
         {"name": "char_count", "dataType": ["int"], "description": "Number of characters in chunk"},
         {"name": "source", "dataType": ["text"], "description": "Source loader used"},
         {"name": "page_number", "dataType": ["int"], "description": "Page number (if applicable)"},
+        {"name": "char_start", "dataType": ["int"], "description": "Start offset of the chunk in the extracted document text"},
+        {"name": "char_end", "dataType": ["int"], "description": "End offset of the chunk in the extracted document text"},
+        {"name": "section_heading", "dataType": ["text"], "description": "Nearest preceding section heading (if detected)"},
         {"name": "created_at", "dataType": ["date"], "description": "Ingestion timestamp"},
     ]
 
+    @classmethod
+    def module_config(cls) -> dict:
+        """
+        Pins text2vec-openai to the client-side embedding model and dimensions, so
+        vectors written by the client and query vectors computed by Weaviate share
+        one vector space.
+        """
+        if cls.VECTORIZER != "text2vec-openai":
+            return {}
+        settings = {"model": EmbeddingConfig.MODEL}
+        if EmbeddingConfig.DIMENSIONS:
+            settings["dimensions"] = EmbeddingConfig.DIMENSIONS
+        return {cls.VECTORIZER: settings}
+
     @classmethod
     def get_schema(cls) -> dict:
         """
@@ -39,6 +58,9 @@ class WeaviateDocumentSchema:
             "multiTenancyConfig": cls.MULTI_TENANCY_CONFIG,
             "properties": cls.PROPERTIES
         }
+        module_config = cls.module_config()
+        if module_config:
+            schema["moduleConfig"] = module_config
 
         logger.info(
             f"Constructed Weaviate schema '{cls.CLASS_NAME}' "
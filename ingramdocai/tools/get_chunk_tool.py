@@ -1,7 +1,9 @@
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Type
-from ingramdocai.services.weaviate_client import get_weaviate_client
+from typing import List, Dict, Any, Optional, Type
+from weaviate.classes.query import Filter
+from ingramdocai.services.weaviate_client import weaviate_connection
+from ingramdocai.services.weaviate_document_schema import WeaviateDocumentSchema
 from ingramdocai.core.logger import setup_logger
 
 logger = setup_logger("fetch_document_chunks")
@@ -10,25 +12,71 @@ logger = setup_logger("fetch_document_chunks")
 class FetchDocumentChunksInput(BaseModel):
     tenant_id: str = Field(..., description="Tenant ID for Weaviate multi-tenant isolation")
     user_query: str = Field(..., description="Natural language query string to retrieve document content")
+    file_name: Optional[str] = Field(None, description="Only search chunks from this file")
+    file_type: Optional[str] = Field(None, description="Only search chunks of this file type (e.g., pdf, docx)")
+    session_id: Optional[str] = Field(None, description="Only search chunks ingested in this session")
+    page_from: Optional[int] = Field(None, description="Only search pages at or after this page number")
+    page_to: Optional[int] = Field(None, description="Only search pages at or before this page number")
+
+
+def build_chunk_filters(
+    file_name: Optional[str] = None,
+    file_type: Optional[str] = None,
+    session_id: Optional[str] = None,
+    page_from: Optional[int] = None,
+    page_to: Optional[int] = None
+) -> Optional[Any]:
+    """
+    Builds a Weaviate filter from optional chunk metadata constraints.
+    Filters are applied before hybrid scoring, so they narrow the candidate set
+    rather than post-filtering the top results. Returns None when no constraint is set.
+    """
+    conditions = []
+    if file_name:
+        conditions.append(Filter.by_property("file_name").equal(file_name))
+    if file_type:
+        conditions.append(Filter.by_property("file_type").equal(file_type.lower().lstrip(".")))
+    if session_id:
+        conditions.append(Filter.by_property("session_id").equal(session_id))
+    if page_from is not None:
+        conditions.append(Filter.by_property("page_number").greater_or_equal(page_from))
+    if page_to is not None:
+        conditions.append(Filter.by_property("page_number").less_or_equal(page_to))
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else Filter.all_of(conditions)
 
 
 class FetchDocumentChunksTool(BaseTool):
     name: str = "fetch_document_chunks"
-    description: str = "Perform semantic search over document chunks for a given tenant using natural language."
+    description: str = (
+        "Perform semantic search over document chunks for a given tenant using natural language. "
+        "Optionally restrict the search to a file name, file type, ingestion session or page range."
+    )
     args_schema: Type[BaseModel] = FetchDocumentChunksInput
 
     def _run(
         self,
         tenant_id: str,
-        user_query: str
+        user_query: str,
+        limit: int = 5,
+        file_name: Optional[str] = None,
+        file_type: Optional[str] = None,
+        session_id: Optional[str] = None,
+        page_from: Optional[int] = None,
+        page_to: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        client = None
+        # Chunks are stored under the normalized tenant name used at ingest time
+        tenant_id = tenant_id.strip().lower()
+        filters = build_chunk_filters(file_name, file_type, session_id, page_from, page_to)
         try:
-            client = get_weaviate_client()
-            collection = client.collections.get("DocumentChunk").with_tenant(tenant_id)
+            # Pooled client: shared warm connections, never closed per query
+            with weaviate_connection() as client:
+                collection = client.collections.get(WeaviateDocumentSchema.CLASS_NAME).with_tenant(tenant_id)
 
-            logger.info(f"[{tenant_id}] Query: '{user_query}'")
-            results = collection.query.hybrid(query=user_query, limit=5)
+                logger.info(f"[{tenant_id}] Query: '{user_query}'" + (" (filtered)" if filters else ""))
+                results = collection.query.hybrid(query=user_query, limit=limit, filters=filters)
 
             matches = [obj.properties for obj in results.objects or []]
             logger.info(f"[{tenant_id}] Found {len(matches)} match(es)")
@@ -37,11 +85,3 @@ class FetchDocumentChunksTool(BaseTool):
         except Exception as e:
             logger.exception(f"[{tenant_id}] Document search failed: {e}")
             raise
-
-        finally:
-            if client:
-                try:
-                    client.close()
-                    logger.debug(f"[{tenant_id}] Weaviate client closed")
-                except Exception as close_err:
-                    logger.warning(f"[{tenant_id}] Failed to close Weaviate client: {close_err}")
@@ -3,8 +3,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, Type
 from datetime import datetime
 from ingramdocai.core.logger import setup_logger
-from ingramdocai.persistence.db import SessionLocal
-from ingramdocai.persistence.models import DocumentSession
+from ingramdocai.services.session_records import upsert_session_records
 from sqlalchemy.exc import SQLAlchemyError
 
 logger = setup_logger("save_session_record")
@@ -26,7 +25,8 @@ class SaveSessionRecordTool(BaseTool):
     name: str = "save_session_record"
     description: str = (
         "Insert or update a document ingestion session record in the database. "
-        "If file_path is provided, creates a new record. Otherwise, updates an existing one."
+        "If file_path is provided, creates the record or updates it if it exists. "
+        "Otherwise, updates an existing one."
     )
     args_schema: Type[BaseModel] = SaveSessionInput
 
@@ -42,49 +42,25 @@ class SaveSessionRecordTool(BaseTool):
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None
     ) -> str:
-        db = SessionLocal()
-
         try:
-            record = db.query(DocumentSession).filter_by(session_id=session_id).first()
-
-            if record:
-                # Update logic
-                if status:
-                    record.status = status
-                if chunk_count is not None:
-                    record.chunk_count = chunk_count
-                if error_message:
-                    record.error_message = error_message
-                record.updated_at = updated_at or datetime.utcnow()
-                db.commit()
-                logger.info(f"Session {session_id} updated → status={status}")
-                return "updated"
+            # Same single-transaction upsert path as bulk writers; a record without
+            # file_path only updates the existing row
+            upsert_session_records([{
+                "session_id": session_id,
+                "tenant_id": tenant_id,
+                "user_id": user_id,
+                "file_path": file_path,
+                "status": status or None,
+                "chunk_count": chunk_count,
+                "error_message": error_message or None,
+                "created_at": created_at,
+                "updated_at": updated_at
+            }])
+            result = "upserted" if file_path else "updated"
 
-            else:
-                # Insert logic
-                if not file_path:
-                    raise ValueError("file_path is required to create a new session.")
-                new_record = DocumentSession(
-                    session_id=session_id,
-                    tenant_id=tenant_id,
-                    user_id=user_id,
-                    file_path=file_path,
-                    status=status or "in_progress",
-                    chunk_count=chunk_count or 0,
-                    error_message=error_message,
-                    created_at=created_at or datetime.utcnow(),
-                    updated_at=updated_at or datetime.utcnow()
-                )
-                db.add(new_record)
-                db.commit()
-                logger.info(f"Session {session_id} created")
-                return "inserted"
+            logger.info(f"Session {session_id} {result} → status={status}")
+            return result
 
         except SQLAlchemyError as e:
-            db.rollback()
             logger.error(f"Database error in SaveSessionRecordTool: {str(e)}")
             raise
-
-        finally:
-            db.close()
-            logger.info("Database session closed in SaveSessionRecordTool")
\ No newline at end of file
@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 from typing import Any, Type, List, Dict
 from ingramdocai.services.database import get_db_session
 from ingramdocai.persistence.models import DocumentSession
+from ingramdocai.services.ingestion_progress import load_session_progress
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from sqlalchemy.exc import OperationalError
 
@@ -16,7 +17,8 @@ class FetchUserJobStatusTool(BaseTool):
     name: str = "fetch_user_job_status"
     description: str = (
         "Fetches all document injection jobs matching a given session_id from the local DB. "
-        "Returns full record details for inspection."
+        "Returns full record details for inspection, including per-file progress "
+        "(files parsed, chunks produced and upserted, failed objects, bytes processed, throughput)."
     )
     args_schema: Type[BaseModel] = FetchUserJobStatusArgs
 
@@ -35,7 +37,7 @@ class FetchUserJobStatusTool(BaseTool):
                 .all()
             )
 
-            return [
+            results = [
                 {
                     k: (v.strftime("%Y-%m-%d %H:%M:%S") if hasattr(v, "strftime") else v)
                     for k, v in r.__dict__.items()
@@ -43,3 +45,8 @@ class FetchUserJobStatusTool(BaseTool):
                 }
                 for r in records
             ]
+
+        progress = load_session_progress([r["session_id"] for r in results])
+        for record in results:
+            record["progress"] = progress.get(record["session_id"])
+        return results